@@ -1,16 +1,21 @@
-import pandas as pd
+import argparse
+import os
+import sys
+import time
+
 import numpy as np
-import random
-from datetime import datetime, timedelta
+import pandas as pd
 
-# Configuración inicial
-np.random.seed(42)
-num_registros = 1500  # Más datos para que los modelos aprendan mejor
+# Configuración inicial (valores por defecto; se pueden cambiar desde la línea de comandos)
+NUM_REGISTROS = 1500  # Más datos para que los modelos aprendan mejor
+SEMILLA = 42
+TAMANO_CHUNK = 1_000_000  # Filas por bloque escrito a disco (memoria constante)
+ARCHIVO_SALIDA = 'dataset_market_final.csv'
+ALMACEN_SALIDA = 'dataset_market'
 
-# 1. Generar Fechas (Último año)
-fecha_inicio = datetime(2024, 1, 1)
-fechas = [fecha_inicio + timedelta(days=np.random.randint(0, 365)) for _ in range(num_registros)]
-fechas.sort()
+# 1. Fechas (Último año)
+FECHA_INICIO = np.datetime64('2024-01-01')
+DIAS_RANGO = 365
 
 # 2. Datos de Productos (Categorías y Precios base)
 productos_data = {
@@ -27,65 +32,124 @@ precios_base = {
     'Leche': 5.5, 'Yogurt': 7.0, 'Queso': 15.0, 'Mantequilla': 8.5
 }
 
-# 3. Generar Datos Transaccionales
-data = []
+NIVELES_TRAFICO = ['Bajo', 'Medio', 'Alto']
+PROB_TRAFICO = [0.4, 0.4, 0.2]
+
+COLUMNAS = [
+    'Fecha', 'Categoria', 'Producto', 'Cantidad', 'Precio_Unitario', 'Total_Venta',
+    'Distancia_KM', 'Nivel_Trafico', 'Llega_Tarde',
+    'ID_Cliente', 'Edad_Cliente', 'Gasto_Hist_Cliente'
+]
+
+# Tablas de búsqueda para vectorizar la selección de productos:
+# cada categoría ocupa un tramo contiguo de la lista global de productos.
+CATEGORIAS = list(productos_data.keys())
+PRODUCTOS = [p for cat in CATEGORIAS for p in productos_data[cat]]
+_N_PRODUCTOS_CAT = np.array([len(productos_data[c]) for c in CATEGORIAS])
+_OFFSET_CAT = np.concatenate([[0], np.cumsum(_N_PRODUCTOS_CAT)[:-1]])
+_PRECIO_PRODUCTO = np.array([precios_base[p] for p in PRODUCTOS])
+
+
+def generar_bloque(rng, dias):
+    """Genera un bloque de transacciones para los días (offset desde FECHA_INICIO) dados."""
+    n = len(dias)
+
+    # Selección aleatoria de producto (primero la categoría, luego el producto dentro de ella)
+    cat_idx = rng.integers(0, len(CATEGORIAS), n)
+    prod_idx = _OFFSET_CAT[cat_idx] + rng.integers(0, _N_PRODUCTOS_CAT[cat_idx])
 
-for fecha in fechas:
-    # Selección aleatoria de producto
-    categoria = random.choice(list(productos_data.keys()))
-    producto = random.choice(productos_data[categoria])
-    
     # Cantidad y Precio (con pequeña variación aleatoria)
-    cantidad = np.random.randint(1, 10)
-    precio_unit = round(precios_base[producto] * np.random.uniform(0.9, 1.1), 2)
-    total_venta = round(cantidad * precio_unit, 2)
-    
+    cantidad = rng.integers(1, 10, n)
+    precio_unit = np.round(_PRECIO_PRODUCTO[prod_idx] * rng.uniform(0.9, 1.1, n), 2)
+    total_venta = np.round(cantidad * precio_unit, 2)
+
     # --- DATOS PARA LOGÍSTICA (Envío) ---
-    distancia_km = round(np.random.uniform(0.5, 15.0), 1)
-    trafico = np.random.choice(['Bajo', 'Medio', 'Alto'], p=[0.4, 0.4, 0.2])
-    
+    distancia_km = np.round(rng.uniform(0.5, 15.0, n), 1)
+    trafico_idx = rng.choice(len(NIVELES_TRAFICO), size=n, p=PROB_TRAFICO)
+
     # Lógica para definir si llega tarde (Target Binario)
     # Si hay mucho tráfico y distancia larga, prob de retraso es alta
-    prob_retraso = 0.1
-    if trafico == 'Alto': prob_retraso += 0.4
-    if distancia_km > 10: prob_retraso += 0.3
-    
-    llega_tarde = 1 if np.random.random() < prob_retraso else 0 # 1=Sí, 0=No
-    
+    prob_retraso = 0.1 + 0.4 * (trafico_idx == NIVELES_TRAFICO.index('Alto')) + 0.3 * (distancia_km > 10)
+    llega_tarde = (rng.random(n) < prob_retraso).astype(np.int8)  # 1=Sí, 0=No
+
     # --- DATOS PARA CLUSTERING (Cliente) ---
     # Simulamos 100 clientes recurrentes
-    id_cliente = np.random.randint(1001, 1101) 
-    edad_cliente = np.random.randint(18, 65)
-    
+    id_cliente = rng.integers(1001, 1101, n)
+    edad_cliente = rng.integers(18, 65, n)
+
     # Lógica de comportamiento del cliente (para que K-Means encuentre patrones)
-    # Clientes mayores compran más abarrotes/carnes, jóvenes más snacks/lacteos (simulado)
-    if edad_cliente > 50:
-        gasto_promedio_hist = np.random.uniform(50, 150)
+    # Mayores de 50 gastan entre 50 y 150, el resto entre 20 y 80
+    mayor = edad_cliente > 50
+    gasto_promedio_hist = rng.uniform(np.where(mayor, 50.0, 20.0), np.where(mayor, 150.0, 80.0))
+
+    return pd.DataFrame({
+        'Fecha': FECHA_INICIO + dias.astype('timedelta64[D]'),
+        'Categoria': pd.Categorical.from_codes(cat_idx, CATEGORIAS),
+        'Producto': pd.Categorical.from_codes(prod_idx, PRODUCTOS),
+        'Cantidad': cantidad,
+        'Precio_Unitario': precio_unit,
+        'Total_Venta': total_venta,
+        'Distancia_KM': distancia_km,
+        'Nivel_Trafico': pd.Categorical.from_codes(trafico_idx, NIVELES_TRAFICO),
+        'Llega_Tarde': llega_tarde,  # Target Logística
+        'ID_Cliente': id_cliente,
+        'Edad_Cliente': edad_cliente,
+        'Gasto_Hist_Cliente': gasto_promedio_hist,  # Feature Clustering
+    }, columns=COLUMNAS)
+
+
+def generar_dataset(num_registros=NUM_REGISTROS, semilla=SEMILLA, tamano_chunk=TAMANO_CHUNK):
+    """Genera el dataset en bloques de `tamano_chunk` filas, ordenado por fecha.
+
+    La misma semilla (con el mismo tamaño de chunk) produce siempre el mismo resultado.
+    """
+    rng = np.random.default_rng(semilla)
+
+    # Fechas ordenadas sin materializar la lista completa: se sortea cuántas
+    # transacciones caen en cada día y cada bloque busca sus días con searchsorted.
+    conteo_dias = rng.multinomial(num_registros, np.full(DIAS_RANGO, 1 / DIAS_RANGO))
+    fin_dia = np.cumsum(conteo_dias)
+
+    for inicio in range(0, num_registros, tamano_chunk):
+        fin = min(inicio + tamano_chunk, num_registros)
+        dias = np.searchsorted(fin_dia, np.arange(inicio, fin), side='right')
+        yield generar_bloque(rng, dias)
+
+
+def guardar_csv(bloques, ruta=ARCHIVO_SALIDA):
+    filas = 0
+    for i, bloque in enumerate(bloques):
+        bloque.to_csv(ruta, index=False, mode='w' if i == 0 else 'a', header=(i == 0))
+        filas += len(bloque)
+    return filas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera el dataset sintético de Market Delivery.")
+    parser.add_argument('--filas', type=int, default=NUM_REGISTROS, help="Número de transacciones a generar.")
+    parser.add_argument('--semilla', type=int, default=SEMILLA, help="Semilla para resultados reproducibles.")
+    parser.add_argument('--chunk', type=int, default=TAMANO_CHUNK, help="Filas por bloque escrito a disco.")
+    parser.add_argument('--formato', choices=['csv', 'parquet'], default='csv',
+                        help="csv (archivo único) o parquet (almacén columnar particionado por mes).")
+    parser.add_argument('--salida', default=None,
+                        help=f"Ruta de salida (por defecto '{ARCHIVO_SALIDA}' o '{ALMACEN_SALIDA}/').")
+    args = parser.parse_args()
+
+    bloques = generar_dataset(args.filas, args.semilla, args.chunk)
+    t0 = time.perf_counter()
+    if args.formato == 'parquet':
+        # El almacén vive en la raíz del proyecto (almacen.py)
+        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        import almacen
+
+        salida = args.salida or ALMACEN_SALIDA
+        filas = almacen.escribir_bloques(bloques, salida)
     else:
-        gasto_promedio_hist = np.random.uniform(20, 80)
-
-    data.append([
-        fecha, 
-        categoria, 
-        producto, 
-        cantidad, 
-        precio_unit, 
-        total_venta,
-        distancia_km,
-        trafico,
-        llega_tarde, # Target Logística
-        id_cliente,
-        edad_cliente,
-        gasto_promedio_hist # Feature Clustering
-    ])
-
-# 4. Crear DataFrame
-df = pd.DataFrame(data, columns=[
-    'Fecha', 'Categoria', 'Producto', 'Cantidad', 'Precio_Unitario', 'Total_Venta',
-    'Distancia_KM', 'Nivel_Trafico', 'Llega_Tarde', 
-    'ID_Cliente', 'Edad_Cliente', 'Gasto_Hist_Cliente'
-])
+        salida = args.salida or ARCHIVO_SALIDA
+        filas = guardar_csv(bloques, salida)
+    print(f"¡'{salida}' generado exitosamente con {filas:,} filas "
+          f"en {time.perf_counter() - t0:.1f}s (datos para los 4 modelos)!")
+
 
-# 5. Guardar CSV
-df.to_csv('dataset_market_final.csv', index=False)
-print("¡Archivo 'dataset_market_final.csv' generado exitosamente con datos para los 4 modelos!")
\ No newline at end of file
+if __name__ == '__main__':
+    main()
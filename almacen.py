@@ -0,0 +1,263 @@
+import argparse
+import hashlib
+import io
+import os
+import shutil
+import uuid
+
+import pandas as pd
+
+# --- ALMACÉN COLUMNAR DEL DATASET ---
+# El dataset se guarda como Parquet particionado por mes (Mes=AAAA-MM/...).
+# Cada lector pide solo sus columnas y, si lo necesita, un rango de fechas: Parquet
+# no lee del disco el resto de columnas ni los meses fuera del rango. Los datos nuevos
+# se añaden como partes nuevas (ver marcas de agua).
+
+RUTA_CSV = 'dataset_market_final.csv'
+RUTA_ALMACEN = 'dataset_market'
+TAMANO_CHUNK = 1_000_000
+
+# Columnas que usan los scripts de entrenamiento (modelos_finales.pkl)
+COLUMNAS_ENTRENAMIENTO = ['Precio_Unitario', 'Cantidad', 'Distancia_KM', 'Nivel_Trafico',
+                          'Llega_Tarde', 'ID_Cliente', 'Edad_Cliente', 'Gasto_Hist_Cliente']
+
+
+def existe(ruta=RUTA_ALMACEN, ruta_csv=RUTA_CSV):
+    return os.path.isdir(ruta) or os.path.exists(ruta_csv)
+
+
+def version_datos(ruta=RUTA_ALMACEN, ruta_csv=RUTA_CSV):
+    """Huella barata del dataset (nombres, tamaños y fechas de modificación, sin leer el contenido)."""
+    h = hashlib.sha1()
+    if os.path.isdir(ruta):
+        for raiz, _, archivos in sorted(os.walk(ruta)):
+            for nombre in sorted(archivos):
+                info = os.stat(os.path.join(raiz, nombre))
+                h.update(f'{raiz}/{nombre}:{info.st_size}:{info.st_mtime_ns};'.encode())
+    elif os.path.exists(ruta_csv):
+        info = os.stat(ruta_csv)
+        h.update(f'{ruta_csv}:{info.st_size}:{info.st_mtime_ns}'.encode())
+    return h.hexdigest()
+
+
+_DIGESTOS = {}  # (ruta, tamaño, mtime) -> sha1 del archivo; las partes del almacén no se reescriben
+
+
+def _digesto(ruta):
+    info = os.stat(ruta)
+    clave = (ruta, info.st_size, info.st_mtime_ns)
+    if clave not in _DIGESTOS:
+        h = hashlib.sha1()
+        with open(ruta, 'rb') as f:
+            for bloque in iter(lambda: f.read(1 << 20), b''):
+                h.update(bloque)
+        _DIGESTOS[clave] = h.hexdigest()
+    return _DIGESTOS[clave]
+
+
+def huella_contenido(ruta=RUTA_ALMACEN, ruta_csv=RUTA_CSV):
+    """Huella del contenido del dataset: no cambia si los archivos solo se copian o se tocan.
+
+    Cada archivo se lee una sola vez por tamaño y fecha de modificación; tras añadir una
+    parte al almacén solo se lee la parte nueva.
+    """
+    h = hashlib.sha1()
+    if os.path.isdir(ruta):
+        for raiz, _, archivos in sorted(os.walk(ruta)):
+            for nombre in sorted(archivos):
+                completo = os.path.join(raiz, nombre)
+                h.update(f'{os.path.relpath(completo, ruta)}:{_digesto(completo)};'.encode())
+    elif os.path.exists(ruta_csv):
+        h.update(_digesto(ruta_csv).encode())
+    return h.hexdigest()
+
+
+def _a_tabla(bloque):
+    import pyarrow as pa
+
+    bloque = bloque.copy()
+    dias = pd.to_datetime(bloque['Fecha']).to_numpy().astype('datetime64[D]')
+    bloque['Fecha'] = dias
+    # Columna de partición: se formatea solo una vez por mes distinto, no por fila
+    meses = pd.Categorical(dias.astype('datetime64[M]'))
+    bloque['Mes'] = meses.rename_categories(meses.categories.strftime('%Y-%m')).astype(str)
+    tabla = pa.Table.from_pandas(bloque, preserve_index=False)
+    return tabla.set_column(tabla.schema.get_field_index('Fecha'), 'Fecha', tabla['Fecha'].cast(pa.date32()))
+
+
+def anexar_bloques(bloques, ruta=RUTA_ALMACEN, prefijo='parte'):
+    """Escribe bloques de DataFrame en el almacén sin borrar lo que ya existe."""
+    import pyarrow.dataset as ds
+
+    # Un identificador por llamada evita pisar archivos de escrituras anteriores
+    lote = uuid.uuid4().hex[:8]
+    filas = 0
+    for i, bloque in enumerate(bloques):
+        ds.write_dataset(
+            _a_tabla(bloque), ruta, format='parquet',
+            partitioning=['Mes'], partitioning_flavor='hive',
+            basename_template=f'{prefijo}-{lote}-{i:05d}-{{i}}.parquet',
+            existing_data_behavior='overwrite_or_ignore',
+        )
+        filas += len(bloque)
+    return filas
+
+
+def escribir_bloques(bloques, ruta=RUTA_ALMACEN):
+    """Reemplaza el almacén completo con los bloques dados (memoria constante por bloque)."""
+    if os.path.isdir(ruta):
+        shutil.rmtree(ruta)
+    return anexar_bloques(bloques, ruta)
+
+
+def convertir_csv(ruta_csv=RUTA_CSV, ruta=RUTA_ALMACEN, tamano_chunk=TAMANO_CHUNK):
+    return escribir_bloques(pd.read_csv(ruta_csv, chunksize=tamano_chunk), ruta)
+
+
+def abrir_dataset(ruta=RUTA_ALMACEN):
+    import pyarrow.dataset as ds
+
+    return ds.dataset(ruta, format='parquet', partitioning='hive')
+
+
+def _filtro_fechas(desde, hasta):
+    """Filtro de Arrow por Fecha; la condición sobre 'Mes' descarta particiones enteras sin abrirlas."""
+    import pyarrow.dataset as ds
+
+    filtro = None
+    if desde is not None:
+        desde = pd.Timestamp(desde)
+        filtro = (ds.field('Mes') >= desde.strftime('%Y-%m')) & (ds.field('Fecha') >= desde.date())
+    if hasta is not None:
+        hasta = pd.Timestamp(hasta)
+        f_hasta = (ds.field('Mes') <= hasta.strftime('%Y-%m')) & (ds.field('Fecha') <= hasta.date())
+        filtro = f_hasta if filtro is None else filtro & f_hasta
+    return filtro
+
+
+def leer(columnas=None, desde=None, hasta=None, ruta=RUTA_ALMACEN, ruta_csv=RUTA_CSV):
+    """Lee solo `columnas` (todas si es None) de las filas con Fecha entre `desde` y `hasta` (incluidos).
+
+    Si no existe el almacén Parquet se usa el CSV como respaldo (allí el rango se filtra tras leer).
+    """
+    columnas = list(columnas) if columnas is not None else None
+
+    if os.path.isdir(ruta):
+        dataset = abrir_dataset(ruta)
+        if columnas is None:
+            columnas = [c for c in dataset.schema.names if c != 'Mes']
+        df = dataset.to_table(columns=columnas, filter=_filtro_fechas(desde, hasta)).to_pandas(date_as_object=False)
+    else:
+        usar = columnas
+        if columnas is not None and (desde is not None or hasta is not None) and 'Fecha' not in columnas:
+            usar = columnas + ['Fecha']
+        df = pd.read_csv(ruta_csv, usecols=usar)
+        if 'Fecha' in df.columns:
+            df['Fecha'] = pd.to_datetime(df['Fecha'])
+        if desde is not None:
+            df = df[df['Fecha'] >= pd.Timestamp(desde)]
+        if hasta is not None:
+            df = df[df['Fecha'] <= pd.Timestamp(hasta)]
+        if columnas is not None:
+            df = df[columnas]
+        df = df.reset_index(drop=True)
+
+    if 'Fecha' in df.columns:
+        df['Fecha'] = df['Fecha'].astype('datetime64[ns]')
+    return df
+
+
+def leer_bloques(columnas, tamano_chunk=TAMANO_CHUNK, ruta=RUTA_ALMACEN, ruta_csv=RUTA_CSV):
+    """Recorre el dataset por bloques de `columnas` sin cargarlo entero en memoria."""
+    columnas = list(columnas)
+    if os.path.isdir(ruta):
+        for lote in abrir_dataset(ruta).to_batches(columns=columnas, batch_size=tamano_chunk):
+            if lote.num_rows:
+                yield lote.to_pandas(date_as_object=False)
+    else:
+        yield from pd.read_csv(ruta_csv, usecols=columnas, chunksize=tamano_chunk)
+
+
+# --- MARCAS DE AGUA (lectura incremental) ---
+# Una marca describe hasta dónde llegaba el dataset en un momento dado: el byte final
+# del CSV (más una firma de su inicio) o la lista de archivos Parquet del almacén.
+# Con dos marcas se pueden leer solo las filas añadidas entre ambas.
+
+_BYTES_FIRMA = 65536
+
+
+def _huella_inicio(ruta, n):
+    with open(ruta, 'rb') as f:
+        return hashlib.sha1(f.read(min(n, _BYTES_FIRMA))).hexdigest()
+
+
+def marca_actual(ruta=RUTA_ALMACEN, ruta_csv=RUTA_CSV):
+    if os.path.isdir(ruta):
+        return {'fuente': 'parquet', 'ruta': ruta, 'archivos': sorted(abrir_dataset(ruta).files)}
+    tamano = os.path.getsize(ruta_csv)
+    return {'fuente': 'csv', 'ruta': ruta_csv, 'bytes': tamano, 'firma': _huella_inicio(ruta_csv, tamano)}
+
+
+def es_continuacion(anterior, actual):
+    """True si `actual` solo añade filas a `anterior` (nada se reescribió ni se borró)."""
+    if not anterior or anterior.get('fuente') != actual['fuente'] or anterior.get('ruta') != actual['ruta']:
+        return False
+    if actual['fuente'] == 'parquet':
+        return set(anterior['archivos']) <= set(actual['archivos'])
+    return (actual['bytes'] >= anterior['bytes']
+            and _huella_inicio(actual['ruta'], anterior['bytes']) == anterior['firma'])
+
+
+class _Tramo(io.RawIOBase):
+    """Vista de solo lectura de los próximos `restante` bytes de un archivo abierto."""
+
+    def __init__(self, archivo, restante):
+        self.archivo = archivo
+        self.restante = restante
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        datos = self.archivo.read(min(len(buffer), self.restante))
+        buffer[:len(datos)] = datos
+        self.restante -= len(datos)
+        return len(datos)
+
+
+def leer_entre(anterior, actual, columnas, tamano_chunk=TAMANO_CHUNK):
+    """Bloques con las filas que están en la marca `actual` pero no en `anterior` ({} = desde el inicio)."""
+    columnas = list(columnas)
+    if actual['fuente'] == 'parquet':
+        vistos = set(anterior.get('archivos', []))
+        nuevos = set(actual['archivos']) - vistos
+        for fragmento in abrir_dataset(actual['ruta']).get_fragments():
+            if fragmento.path in nuevos:
+                for lote in fragmento.to_batches(columns=columnas, batch_size=tamano_chunk):
+                    if lote.num_rows:
+                        yield lote.to_pandas(date_as_object=False)
+        return
+
+    with open(actual['ruta'], 'rb') as f:
+        nombres = f.readline().decode('utf-8').strip().split(',')
+        inicio = max(anterior.get('bytes', 0), f.tell())
+        if inicio >= actual['bytes']:
+            return
+        f.seek(inicio)
+        tramo = io.BufferedReader(_Tramo(f, actual['bytes'] - inicio))
+        yield from pd.read_csv(tramo, names=nombres, header=None, usecols=columnas, chunksize=tamano_chunk)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convierte el CSV del dataset al almacén Parquet particionado.")
+    parser.add_argument('--csv', default=RUTA_CSV, help="CSV de origen.")
+    parser.add_argument('--destino', default=RUTA_ALMACEN, help="Directorio del almacén Parquet.")
+    parser.add_argument('--chunk', type=int, default=TAMANO_CHUNK, help="Filas leídas por bloque.")
+    args = parser.parse_args()
+
+    filas = convertir_csv(args.csv, args.destino, args.chunk)
+    print(f"✅ Almacén '{args.destino}' creado con {filas:,} filas.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,231 @@
+import json
+import os
+import tempfile
+
+import numpy as np
+
+# --- ÁRBOLES PLANOS PARA SERVIR EL PRONÓSTICO ---
+# Un RandomForestRegressor o HistGradientBoostingRegressor ya entrenado se reduce a
+# cinco arreglos con todos los nodos de todos los árboles seguidos:
+#   izquierda (int32), caracteristica (int16), umbral, valor (float32) y raices.
+# Los nodos se renumeran por niveles para que los dos hijos queden juntos: el derecho es
+# siempre izquierda + 1. Las hojas apuntan a sí mismas con umbral +inf, así que la
+# predicción baja por todos los árboles y filas a la vez con el mismo paso en cada nivel:
+#   nodo = izquierda[nodo] + (x[caracteristica[nodo]] > umbral[nodo])
+# Se guardan en un .npz junto con los codificadores de caracteristicas.py: la carga no
+# necesita sklearn ni pickle.
+# En lotes chicos (un día del catálogo) esto es varias veces más rápido que sklearn; en lotes
+# grandes gana el recorrido compilado de sklearn. FILAS_SKLEARN marca el cruce medido para cada
+# tipo de modelo y pronosticar() usa el .pkl por encima de él (si es del mismo entrenamiento).
+
+RUTA_COMPACTO = 'modelo_pronostico.npz'
+FORMATO = 1
+ELEMENTOS_POR_BLOQUE = 1 << 16  # árboles x filas que se recorren a la vez (caben en caché)
+FILAS_SKLEARN = {'media': 1_000, 'suma': 250}  # bosque / boosting: desde aquí sklearn es más rápido
+
+# Atributos privados de HistGradientBoostingRegressor que lee aplanar() (probado con sklearn 1.7 a 1.9)
+ATRIBUTOS_BOOSTING = ('_predictors', '_baseline_prediction')
+CAMPOS_NODO = ('left', 'right', 'feature_idx', 'num_threshold', 'value', 'is_leaf', 'is_categorical')
+
+
+class ArbolesPlanos:
+    """Predicción por lotes de un bosque (media de los árboles) o de un boosting (base + suma)."""
+
+    def __init__(self, izquierda, caracteristica, umbral, valor, raices, combinar='media', base=0.0):
+        self.izquierda = izquierda
+        self.caracteristica = caracteristica
+        self.umbral = umbral
+        self.valor = valor
+        self.raices = raices
+        self.combinar = combinar
+        self.base = float(base)
+        self.origen = None  # firma del .pkl de sklearn del que salió (ver exportar)
+        # RandomForest compara en float32 (umbral float32) y el boosting en float64
+        self.precision = umbral.dtype
+        self.profundidad = _profundidad(izquierda, raices)
+        # Copias con el tipo de índice nativo: np.take no convierte en cada nivel
+        self._izquierda = izquierda.astype(np.intp)
+        self._caracteristica = caracteristica.astype(np.intp)
+        self._raices = raices.astype(np.intp)
+
+    @property
+    def n_arboles(self):
+        return len(self.raices)
+
+    def _hojas(self, X):
+        """Hoja alcanzada en cada árbol (filas) por cada muestra (columnas)."""
+        n = len(X)
+        plano = np.ascontiguousarray(X.T).ravel()  # columna por columna: x[f] de la fila i en f * n + i
+        columna = self._caracteristica * n
+        nodo = np.repeat(self._raices[:, None], n, axis=1)
+        filas = np.arange(n)
+        indice, x, umbral = np.empty_like(nodo), np.empty(nodo.shape, self.precision), np.empty(nodo.shape, self.precision)
+        derecha = np.empty(nodo.shape, dtype=bool)
+        for _ in range(self.profundidad):
+            np.take(columna, nodo, out=indice)
+            indice += filas
+            np.take(plano, indice, out=x)
+            np.take(self.umbral, nodo, out=umbral)
+            np.greater(x, umbral, out=derecha)
+            np.take(self._izquierda, nodo, out=nodo)
+            nodo += derecha
+        return nodo
+
+    def predict(self, X):
+        X = np.asarray(X, dtype=self.precision)
+        salida = np.empty(len(X), dtype=np.float64)
+        paso = max(1, ELEMENTOS_POR_BLOQUE // max(1, self.n_arboles))
+        for inicio in range(0, len(X), paso):
+            valores = self.valor[self._hojas(X[inicio:inicio + paso])]
+            salida[inicio:inicio + paso] = (valores.mean(axis=0, dtype=np.float64) if self.combinar == 'media'
+                                            else self.base + valores.sum(axis=0, dtype=np.float64))
+        return salida
+
+
+def _profundidad(izquierda, raices):
+    """Profundidad máxima (en aristas) recorriendo todos los árboles nivel por nivel."""
+    nivel, profundidad = np.asarray(raices), 0
+    while True:
+        nivel = nivel[izquierda[nivel] != nivel]
+        if not len(nivel):
+            return profundidad
+        nivel = np.concatenate([izquierda[nivel], izquierda[nivel] + 1])
+        profundidad += 1
+
+
+# --- APLANAR ---
+
+def _por_niveles(izquierda, derecha):
+    """Orden de los nodos (ids originales) recorriendo el árbol por niveles, hermanos contiguos."""
+    orden, nivel = [], np.array([0])
+    while len(nivel):
+        orden.append(nivel)
+        internos = nivel[izquierda[nivel] >= 0]
+        nivel = np.column_stack([izquierda[internos], derecha[internos]]).ravel()
+    return np.concatenate(orden)
+
+
+def _umbral_float32(umbral):
+    """Mayor float32 <= umbral: `x <= u32` da lo mismo que `x <= umbral` con x en float32."""
+    u = umbral.astype(np.float32)
+    mayores = u.astype(np.float64) > umbral
+    u[mayores] = np.nextafter(u[mayores], np.float32(-np.inf))
+    return u
+
+
+def _unir(arboles, precision):
+    """Concatena los árboles (izq, der con -1 en hojas, caracteristica, umbral, valor) renumerados."""
+    partes = {k: [] for k in ('izquierda', 'caracteristica', 'umbral', 'valor')}
+    raices, desplazamiento = [], 0
+    for izquierda, derecha, caracteristica, umbral, valor in arboles:
+        orden = _por_niveles(izquierda, derecha)
+        nuevo = np.empty(len(izquierda), dtype=np.int64)
+        nuevo[orden] = np.arange(len(orden))
+        hoja = izquierda[orden] < 0
+        propio = np.arange(len(orden))
+        partes['izquierda'].append(np.where(hoja, propio, nuevo[np.where(hoja, 0, izquierda[orden])]) + desplazamiento)
+        partes['caracteristica'].append(np.where(hoja, 0, caracteristica[orden]))
+        partes['umbral'].append(np.where(hoja, np.inf, umbral[orden]))
+        partes['valor'].append(valor[orden])
+        raices.append(desplazamiento)
+        desplazamiento += len(orden)
+    umbral = np.concatenate(partes['umbral'])
+    return {
+        'izquierda': np.concatenate(partes['izquierda']).astype(np.int32),
+        'caracteristica': np.concatenate(partes['caracteristica']).astype(np.int16),
+        'umbral': _umbral_float32(umbral) if precision == np.float32 else umbral.astype(np.float64),
+        'valor': np.concatenate(partes['valor']).astype(np.float32),
+        'raices': np.asarray(raices, dtype=np.int32),
+    }
+
+
+def aplanar(modelo):
+    """ArbolesPlanos equivalente a un RandomForestRegressor o HistGradientBoostingRegressor ajustado."""
+    if hasattr(modelo, 'estimators_'):
+        arboles = []
+        for estimador in modelo.estimators_:
+            t = estimador.tree_
+            arboles.append((t.children_left, t.children_right, t.feature, t.threshold, t.value[:, 0, 0]))
+        return ArbolesPlanos(**_unir(arboles, np.float32), combinar='media')
+    if type(modelo).__name__ == 'HistGradientBoostingRegressor':
+        _comprobar_boosting(modelo)
+        arboles = []
+        for iteracion in modelo._predictors:
+            nodos = iteracion[0].nodes
+            if nodos['is_categorical'].any():
+                raise ValueError("Los cortes categóricos del boosting no se pueden aplanar; "
+                                 "entrena sin categorical_features.")
+            hoja = nodos['is_leaf'].astype(bool)
+            arboles.append((np.where(hoja, -1, nodos['left'].astype(np.int64)),
+                            np.where(hoja, -1, nodos['right'].astype(np.int64)),
+                            nodos['feature_idx'], nodos['num_threshold'], nodos['value']))
+        base = float(np.ravel(modelo._baseline_prediction)[0])
+        return ArbolesPlanos(**_unir(arboles, np.float64), combinar='suma', base=base)
+    raise TypeError(f"No sé aplanar un {type(modelo).__name__}.")
+
+
+def _comprobar_boosting(modelo):
+    """Falla con un mensaje claro si esta versión de sklearn cambió los atributos privados que se leen."""
+    import sklearn
+
+    faltan = [a for a in ATRIBUTOS_BOOSTING if not hasattr(modelo, a)]
+    if not faltan and modelo._predictors:
+        faltan = [f"nodes['{c}']" for c in CAMPOS_NODO if c not in modelo._predictors[0][0].nodes.dtype.names]
+    if faltan:
+        raise TypeError(f"scikit-learn {sklearn.__version__} no expone {', '.join(faltan)} en "
+                        f"HistGradientBoostingRegressor: no se puede aplanar. Usa --motor bosque o una "
+                        f"versión de scikit-learn entre 1.7 y 1.9.")
+
+
+# --- GUARDAR Y CARGAR ---
+
+ARREGLOS = ['izquierda', 'caracteristica', 'umbral', 'valor', 'raices']
+
+
+def _firma(ruta):
+    estado = os.stat(ruta)
+    return {'bytes': estado.st_size, 'mtime_ns': estado.st_mtime_ns}
+
+
+def exportar(modelo, codificadores, ruta=RUTA_COMPACTO, origen=None):
+    """Guarda el modelo aplanado y los codificadores en un .npz (sin pickle). Devuelve el ArbolesPlanos.
+
+    `origen` es el .pkl de sklearn del mismo entrenamiento: se anota su firma para que
+    pronosticar() solo lo use en lotes grandes si sigue siendo ese archivo.
+    """
+    plano = modelo if isinstance(modelo, ArbolesPlanos) else aplanar(modelo)
+    meta = {'formato': FORMATO, 'combinar': plano.combinar, 'base': plano.base, 'codificadores': codificadores,
+            'origen': _firma(origen) if origen else None}
+    # Escritura atómica: la app o el servidor nunca leen un archivo a medio escribir
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    descriptor, temporal = tempfile.mkstemp(prefix='.arboles-', suffix='.npz', dir=directorio)
+    try:
+        with os.fdopen(descriptor, 'wb') as f:
+            np.savez(f, meta=np.frombuffer(json.dumps(meta, ensure_ascii=False).encode('utf-8'), dtype=np.uint8),
+                     **{k: getattr(plano, k) for k in ARREGLOS})
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+    plano.origen = meta['origen']
+    return plano
+
+
+def cargar(ruta=RUTA_COMPACTO):
+    """Devuelve (modelo, codificadores) desde el .npz de exportar()."""
+    with np.load(ruta, allow_pickle=False) as datos:
+        meta = json.loads(datos['meta'].tobytes().decode('utf-8'))
+        if meta.get('formato') != FORMATO:
+            raise ValueError(f"Formato {meta.get('formato')!r} no soportado en '{ruta}' "
+                             f"(se esperaba {FORMATO}): vuelve a ejecutar entrenar_modelo.py.")
+        arreglos = {k: datos[k] for k in ARREGLOS}
+    modelo = ArbolesPlanos(**arreglos, combinar=meta['combinar'], base=meta['base'])
+    modelo.origen = meta.get('origen')
+    return modelo, meta['codificadores']
+
+
+def mismo_origen(modelo, ruta):
+    """True si `ruta` es el .pkl de sklearn que se aplanó en `modelo` (misma firma de archivo)."""
+    origen = getattr(modelo, 'origen', None)
+    return bool(origen) and os.path.exists(ruta) and _firma(ruta) == origen
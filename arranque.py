@@ -0,0 +1,143 @@
+import argparse
+import importlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+# --- PERFIL DE ARRANQUE ---
+# Mide cuánto cuesta en frío cada import y cada artefacto de la app:
+#   - dentro de la app, TIEMPOS guarda lo que pagó este proceso (solo la primera vez)
+#   - `python arranque.py` lanza intérpretes nuevos y reporta el arranque base, el
+#     costo de la primera visita a cada vista y la carga de cada artefacto
+
+T0 = time.perf_counter()
+TIEMPOS = {}
+_ultima_marca = T0
+
+# Lo que app.py importa y carga antes de dibujar la primera página
+BASE = ['numpy', 'pandas', 'streamlit', 'almacen', 'artefacto', 'cache_compartido', 'puntuar', 'vistas']
+
+
+@contextmanager
+def medir(nombre):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        TIEMPOS.setdefault(nombre, time.perf_counter() - t0)
+
+
+def marcar(nombre):
+    """Registra el tiempo transcurrido desde la marca anterior (o desde que se importó este módulo)."""
+    global _ultima_marca
+    ahora = time.perf_counter()
+    TIEMPOS.setdefault(nombre, ahora - _ultima_marca)
+    _ultima_marca = ahora
+
+
+def importar(modulo):
+    """import_module que anota el costo de la primera importación en este proceso."""
+    if modulo in sys.modules:
+        return sys.modules[modulo]
+    with medir(f'import {modulo}'):
+        return importlib.import_module(modulo)
+
+
+def _cargadores():
+    """Artefactos que puede leer la app, solo si existen en el directorio actual."""
+    import artefacto
+    import kpis
+
+    cargadores = {}
+    if artefacto.existe():
+        cargadores['artefacto NumPy'] = lambda: artefacto.cargar()
+    if os.path.exists(artefacto.RUTA_MODELOS):
+        # Incluye el import de sklearn que provoca el unpickle
+        cargadores['pack joblib'] = lambda: importlib.import_module('joblib').load(artefacto.RUTA_MODELOS)
+    if os.path.exists(kpis.RUTA_CUBO):
+        cargadores['cubo KPIs'] = lambda: importlib.import_module('joblib').load(kpis.RUTA_CUBO)
+    return cargadores
+
+
+def _sonda(pasos):
+    """Ejecuta los pasos en este proceso (recién creado) e imprime sus tiempos en JSON."""
+    tiempos = []
+    for paso in pasos:
+        t0 = time.perf_counter()
+        if paso.startswith('cargar:'):
+            _cargadores()[paso[len('cargar:'):]]()
+        elif paso.startswith('silencio:'):
+            importlib.import_module(paso[len('silencio:'):])
+            continue
+        else:
+            importlib.import_module(paso)
+        tiempos.append([paso, time.perf_counter() - t0])
+    print(json.dumps(tiempos))
+
+
+def _en_proceso_nuevo(pasos, repeticiones):
+    """Mediana por paso de `repeticiones` intérpretes nuevos."""
+    muestras = {}
+    for _ in range(repeticiones):
+        salida = subprocess.run([sys.executable, os.path.abspath(__file__), '--sonda', json.dumps(pasos)],
+                                capture_output=True, text=True, check=True, cwd=os.getcwd()).stdout
+        for paso, segundos in json.loads(salida.splitlines()[-1]):
+            muestras.setdefault(paso, []).append(segundos)
+    return {paso: statistics.median(valores) for paso, valores in muestras.items()}
+
+
+def reporte(repeticiones=3):
+    import vistas
+
+    cargadores = _cargadores()
+    # La app carga el artefacto si existe; si no, el pack de joblib
+    modelos = next((n for n in ('artefacto NumPy', 'pack joblib') if n in cargadores), None)
+    base = _en_proceso_nuevo(BASE + ([f'cargar:{modelos}'] if modelos else []), repeticiones)
+    paginas = {}
+    for pagina, modulo in vistas.PAGINAS.items():
+        medido = _en_proceso_nuevo([f'silencio:{m}' for m in BASE] + [modulo], repeticiones)
+        paginas[pagina] = medido[modulo]
+    artefactos = {nombre: _en_proceso_nuevo([f'cargar:{nombre}'], repeticiones)[f'cargar:{nombre}']
+                  for nombre in cargadores}
+    return {'base': base, 'arranque_s': sum(base.values()), 'paginas': paginas, 'artefactos': artefactos}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reporte de tiempos de arranque en frío de la app.")
+    parser.add_argument('--repeticiones', type=int, default=3, help="Procesos por medición (se usa la mediana).")
+    parser.add_argument('--json', help="Guarda el reporte en este archivo.")
+    parser.add_argument('--presupuesto', type=float,
+                        help="Segundos máximos de arranque base; si se supera, termina con código 1.")
+    parser.add_argument('--sonda', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.sonda:
+        _sonda(json.loads(args.sonda))
+        return
+
+    r = reporte(args.repeticiones)
+    print("⏱️ Arranque base (imports de app.py y carga de modelos):")
+    for paso, segundos in r['base'].items():
+        print(f"   - {paso:<28} {segundos * 1000:8.1f} ms")
+    print(f"   = {'total':<28} {r['arranque_s'] * 1000:8.1f} ms")
+    print("🧭 Primera visita a cada vista (sobre el arranque base):")
+    for pagina, segundos in r['paginas'].items():
+        print(f"   - {pagina:<28} {segundos * 1000:8.1f} ms")
+    print("📦 Artefactos (proceso nuevo, incluye sus imports):")
+    for nombre, segundos in r['artefactos'].items():
+        print(f"   - {nombre:<28} {segundos * 1000:8.1f} ms")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(r, f, indent=2, ensure_ascii=False)
+    if args.presupuesto is not None and r['arranque_s'] > args.presupuesto:
+        print(f"❌ El arranque base ({r['arranque_s']:.2f}s) supera el presupuesto de {args.presupuesto:.2f}s")
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,288 @@
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# --- ARTEFACTO DE MODELOS VERSIONADO (SOLO NUMPY) ---
+# Exporta los parámetros ajustados del pack de modelos_finales.pkl a un directorio:
+#   manifiesto.json  -> versión de formato, arreglos (archivo, dtype, forma, sha256) y tablas pequeñas
+#   *.npy            -> coeficientes, escalas y centroides (se abren con mmap, sin copiar)
+# y los carga en un dict con las mismas claves que el pack, con predictores que solo
+# usan NumPy. Así la app, el servidor y la puntuación masiva arrancan sin importar sklearn.
+
+RUTA_ARTEFACTO = 'modelos_finales'
+RUTA_MODELOS = 'modelos_finales.pkl'
+MANIFIESTO = 'manifiesto.json'
+FORMATO = 1
+ARREGLOS = ['lineal_coef', 'lineal_intercepto', 'logistico_coef', 'logistico_intercepto',
+            'logistico_clases', 'scaler_media', 'scaler_escala', 'kmeans_centros']
+
+
+class ArtefactoInvalido(ValueError):
+    """El artefacto está incompleto, corrupto o tiene un formato que no sabemos leer."""
+
+
+# --- PREDICTORES LIGEROS (mismo subconjunto de API que los estimadores de sklearn) ---
+
+class RegresionLineal:
+    def __init__(self, coef, intercepto):
+        self.coef_ = coef
+        self.intercept_ = float(intercepto)
+        self.n_features_in_ = len(coef)
+
+    def predict(self, X):
+        return np.asarray(X, dtype=float) @ self.coef_ + self.intercept_
+
+
+class RegresionLogistica:
+    def __init__(self, coef, intercepto, clases):
+        self.coef_ = coef
+        self.intercept_ = intercepto
+        self.classes_ = clases
+
+    def decision_function(self, X):
+        return np.asarray(X, dtype=float) @ self.coef_[0] + self.intercept_[0]
+
+    def predict_proba(self, X):
+        z = self.decision_function(X)
+        p = np.exp(-np.logaddexp(0, -z))  # sigmoide sin desbordamiento para |z| grande
+        return np.column_stack([1 - p, p])
+
+    def predict(self, X):
+        return self.classes_[(self.decision_function(X) > 0).astype(int)]
+
+
+class Escalador:
+    def __init__(self, media, escala):
+        self.mean_ = media
+        self.scale_ = escala
+
+    def transform(self, X):
+        return (np.asarray(X, dtype=float) - self.mean_) / self.scale_
+
+    def inverse_transform(self, X):
+        return np.asarray(X, dtype=float) * self.scale_ + self.mean_
+
+
+class Centroides:
+    """Asignación al centroide más cercano, como KMeans.predict."""
+
+    def __init__(self, centros):
+        self.cluster_centers_ = centros
+        self.n_clusters = len(centros)
+
+    def predict(self, X):
+        X = np.asarray(X, dtype=float)
+        distancias = ((X[:, None, :] - self.cluster_centers_[None, :, :]) ** 2).sum(axis=2)
+        return distancias.argmin(axis=1).astype(np.int32)
+
+
+class Codificador:
+    """Equivalente a un LabelEncoder ya ajustado; falla con niveles desconocidos."""
+
+    def __init__(self, clases):
+        self.classes_ = np.asarray(clases, dtype=object)
+
+    def transform(self, valores):
+        valores = np.asarray(valores, dtype=str)
+        codigos = pd.Index(self.classes_).get_indexer(valores)
+        if (codigos < 0).any():
+            raise ValueError(f"Nivel desconocido: {sorted(set(valores[codigos < 0].tolist()))}")
+        return codigos.astype(np.int64)
+
+    def inverse_transform(self, codigos):
+        return self.classes_[np.asarray(codigos)]
+
+
+# --- EXPORTAR ---
+
+def _arreglos(pack):
+    """Parámetros del pack como arreglos numéricos contiguos."""
+    lineal, logistico = pack['modelo_lineal'], pack['modelo_logistico']
+    scaler, kmeans = pack['scaler_kmeans'], pack['modelo_kmeans']
+    return {
+        'lineal_coef': np.ravel(lineal.coef_).astype(np.float64),
+        'lineal_intercepto': np.array(lineal.intercept_, dtype=np.float64),
+        'logistico_coef': np.atleast_2d(logistico.coef_).astype(np.float64),
+        'logistico_intercepto': np.ravel(logistico.intercept_).astype(np.float64),
+        'logistico_clases': np.asarray(logistico.classes_, dtype=np.int64),
+        'scaler_media': np.asarray(scaler.mean_, dtype=np.float64),
+        'scaler_escala': np.asarray(scaler.scale_, dtype=np.float64),
+        'kmeans_centros': np.ascontiguousarray(kmeans.cluster_centers_, dtype=np.float64),
+    }
+
+
+def _sha256(ruta):
+    h = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        for trozo in iter(lambda: f.read(1 << 20), b''):
+            h.update(trozo)
+    return h.hexdigest()
+
+
+def exportar(pack, ruta=RUTA_ARTEFACTO):
+    """Escribe el artefacto en `ruta` (reemplazando el anterior de forma atómica). Devuelve el manifiesto."""
+    padre = os.path.dirname(os.path.abspath(ruta))
+    temporal = tempfile.mkdtemp(prefix='.artefacto-', dir=padre)
+    try:
+        arreglos = {}
+        for nombre, valor in _arreglos(pack).items():
+            archivo = f'{nombre}.npy'
+            np.save(os.path.join(temporal, archivo), valor)
+            arreglos[nombre] = {'archivo': archivo, 'dtype': valor.dtype.str, 'forma': list(valor.shape),
+                                'sha256': _sha256(os.path.join(temporal, archivo))}
+
+        tablas = {}
+        if 'resumen_clusters' in pack:
+            tablas['resumen_clusters'] = json.loads(pack['resumen_clusters'].to_json(orient='split', index=False))
+        manifiesto = {
+            'formato': FORMATO,
+            'creado': datetime.datetime.now().isoformat(timespec='seconds'),
+            'columnas': {
+                'lineal': [str(c) for c in getattr(pack['modelo_lineal'], 'feature_names_in_', ['Precio_Unitario'])],
+                'logistico': ['Distancia_KM', 'Trafico_Cod'],
+                'kmeans': ['Edad_Cliente', 'Gasto_Hist_Cliente'],
+            },
+            'clases_trafico': [str(c) for c in pack['le_trafico'].classes_],
+            'arreglos': arreglos,
+            'tablas': tablas,
+        }
+        # La suma de verificación del conjunto también sirve como versión del artefacto
+        manifiesto['checksum'] = hashlib.sha256(
+            json.dumps(manifiesto, sort_keys=True).encode('utf-8')).hexdigest()
+        with open(os.path.join(temporal, MANIFIESTO), 'w', encoding='utf-8') as f:
+            json.dump(manifiesto, f, indent=2, ensure_ascii=False)
+
+        # Un directorio no se puede reemplazar atómicamente: se aparta el viejo y se renombra el nuevo
+        viejo = None
+        if os.path.exists(ruta):
+            viejo = tempfile.mkdtemp(prefix='.artefacto-viejo-', dir=padre)
+            os.replace(ruta, os.path.join(viejo, 'anterior'))
+        os.replace(temporal, ruta)
+        if viejo is not None:
+            shutil.rmtree(viejo)
+    except BaseException:
+        shutil.rmtree(temporal, ignore_errors=True)
+        raise
+    return manifiesto
+
+
+# --- CARGAR ---
+
+def leer_manifiesto(ruta=RUTA_ARTEFACTO):
+    archivo = os.path.join(ruta, MANIFIESTO)
+    if not os.path.exists(archivo):
+        raise FileNotFoundError(archivo)
+    try:
+        with open(archivo, encoding='utf-8') as f:
+            manifiesto = json.load(f)
+    except ValueError as e:
+        raise ArtefactoInvalido(f"Manifiesto ilegible en '{archivo}': {e}") from e
+    if manifiesto.get('formato') != FORMATO:
+        raise ArtefactoInvalido(f"Formato {manifiesto.get('formato')!r} no soportado (se esperaba {FORMATO}). "
+                                f"Vuelve a exportar con 'python artefacto.py exportar'.")
+    esperado = manifiesto.pop('checksum', None)
+    calculado = hashlib.sha256(json.dumps(manifiesto, sort_keys=True).encode('utf-8')).hexdigest()
+    if esperado != calculado:
+        raise ArtefactoInvalido(f"El checksum del manifiesto no coincide en '{archivo}'.")
+    manifiesto['checksum'] = esperado
+    return manifiesto
+
+
+def _abrir(ruta, nombre, info, verificar):
+    archivo = os.path.join(ruta, info['archivo'])
+    if not os.path.exists(archivo):
+        raise ArtefactoInvalido(f"Falta '{archivo}' del artefacto.")
+    if verificar and _sha256(archivo) != info['sha256']:
+        raise ArtefactoInvalido(f"'{archivo}' está corrupto (sha256 distinto al del manifiesto).")
+    try:
+        valor = np.load(archivo, mmap_mode='r', allow_pickle=False)
+    except ValueError as e:
+        raise ArtefactoInvalido(f"'{archivo}' no es un arreglo .npy válido: {e}") from e
+    if valor.dtype.str != info['dtype'] or list(valor.shape) != info['forma']:
+        raise ArtefactoInvalido(f"'{nombre}' tiene dtype/forma {valor.dtype.str}{list(valor.shape)}, "
+                                f"el manifiesto dice {info['dtype']}{info['forma']}.")
+    return valor
+
+
+def cargar(ruta=RUTA_ARTEFACTO, verificar=True):
+    """Carga el artefacto como un pack (dict) con predictores NumPy. Falla con ArtefactoInvalido."""
+    manifiesto = leer_manifiesto(ruta)
+    a = {nombre: _abrir(ruta, nombre, info, verificar) for nombre, info in manifiesto['arreglos'].items()}
+    faltan = set(ARREGLOS) - set(a)
+    if faltan:
+        raise ArtefactoInvalido(f"Al manifiesto le faltan arreglos: {sorted(faltan)}")
+
+    pack = {
+        'modelo_lineal': RegresionLineal(a['lineal_coef'], a['lineal_intercepto']),
+        'modelo_logistico': RegresionLogistica(a['logistico_coef'], a['logistico_intercepto'], a['logistico_clases']),
+        'le_trafico': Codificador(manifiesto['clases_trafico']),
+        'scaler_kmeans': Escalador(a['scaler_media'], a['scaler_escala']),
+        'modelo_kmeans': Centroides(a['kmeans_centros']),
+        'version_artefacto': manifiesto['checksum'],
+    }
+    pack['centroides_kmeans'] = pd.DataFrame(pack['scaler_kmeans'].inverse_transform(a['kmeans_centros']),
+                                             columns=manifiesto['columnas']['kmeans'])
+    if 'resumen_clusters' in manifiesto['tablas']:
+        tabla = manifiesto['tablas']['resumen_clusters']
+        pack['resumen_clusters'] = pd.DataFrame(tabla['data'], columns=tabla['columns'])
+    return pack
+
+
+def existe(ruta=RUTA_ARTEFACTO):
+    return os.path.exists(os.path.join(ruta, MANIFIESTO))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta o verifica el artefacto NumPy de los modelos.")
+    sub = parser.add_subparsers(dest='comando', required=True)
+    exp = sub.add_parser('exportar', help="Genera el artefacto desde modelos_finales.pkl.")
+    exp.add_argument('--pack', default=RUTA_MODELOS)
+    exp.add_argument('--salida', default=RUTA_ARTEFACTO)
+    ver = sub.add_parser('verificar', help="Comprueba checksums y que las predicciones coincidan con el pack.")
+    ver.add_argument('--artefacto', default=RUTA_ARTEFACTO)
+    ver.add_argument('--pack', default=RUTA_MODELOS, help="Pack sklearn con el que comparar (si existe).")
+    args = parser.parse_args()
+
+    if args.comando == 'exportar':
+        import joblib
+
+        manifiesto = exportar(joblib.load(args.pack), args.salida)
+        print(f"✅ Artefacto '{args.salida}/' exportado (checksum {manifiesto['checksum'][:12]})")
+        return
+
+    try:
+        ligero = cargar(args.artefacto)
+    except (FileNotFoundError, ArtefactoInvalido) as e:
+        print(f"❌ ERROR: {e}")
+        raise SystemExit(1)
+    print(f"✅ Artefacto íntegro (checksum {ligero['version_artefacto'][:12]})")
+    if os.path.exists(args.pack):
+        import joblib
+
+        import puntuar
+
+        pack = joblib.load(args.pack)
+        rng = np.random.default_rng(0)
+        n = 10_000
+        precio, distancia = rng.uniform(1, 30, n), rng.uniform(0.5, 20, n)
+        trafico = rng.choice(pack['le_trafico'].classes_, n)
+        edad, gasto = rng.integers(18, 90, n), rng.uniform(0, 500, n)
+        diferencias = {
+            'demanda': np.abs(puntuar.predecir_demanda(pack, precio) - puntuar.predecir_demanda(ligero, precio)).max(),
+            'retraso': np.abs(puntuar.predecir_retraso(pack, distancia, trafico)
+                              - puntuar.predecir_retraso(ligero, distancia, trafico)).max(),
+            'segmento': (puntuar.asignar_segmento(pack, edad, gasto) != puntuar.asignar_segmento(ligero, edad, gasto)).sum(),
+        }
+        for tarea, diferencia in diferencias.items():
+            print(f"   - {tarea}: diferencia máxima con sklearn {diferencia:.3g}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+import argparse
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import caracteristicas
+import entrenar_modelo
+
+# --- BACKTESTING DEL PRONÓSTICO (ORIGEN MÓVIL) ---
+# En lugar de un train_test_split aleatorio (que mezcla días futuros en el entrenamiento),
+# se evalúan varios cortes en el tiempo: para cada corte se entrena con todo lo anterior
+# y se mide el error en los `horizonte` días siguientes, como se usaría en producción.
+#   - Las características de cada pliegue (con codificadores ajustados solo con su
+#     pasado) se guardan en backtesting_cache/<huella de los datos>/ y se reutilizan
+#     entre corridas; a los procesos solo se les pasa la ruta.
+#   - Los pliegues se entrenan en paralelo, un proceso por pliegue.
+#   - El resultado es el MAE por categoría y corte, junto a una referencia simple
+#     (la media histórica del producto) para saber si el modelo aporta.
+
+RUTA_CACHE = 'backtesting_cache'
+SALIDA = 'backtesting.csv'
+CORTES = 8
+HORIZONTE_DIAS = 28
+MINIMO_DIAS = 180  # historia mínima antes del primer corte
+
+
+def calcular_cortes(fechas, n_cortes=CORTES, horizonte=HORIZONTE_DIAS, minimo=MINIMO_DIAS):
+    """Cortes cuyas ventanas de prueba son contiguas y terminan en la última fecha (en orden cronológico)."""
+    fechas = pd.to_datetime(fechas)
+    inicio, fin = fechas.min().normalize(), fechas.max().normalize()
+    ultimo = fin - pd.Timedelta(days=horizonte - 1)
+    cortes = [ultimo - pd.Timedelta(days=horizonte * i) for i in range(n_cortes)]
+    return sorted(c for c in cortes if c - inicio >= pd.Timedelta(days=minimo))
+
+
+def huella(df):
+    """Identifica el contenido del dataset (para no reutilizar una caché de otros datos)."""
+    h = hashlib.sha256(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    h.update(str(caracteristicas.VERSION).encode())
+    return h.hexdigest()[:16]
+
+
+# --- PLIEGUES ---
+
+def preparar_pliegue(df, fechas, corte, horizonte, carpeta):
+    """Características de entrenamiento y prueba del pliegue en un .npz (se reutiliza si ya existe)."""
+    ruta = os.path.join(carpeta, f'{corte:%Y%m%d}_{horizonte}d.npz')
+    if os.path.exists(ruta):
+        return ruta
+    entrenamiento = df[fechas < corte]
+    prueba = df[(fechas >= corte) & (fechas < corte + pd.Timedelta(days=horizonte))]
+    X_train, y_train, codificadores = entrenar_modelo.preparar(entrenamiento)
+    X_test, y_test, _ = entrenar_modelo.preparar(prueba, codificadores)
+    temporal = ruta + '.tmp.npz'
+    np.savez(temporal, X_train=X_train.to_numpy(), y_train=y_train.to_numpy(dtype=float),
+             X_test=X_test.to_numpy(), y_test=y_test.to_numpy(dtype=float),
+             categoria=prueba['Categoria'].to_numpy(dtype=str),
+             producto_train=X_train['Nombre_Producto_cod'].to_numpy(),
+             producto_test=X_test['Nombre_Producto_cod'].to_numpy(),
+             corte=np.array(str(corte.date())))
+    os.replace(temporal, ruta)
+    return ruta
+
+
+def _referencia(producto_train, y_train, producto_test):
+    """Pronóstico ingenuo: media histórica de cada producto (la media global si es nuevo)."""
+    suma = np.bincount(producto_train, weights=y_train)
+    conteo = np.bincount(producto_train)
+    medias = np.divide(suma, conteo, out=np.full(len(suma), y_train.mean()), where=conteo > 0)
+    conocido = (producto_test >= 0) & (producto_test < len(medias))
+    return np.where(conocido, medias[np.clip(producto_test, 0, len(medias) - 1)], y_train.mean())
+
+
+def evaluar_pliegue(ruta, motor='bosque'):
+    """Entrena y mide un pliegue; devuelve el MAE por categoría (más el total) y los segundos."""
+    t0 = time.perf_counter()
+    with np.load(ruta, allow_pickle=False) as d:
+        datos = {k: d[k] for k in d.files}
+    # Un núcleo por pliegue: el paralelismo está en los pliegues
+    modelo = entrenar_modelo.entrenar(datos['X_train'], datos['y_train'], motor, trabajadores=1)
+    error = np.abs(modelo.predict(datos['X_test']) - datos['y_test'])
+    error_ref = np.abs(_referencia(datos['producto_train'], datos['y_train'], datos['producto_test']) - datos['y_test'])
+    tabla = pd.DataFrame({'Categoria': datos['categoria'], 'error': error, 'error_ref': error_ref})
+    por_categoria = tabla.groupby('Categoria').agg(MAE=('error', 'mean'), MAE_referencia=('error_ref', 'mean'),
+                                                   Filas=('error', 'size')).reset_index()
+    total = pd.DataFrame({'Categoria': ['Total'], 'MAE': [error.mean()], 'MAE_referencia': [error_ref.mean()],
+                          'Filas': [len(error)]})
+    resultado = pd.concat([por_categoria, total], ignore_index=True)
+    resultado.insert(0, 'Corte', pd.Timestamp(str(datos['corte'])))
+    resultado['Filas_entrenamiento'] = len(datos['y_train'])
+    return resultado, time.perf_counter() - t0
+
+
+def backtesting(df, n_cortes=CORTES, horizonte=HORIZONTE_DIAS, minimo=MINIMO_DIAS,
+                motor='bosque', trabajadores=None, cache=RUTA_CACHE):
+    """MAE por categoría y corte (DataFrame largo) y los tiempos de preparación y entrenamiento."""
+    fechas = pd.to_datetime(df['Fecha'])
+    cortes = calcular_cortes(fechas, n_cortes, horizonte, minimo)
+    if not cortes:
+        raise ValueError(f"El historial ({fechas.min():%Y-%m-%d} a {fechas.max():%Y-%m-%d}) no alcanza para "
+                         f"{minimo} días de entrenamiento más {horizonte} de prueba.")
+    carpeta = os.path.join(cache, huella(df))
+    os.makedirs(carpeta, exist_ok=True)
+
+    t0 = time.perf_counter()
+    rutas = [preparar_pliegue(df, fechas, corte, horizonte, carpeta) for corte in cortes]
+    tiempos = {'preparar': time.perf_counter() - t0}
+
+    t0 = time.perf_counter()
+    trabajadores = min(trabajadores or os.cpu_count() or 1, len(rutas))
+    if trabajadores > 1:
+        with ProcessPoolExecutor(max_workers=trabajadores) as pool:
+            resultados = list(pool.map(evaluar_pliegue, rutas, [motor] * len(rutas)))
+    else:
+        resultados = [evaluar_pliegue(ruta, motor) for ruta in rutas]
+    tiempos['entrenar'] = time.perf_counter() - t0
+    tiempos['pliegues'] = [segundos for _, segundos in resultados]
+    return pd.concat([tabla for tabla, _ in resultados], ignore_index=True), tiempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtesting de origen móvil del pronóstico de ventas.")
+    parser.add_argument('--datos', default=entrenar_modelo.RUTA_DATOS, help="CSV o Parquet de ventas (generar_datos.py).")
+    parser.add_argument('--cortes', type=int, default=CORTES, help="Número de cortes a evaluar.")
+    parser.add_argument('--horizonte', type=int, default=HORIZONTE_DIAS, help="Días pronosticados tras cada corte.")
+    parser.add_argument('--minimo', type=int, default=MINIMO_DIAS, help="Días de historia antes del primer corte.")
+    parser.add_argument('--motor', choices=['bosque', 'boosting'], default='bosque')
+    parser.add_argument('--trabajadores', type=int, default=None, help="Procesos (por defecto, todos los núcleos).")
+    parser.add_argument('--salida', default=SALIDA, help="CSV con el MAE por corte y categoría.")
+    parser.add_argument('--cache', default=RUTA_CACHE, help="Carpeta de características por pliegue.")
+    args = parser.parse_args()
+
+    try:
+        df = entrenar_modelo.cargar_datos(args.datos)
+    except FileNotFoundError:
+        print(f"❌ ERROR: No se encuentra '{args.datos}'.")
+        raise SystemExit(1)
+    print(f"⏳ Backtesting de {len(df):,} filas ({args.cortes} cortes de {args.horizonte} días, motor {args.motor})...")
+    try:
+        resultados, tiempos = backtesting(df, args.cortes, args.horizonte, args.minimo, args.motor,
+                                          args.trabajadores, args.cache)
+    except ValueError as e:
+        print(f"❌ ERROR: {e}")
+        raise SystemExit(1)
+    print(f"   - características: {tiempos['preparar']:.2f}s (en caché para la próxima corrida)")
+    print(f"   - entrenamiento: {tiempos['entrenar']:.2f}s ({len(tiempos['pliegues'])} pliegues, "
+          f"{max(tiempos['pliegues']):.2f}s el más lento)")
+
+    resultados.to_csv(args.salida, index=False)
+    tabla = resultados.pivot(index='Corte', columns='Categoria', values='MAE')
+    print("\n--- MAE por categoría y corte (unidades) ---")
+    print(tabla.round(2).to_string())
+    total = resultados[resultados['Categoria'] == 'Total']
+    print(f"\nMAE medio: {total['MAE'].mean():.2f} (desviación entre cortes {total['MAE'].std(ddof=0):.2f}); "
+          f"referencia (media del producto): {total['MAE_referencia'].mean():.2f}")
+    print(f"💾 Resultados en '{args.salida}'")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,247 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import almacen
+import artefacto
+import clientes
+import entrenar
+import graficos
+import jerarquico
+import kpis
+import puntuar
+import segmentacion
+
+# El generador vive en Data/data.py
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Data'))
+import data
+
+# --- BENCHMARK DE GENERACIÓN, CARGA, ENTRENAMIENTO, INFERENCIA Y VISTAS ---
+# Para cada escala se crea (o reutiliza) un dataset sintético en bench_datos/<escala>/
+# con Data/data.py, y dentro de esa carpeta se mide cada etapa con las rutas por
+# defecto de los módulos, igual que la app. El resultado es un JSON comparable entre
+# corridas: `--comparar anterior.json` marca las etapas que se volvieron más lentas.
+
+ESCALAS = {'1.5k': 1_500, '100k': 100_000, '1M': 1_000_000, '10M': 10_000_000}
+DIRECTORIO = 'bench_datos'
+SALIDA = 'benchmark.json'
+REPETICIONES = 3
+LLAMADAS_UNITARIAS = 200
+UMBRAL_REGRESION = 1.2   # más de un 20% más lento que la corrida anterior
+MINIMO_COMPARABLE_S = 0.005  # por debajo de esto el ruido domina
+
+
+def cronometrar(funcion, repeticiones):
+    """Ejecuta `funcion` varias veces; devuelve (mediana, mínimo, último resultado)."""
+    tiempos = []
+    resultado = None
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - t0)
+    return statistics.median(tiempos), min(tiempos), resultado
+
+
+class Medidor:
+    def __init__(self, repeticiones, pasos=None):
+        self.repeticiones = repeticiones
+        self.pasos = pasos
+        self.resultados = {}
+
+    def activo(self, nombre):
+        return not self.pasos or any(nombre.startswith(p) for p in self.pasos)
+
+    def medir(self, nombre, funcion, filas=None, repeticiones=None):
+        if not self.activo(nombre):
+            return None
+        mediana, minimo, resultado = cronometrar(funcion, repeticiones or self.repeticiones)
+        self.resultados[nombre] = {'s': mediana, 'min_s': minimo}
+        if filas:
+            self.resultados[nombre]['filas_por_s'] = filas / max(mediana, 1e-9)
+        print(f"   - {nombre:<24} {mediana * 1000:10.1f} ms" + (f"  ({filas / max(mediana, 1e-9):,.0f} filas/s)" if filas else ""))
+        return resultado
+
+
+# --- DATOS DE PRUEBA ---
+
+def preparar_datos(carpeta, filas, semilla, regenerar, medidor):
+    """Crea el CSV y el almacén Parquet de la escala (o los reutiliza si coinciden filas y semilla)."""
+    descriptor = os.path.join(carpeta, 'fixture.json')
+    esperado = {'filas': filas, 'semilla': semilla}
+    if not regenerar and os.path.exists(descriptor):
+        with open(descriptor, encoding='utf-8') as f:
+            if json.load(f) == esperado:
+                return
+    shutil.rmtree(carpeta, ignore_errors=True)
+    os.makedirs(carpeta)
+    escribir = {
+        'escribir_csv': lambda: data.guardar_csv(data.generar_dataset(filas, semilla),
+                                                 os.path.join(carpeta, almacen.RUTA_CSV)),
+        'escribir_parquet': lambda: almacen.escribir_bloques(data.generar_dataset(filas, semilla),
+                                                             os.path.join(carpeta, almacen.RUTA_ALMACEN)),
+    }
+    for nombre, funcion in escribir.items():
+        if medidor.activo(nombre):
+            medidor.medir(nombre, funcion, filas, repeticiones=1)
+        else:
+            funcion()  # con --pasos sin la escritura, los datos se crean igual (sin medir)
+    with open(descriptor, 'w', encoding='utf-8') as f:
+        json.dump(esperado, f)
+
+
+# --- ETAPAS (se ejecutan dentro de la carpeta de la escala) ---
+
+def _filas_unitarias(df, n):
+    muestra = df.iloc[:n]
+    return [muestra.iloc[[i]] for i in range(len(muestra))]
+
+
+def medir_escala(filas, medidor, semilla):
+    columnas_entrada = list(dict.fromkeys(c for t in puntuar.ENTRADAS.values() for c in t))
+
+    # 1. Generación en memoria (sin E/S)
+    medidor.medir('generar', lambda: sum(len(b) for b in data.generar_dataset(filas, semilla)), filas)
+
+    # 2. Carga de columnas: CSV frente al almacén columnar
+    medidor.medir('leer_csv', lambda: almacen.leer(almacen.COLUMNAS_ENTRENAMIENTO, ruta='__sin_almacen__'), filas)
+    df = medidor.medir('leer_parquet', lambda: almacen.leer(almacen.COLUMNAS_ENTRENAMIENTO), filas)
+    if df is None:
+        df = almacen.leer(almacen.COLUMNAS_ENTRENAMIENTO)
+    # Un mes (el último): el filtro de fechas descarta las demás particiones sin leerlas
+    mes = almacen.leer(['Fecha'])['Fecha'].max().to_period('M')
+    medidor.medir('leer_parquet_mes', lambda: almacen.leer(almacen.COLUMNAS_ENTRENAMIENTO, mes.start_time,
+                                                           mes.end_time), filas)
+
+    # 3. Almacén por cliente desde cero, entrenamiento de cada modelo (en memoria) y en modo streaming
+    def clientes_desde_cero():
+        if os.path.exists(clientes.RUTA_CLIENTES):
+            os.remove(clientes.RUTA_CLIENTES)
+        return clientes.actualizar()
+
+    medidor.medir('clientes', clientes_desde_cero, filas)
+    perfiles = clientes.perfiles(clientes.actualizar())
+    _, tareas = entrenar.preparar(df, perfiles)
+    for nombre, (funcion, *argumentos) in tareas.items():
+        clave = 'entrenar_' + nombre.lower().replace('í', 'i').replace('-', '')
+        medidor.medir(clave, lambda: funcion(*argumentos), filas)
+    # Cada repetición descarta su pack: entrenar sin guardar no deja nada en disco (ni asignaciones)
+    medidor.medir('entrenar_streaming', lambda: entrenar.entrenar_streaming()[1], filas)
+
+    # El pack de la escala se guarda como lo haría entrenar.py (pkl y artefacto NumPy)
+    pack, _ = entrenar.entrenar(df, perfiles, trabajadores=1)
+    segmentacion.agregar_al_pack(pack, perfiles, pack['modelo_kmeans'], pack['scaler_kmeans'])
+    entrenar.guardar_pack(pack)
+    artefacto.exportar(pack)
+
+    # 4. Inferencia: carga del pack, puntuación por lotes y por fila
+    entradas = df[columnas_entrada]
+    unitarias = _filas_unitarias(entradas, LLAMADAS_UNITARIAS)
+    for tipo, cargar in [('pkl', lambda: puntuar.cargar_pack(puntuar.RUTA_MODELOS)),
+                         ('artefacto', lambda: artefacto.cargar())]:
+        cargado = medidor.medir(f'cargar_{tipo}', cargar) or cargar()
+        medidor.medir(f'lote_{tipo}', lambda: puntuar.puntuar_lote(cargado, entradas), filas)
+        unitaria = medidor.medir(f'unitaria_{tipo}', lambda: [puntuar.puntuar_lote(cargado, fila) for fila in unitarias])
+        if unitaria is not None:
+            medidor.resultados[f'unitaria_{tipo}']['ms_por_fila'] = \
+                medidor.resultados[f'unitaria_{tipo}']['s'] * 1000 / len(unitarias)
+
+    # 5. Preparación de datos de cada vista de la app (sin navegador)
+    def cubo_desde_cero():
+        if os.path.exists(kpis.RUTA_CUBO):
+            os.remove(kpis.RUTA_CUBO)
+        return kpis.actualizar(pack)
+
+    medidor.medir('vista_dashboard', cubo_desde_cero, filas)
+    medidor.medir('vista_ventas', lambda: graficos.histograma_2d(almacen.leer_bloques, 'Precio_Unitario', 'Cantidad'), filas)
+    medidor.medir('vista_riesgos', lambda: graficos.histograma(almacen.leer_bloques, 'Distancia_KM', por='Llega_Tarde'), filas)
+    medidor.medir('vista_clientes', lambda: graficos.histograma_2d(segmentacion.leer_asignaciones, 'Edad_Cliente',
+                                                                   'Gasto_Hist_Cliente', por='Cluster'), filas)
+    medidor.medir('vista_estructural', lambda: jerarquico.construir(), filas)
+
+
+# --- COMPARACIÓN ENTRE CORRIDAS ---
+
+def comparar(actual, anterior, umbral=UMBRAL_REGRESION):
+    """Etapas cuya mediana supera `umbral` veces la de la corrida anterior."""
+    regresiones = []
+    for escala, res in actual['escalas'].items():
+        previas = anterior.get('escalas', {}).get(escala, {}).get('resultados', {})
+        for paso, medida in res['resultados'].items():
+            previa = previas.get(paso)
+            if previa and previa['s'] >= MINIMO_COMPARABLE_S and medida['s'] > umbral * previa['s']:
+                regresiones.append((escala, paso, previa['s'], medida['s']))
+    return regresiones
+
+
+def entorno():
+    import sklearn
+    import pyarrow
+
+    return {
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+        'pyarrow': pyarrow.__version__,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de generación, carga, entrenamiento, inferencia y vistas.")
+    parser.add_argument('--escalas', nargs='+', choices=list(ESCALAS), default=['1.5k', '100k'],
+                        help="Tamaños del dataset sintético (por defecto 1.5k y 100k).")
+    parser.add_argument('--salida', default=SALIDA, help="Archivo JSON de resultados.")
+    parser.add_argument('--directorio', default=DIRECTORIO, help="Carpeta de los datasets de prueba (se reutilizan).")
+    parser.add_argument('--repeticiones', type=int, default=REPETICIONES,
+                        help="Repeticiones por etapa hasta 100k filas (las escalas mayores se miden una vez).")
+    parser.add_argument('--semilla', type=int, default=data.SEMILLA)
+    parser.add_argument('--pasos', nargs='*', help="Solo las etapas con estos prefijos (p.ej. leer entrenar).")
+    parser.add_argument('--regenerar', action='store_true', help="Vuelve a crear los datasets de prueba.")
+    parser.add_argument('--comparar', help="JSON de una corrida anterior; termina con código 1 si hay regresiones.")
+    parser.add_argument('--umbral', type=float, default=UMBRAL_REGRESION)
+    args = parser.parse_args()
+
+    informe = {'fecha': datetime.datetime.now().isoformat(timespec='seconds'), 'entorno': entorno(), 'escalas': {}}
+    directorio = os.path.abspath(args.directorio)
+    inicial = os.getcwd()
+    for escala in args.escalas:
+        filas = ESCALAS[escala]
+        print(f"⏱️ Escala {escala} ({filas:,} filas)")
+        medidor = Medidor(args.repeticiones if filas <= 100_000 else 1, args.pasos)
+        carpeta = os.path.join(directorio, escala)
+        preparar_datos(carpeta, filas, args.semilla, args.regenerar, medidor)
+        os.chdir(carpeta)
+        try:
+            medir_escala(filas, medidor, args.semilla)
+        finally:
+            os.chdir(inicial)
+        informe['escalas'][escala] = {'filas': filas, 'repeticiones': medidor.repeticiones,
+                                      'resultados': medidor.resultados}
+
+    with open(args.salida, 'w', encoding='utf-8') as f:
+        json.dump(informe, f, indent=2, ensure_ascii=False)
+    print(f"💾 Resultados en '{args.salida}'")
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            regresiones = comparar(informe, json.load(f), args.umbral)
+        for escala, paso, antes, ahora in regresiones:
+            print(f"🐢 {escala} {paso}: {antes * 1000:.1f} ms -> {ahora * 1000:.1f} ms ({ahora / antes:.2f}x)")
+        if regresiones:
+            raise SystemExit(1)
+        print("✅ Sin regresiones respecto a la corrida anterior.")
+
+
+if __name__ == '__main__':
+    main()
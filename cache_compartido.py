@@ -0,0 +1,223 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+import almacen
+
+# --- CACHÉ COMPARTIDA DE LAS VISTAS ---
+# Streamlit atiende todas las sesiones en un mismo proceso: lo que se guarda aquí (a nivel de
+# módulo) lo comparten todos los analistas, en lugar de una copia por sesión.
+#   - clave: nombre del resultado, huella del contenido del dataset (si depende de él), versión
+#     del modelo y argumentos; al cambiar los datos o el modelo, las entradas viejas se descartan
+#   - memoria acotada (CACHE_VISTAS_MB, 512 por defecto): se desaloja lo usado hace más tiempo
+#   - cada resultado lo calcula una sola sesión; las demás esperan y lo reutilizan
+#   - solo lectura: cada sesión recibe copias superficiales (DataFrames) o vistas no
+#     escribibles (arreglos), así añadir una columna no altera la copia compartida
+#   - ingesta.py avisa de los datos nuevos con una señal (ver abajo) y solo se descarta lo afectado
+#   - aciertos, fallos y desalojos para el panel "🗄️ Caché" de la app
+
+LIMITE_MB = int(os.environ.get('CACHE_VISTAS_MB', 512))
+
+
+def _tamano(valor):
+    """Bytes aproximados de un resultado (DataFrames, arreglos y diccionarios o listas de ellos)."""
+    if isinstance(valor, (pd.DataFrame, pd.Series, pd.Index)):
+        return int(np.sum(valor.memory_usage(deep=True)))
+    if isinstance(valor, np.ndarray):
+        return valor.nbytes
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(_tamano(k) + _tamano(v) for k, v in valor.items())
+    if isinstance(valor, (list, tuple)):
+        return sys.getsizeof(valor) + sum(_tamano(v) for v in valor)
+    return sys.getsizeof(valor)
+
+
+def _solo_lectura(valor):
+    """Lo que recibe cada sesión: modificarlo no toca el valor guardado."""
+    if isinstance(valor, (pd.DataFrame, pd.Series)):
+        return valor.copy(deep=False)  # copy-on-write: se copia solo lo que la sesión modifique
+    if isinstance(valor, np.ndarray):
+        vista = valor.view()
+        vista.flags.writeable = False
+        return vista
+    if isinstance(valor, dict):
+        return {k: _solo_lectura(v) for k, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return type(valor)(_solo_lectura(v) for v in valor)
+    return valor
+
+
+class CacheCompartida:
+    """LRU acotada en bytes y segura entre hilos; cada clave se calcula una sola vez a la vez."""
+
+    def __init__(self, limite_bytes):
+        self.limite_bytes = limite_bytes
+        self._entradas = OrderedDict()  # clave -> (valor, bytes), de la menos a la más reciente
+        self._calculando = {}  # clave -> threading.Event de la sesión que la calcula
+        self._candado = threading.Lock()
+        self.bytes = 0
+        self.aciertos = self.fallos = self.desalojos = self.invalidaciones = 0
+
+    def obtener(self, clave, calcular):
+        """Valor guardado para `clave`; si no está, lo calcula con `calcular()` y lo guarda."""
+        while True:
+            with self._candado:
+                if clave in self._entradas:
+                    self._entradas.move_to_end(clave)
+                    self.aciertos += 1
+                    return _solo_lectura(self._entradas[clave][0])
+                evento = self._calculando.get(clave)
+                if evento is None:
+                    self.fallos += 1
+                    evento = self._calculando[clave] = threading.Event()
+                    break
+            # Otra sesión lo está calculando: se espera y se vuelve a mirar (si falló, se calcula aquí)
+            evento.wait()
+        try:
+            valor = calcular()
+            self._guardar(clave, valor)
+        finally:
+            with self._candado:
+                del self._calculando[clave]
+            evento.set()
+        return _solo_lectura(valor)
+
+    def _guardar(self, clave, valor):
+        tamano = _tamano(valor)
+        if isinstance(valor, np.ndarray):
+            valor.flags.writeable = False
+        with self._candado:
+            if tamano > self.limite_bytes:
+                return  # no cabe ni sola: se devuelve sin guardar
+            if clave in self._entradas:
+                self.bytes -= self._entradas.pop(clave)[1]
+            self._entradas[clave] = (valor, tamano)
+            self.bytes += tamano
+            while self.bytes > self.limite_bytes:
+                _, (_, liberados) = self._entradas.popitem(last=False)
+                self.bytes -= liberados
+                self.desalojos += 1
+
+    def invalidar(self, descartar=None):
+        """Quita las entradas cuya clave cumple `descartar(clave)` (todas si no se indica); devuelve cuántas."""
+        with self._candado:
+            claves = [c for c in self._entradas if descartar is None or descartar(c)]
+            for clave in claves:
+                self.bytes -= self._entradas.pop(clave)[1]
+            self.invalidaciones += len(claves)
+        return len(claves)
+
+    def estadisticas(self):
+        with self._candado:
+            consultas = self.aciertos + self.fallos
+            return {
+                'entradas': len(self._entradas),
+                'mb': self.bytes / 2**20,
+                'limite_mb': self.limite_bytes / 2**20,
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'tasa_aciertos': self.aciertos / consultas if consultas else None,
+                'desalojos': self.desalojos,
+                'invalidaciones': self.invalidaciones,
+            }
+
+
+CACHE = CacheCompartida(LIMITE_MB * 2**20)
+
+
+# --- VERSIONES ---
+
+def version_modelo(pack):
+    """Checksum del artefacto NumPy o, con el pack de joblib, sha1 de modelos_finales.pkl."""
+    import kpis  # joblib solo hace falta con el pack de joblib
+
+    return (pack or {}).get('version_artefacto') or kpis.version_modelo()
+
+
+# --- SEÑALES DE INGESTA ---
+# Otro proceso (ingesta.py) avisa de que añadió datos escribiendo un JSON pequeño con sus
+# últimos eventos. La app solo mira su fecha de modificación en cada consulta: al llegar un
+# evento descarta en el acto las entradas que dependen de lo que cambió ('transacciones' son
+# todas las que dependen del dataset; también se pueden nombrar resultados concretos). No hay
+# descarte por meses: esas entradas llevan en la clave la huella de todo el dataset, que cambia
+# con cualquier anexo. Sin señales, la huella se revisa como mucho cada REVISION_SEGUNDOS.
+
+RUTA_SENAL = 'cache_senal.json'
+EVENTOS_GUARDADOS = 50
+REVISION_SEGUNDOS = 5.0
+
+
+def leer_senal(ruta=RUTA_SENAL):
+    try:
+        with open(ruta, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {'secuencia': 0, 'eventos': []}
+
+
+def senalar(afecta=('transacciones',), ruta=RUTA_SENAL):
+    """Publica un evento para las apps abiertas; devuelve su número de secuencia (un solo escritor)."""
+    senal = leer_senal(ruta)
+    evento = {'secuencia': senal['secuencia'] + 1, 'momento': time.time(), 'afecta': list(afecta)}
+    senal = {'secuencia': evento['secuencia'], 'eventos': (senal['eventos'] + [evento])[-EVENTOS_GUARDADOS:]}
+    # Escritura atómica: la app nunca lee una señal a medio escribir
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    descriptor, temporal = tempfile.mkstemp(prefix='.senal-', suffix='.tmp', dir=directorio)
+    with os.fdopen(descriptor, 'w', encoding='utf-8') as f:
+        json.dump(senal, f)
+    os.replace(temporal, ruta)
+    return evento['secuencia']
+
+
+def _afectada(clave, afecta):
+    return clave[0] in afecta or ('transacciones' in afecta and clave[1][0] is not None)
+
+
+def _obsoleta(clave, huella, modelo):
+    datos, version = clave[1]
+    return version != modelo or (datos is not None and datos != huella)
+
+
+_estado = {'marca_senal': None, 'secuencia': None, 'huella': None, 'revisada': -np.inf, 'vigente': None}
+_candado_estado = threading.Lock()
+
+
+def _huella_datos():
+    """Huella del dataset, atendiendo primero las señales de ingesta pendientes."""
+    try:
+        marca = os.stat(RUTA_SENAL).st_mtime_ns
+    except FileNotFoundError:
+        marca = None
+    with _candado_estado:
+        if marca != _estado['marca_senal']:
+            senal = leer_senal()
+            vista = _estado['secuencia']
+            if vista is not None and senal['secuencia'] > vista:
+                nuevos = [e for e in senal['eventos'] if e['secuencia'] > vista]
+                afecta = set().union(*(e['afecta'] for e in nuevos))
+                if len(nuevos) < senal['secuencia'] - vista:
+                    afecta.add('transacciones')  # se perdieron eventos: todo lo que depende de los datos
+                CACHE.invalidar(lambda clave: _afectada(clave, afecta))
+                _estado['revisada'] = -np.inf
+            _estado.update(marca_senal=marca, secuencia=senal['secuencia'])
+        if time.monotonic() - _estado['revisada'] > REVISION_SEGUNDOS:
+            _estado.update(huella=almacen.huella_contenido(), revisada=time.monotonic())
+        return _estado['huella']
+
+
+def resultado(nombre, calcular, *args, pack=None, datos=True):
+    """Resultado compartido de `calcular(*args)` para el modelo actual (y los datos, si `datos`)."""
+    huella, modelo = _huella_datos(), version_modelo(pack)
+    with _candado_estado:
+        if (huella, modelo) != _estado['vigente']:
+            # Al cambiar los datos o el modelo se descartan las entradas que dependían de los anteriores
+            _estado['vigente'] = (huella, modelo)
+            CACHE.invalidar(lambda clave: _obsoleta(clave, huella, modelo))
+    return CACHE.obtener((nombre, (huella if datos else None, modelo), args), lambda: calcular(*args))
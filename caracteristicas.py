@@ -0,0 +1,78 @@
+import joblib
+import numpy as np
+import pandas as pd
+
+# --- CARACTERÍSTICAS DEL MODELO DE PRONÓSTICO (entrenar_modelo.py) ---
+# Un mismo pipeline para entrenar y para predecir:
+#   - fecha   -> dia_semana, mes, dia_mes, es_fin_de_semana (accesores .dt vectorizados)
+#   - promo   -> 1/0 con una comparación vectorizada (sin apply por fila)
+#   - producto y categoría -> un código entero por valor (los árboles no necesitan one-hot,
+#     así el número de columnas no crece con el catálogo)
+# Los codificadores (categorías conocidas y orden de columnas) se guardan junto al modelo.
+
+RUTA_CODIFICADORES = 'codificadores_pronostico.pkl'
+VERSION = 2
+
+COLUMNAS_CATEGORICAS = ['Nombre_Producto', 'Categoria']
+COLUMNAS_FECHA = ['dia_semana', 'mes', 'dia_mes', 'es_fin_de_semana']
+OBJETIVO = 'Cantidad_Vendida'
+DESCONOCIDO = -1  # Código de un producto o categoría que no estaba en el entrenamiento
+
+
+def ajustar(df):
+    """Codificadores aprendidos de los datos de entrenamiento."""
+    categorias = {c: sorted(df[c].astype(str).unique().tolist()) for c in COLUMNAS_CATEGORICAS}
+    catalogo = df.drop_duplicates('Nombre_Producto').astype({'Nombre_Producto': str, 'Categoria': str})
+    return {
+        'version': VERSION,
+        'categorias': categorias,
+        'catalogo': dict(zip(catalogo['Nombre_Producto'], catalogo['Categoria'])),
+        'columnas': COLUMNAS_FECHA + ['Promocion'] + [f'{c}_cod' for c in COLUMNAS_CATEGORICAS],
+    }
+
+
+def transformar(df, codificadores):
+    """Matriz de características (solo numérica, en el orden de `codificadores['columnas']`)."""
+    fecha = pd.to_datetime(df['Fecha'])
+    X = pd.DataFrame({
+        'dia_semana': fecha.dt.weekday.astype(np.int8),
+        'mes': fecha.dt.month.astype(np.int8),
+        'dia_mes': fecha.dt.day.astype(np.int8),
+        'es_fin_de_semana': (fecha.dt.weekday >= 5).astype(np.int8),
+        'Promocion': df['Promocion'].astype(str).eq('Si').astype(np.int8),
+    }, index=df.index)
+    for c in COLUMNAS_CATEGORICAS:
+        conocidas = codificadores['categorias'][c]
+        codigos = pd.Index(conocidas).get_indexer(df[c].astype(str))
+        # -1 (DESCONOCIDO) si no estaba en el entrenamiento; int32 solo para catálogos de más de 32k SKUs
+        X[f'{c}_cod'] = codigos.astype(np.int16 if len(conocidas) < 2**15 else np.int32)
+    return X[codificadores['columnas']]
+
+
+def rejilla(codificadores, fechas, promocion=False):
+    """Todas las combinaciones producto x fecha del catálogo de entrenamiento (para pronosticar en lote)."""
+    productos = list(codificadores['catalogo'])
+    fechas = pd.DatetimeIndex(pd.to_datetime(fechas))
+    return pd.DataFrame({
+        'Fecha': np.tile(fechas, len(productos)),
+        'Nombre_Producto': np.repeat(productos, len(fechas)),
+        'Categoria': np.repeat([codificadores['catalogo'][p] for p in productos], len(fechas)),
+        'Promocion': 'Si' if promocion else 'No',
+    })
+
+
+def desconocidos(df, codificadores):
+    """Valores de producto/categoría que el modelo no vio al entrenar."""
+    return {c: sorted(set(df[c].astype(str)) - set(codificadores['categorias'][c])) for c in COLUMNAS_CATEGORICAS}
+
+
+def guardar(codificadores, ruta=RUTA_CODIFICADORES):
+    joblib.dump(codificadores, ruta)
+
+
+def cargar(ruta=RUTA_CODIFICADORES):
+    codificadores = joblib.load(ruta)
+    if codificadores.get('version') != VERSION:
+        raise ValueError(f"Codificadores de versión {codificadores.get('version')!r} en '{ruta}' "
+                         f"(se esperaba {VERSION}): vuelve a ejecutar entrenar_modelo.py.")
+    return codificadores
@@ -0,0 +1,153 @@
+import json
+import os
+
+import pandas as pd
+
+import almacen
+
+# --- ALMACÉN DE CARACTERÍSTICAS POR CLIENTE ---
+# En el dataset la edad y el gasto histórico se repiten (con ruido) en cada transacción,
+# así que K-Means y el dendrograma agrupaban transacciones y no clientes. Este almacén
+# guarda una fila por ID_Cliente con estadísticos acumulables (sumas, conteos, primera y
+# última compra, pedidos por categoría), de modo que:
+#   - se actualiza solo con las transacciones nuevas (marca de agua, como kpis.py)
+#   - perfiles() deriva de ellos recencia, frecuencia, monto, mezcla de categorías,
+#     distancia media y la edad/gasto medios que usa la segmentación
+# Se guarda como un Parquet ordenado por ID_Cliente (columna índice), así una búsqueda por
+# cliente solo lee el grupo de filas que lo contiene.
+
+RUTA_CLIENTES = 'clientes_market.parquet'
+TAMANO_CHUNK = 1_000_000
+FILAS_POR_GRUPO = 65_536  # grupos de filas del Parquet (granularidad de la búsqueda por ID)
+CLAVE_MARCA = b'marca_clientes'
+
+COLUMNAS_TRANSACCION = ['Fecha', 'ID_Cliente', 'Categoria', 'Total_Venta', 'Distancia_KM',
+                        'Edad_Cliente', 'Gasto_Hist_Cliente']
+SUMAS = ['Transacciones', 'Monto_Total', 'Suma_Distancia', 'Suma_Edad', 'Suma_Gasto_Hist']
+PREFIJO_PEDIDOS = 'Pedidos_'
+PREFIJO_MEZCLA = 'Mezcla_'
+
+
+def agregar(bloque):
+    """Estadísticos por cliente de un bloque de transacciones."""
+    b = bloque.assign(Fecha=pd.to_datetime(bloque['Fecha']), Categoria=bloque['Categoria'].astype(str))
+    tabla = b.groupby('ID_Cliente').agg(
+        Primera_Compra=('Fecha', 'min'),
+        Ultima_Compra=('Fecha', 'max'),
+        Transacciones=('Fecha', 'size'),
+        Monto_Total=('Total_Venta', 'sum'),
+        Suma_Distancia=('Distancia_KM', 'sum'),
+        Suma_Edad=('Edad_Cliente', 'sum'),
+        Suma_Gasto_Hist=('Gasto_Hist_Cliente', 'sum'),
+    )
+    pedidos = b.groupby(['ID_Cliente', 'Categoria']).size().unstack(fill_value=0)
+    return tabla.join(pedidos.add_prefix(PREFIJO_PEDIDOS))
+
+
+def combinar(tablas):
+    """Suma estadísticos parciales (un cliente puede aparecer en varios bloques)."""
+    tablas = [t for t in tablas if t is not None and len(t)]
+    if not tablas:
+        return agregar(pd.DataFrame(columns=COLUMNAS_TRANSACCION))
+    todo = pd.concat(tablas)
+    pedidos = sorted(c for c in todo.columns if c.startswith(PREFIJO_PEDIDOS))
+    todo[pedidos] = todo[pedidos].fillna(0)
+    grupos = todo.groupby(level=0)
+    total = pd.concat([grupos['Primera_Compra'].min(), grupos['Ultima_Compra'].max(),
+                       grupos[SUMAS + pedidos].sum()], axis=1)
+    total[['Transacciones'] + pedidos] = total[['Transacciones'] + pedidos].astype('int64')
+    total.index.name = 'ID_Cliente'
+    return total.sort_index()
+
+
+# --- LECTURA Y ESCRITURA ---
+
+def _escribir(tabla, marca, ruta):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    arrow = pa.Table.from_pandas(tabla)
+    arrow = arrow.replace_schema_metadata({**arrow.schema.metadata, CLAVE_MARCA: json.dumps(marca).encode()})
+    # Escritura atómica: la app nunca lee un almacén a medio escribir
+    temporal = f'{ruta}.{os.getpid()}.tmp'  # la ingesta y la app pueden actualizarlo a la vez
+    pq.write_table(arrow, temporal, row_group_size=FILAS_POR_GRUPO)
+    os.replace(temporal, ruta)
+
+
+def leer_marca(ruta=RUTA_CLIENTES):
+    import pyarrow.parquet as pq
+
+    if not os.path.exists(ruta):
+        return None
+    metadatos = pq.read_schema(ruta).metadata or {}
+    return json.loads(metadatos[CLAVE_MARCA]) if CLAVE_MARCA in metadatos else None
+
+
+def cargar(columnas=None, ruta=RUTA_CLIENTES):
+    """Estadísticos de todos los clientes (solo `columnas` si se indican), indexados por ID_Cliente."""
+    if not os.path.exists(ruta):
+        raise FileNotFoundError(ruta)
+    return pd.read_parquet(ruta, columns=columnas)
+
+
+def buscar(id_cliente, ruta=RUTA_CLIENTES):
+    """Perfil de un cliente (una Serie) o None si no existe; lee solo su grupo de filas."""
+    if not os.path.exists(ruta):
+        raise FileNotFoundError(ruta)
+    fila = pd.read_parquet(ruta, filters=[('ID_Cliente', '==', int(id_cliente))])
+    if fila.empty:
+        return None
+    return perfiles(fila, referencia=(leer_marca(ruta) or {}).get('ultima_fecha')).iloc[0]
+
+
+def actualizar(ruta_clientes=RUTA_CLIENTES, ruta=almacen.RUTA_ALMACEN, ruta_csv=almacen.RUTA_CSV,
+               tamano_chunk=TAMANO_CHUNK, marca=None):
+    """Devuelve los estadísticos por cliente al día, agregando solo las transacciones nuevas.
+
+    `marca` fija hasta dónde leer (p.ej. la misma que usa el resto de un entrenamiento).
+    """
+    anterior = (leer_marca(ruta_clientes) or {}).get('datos', {})
+    actual = marca or almacen.marca_actual(ruta, ruta_csv)
+    # Un dataset reescrito (no solo ampliado) obliga a reconstruir
+    reconstruir = not almacen.es_continuacion(anterior, actual)
+    if reconstruir:
+        anterior = {}
+    elif anterior == actual:
+        return cargar(ruta=ruta_clientes)
+
+    parciales = [agregar(b) for b in almacen.leer_entre(anterior, actual, COLUMNAS_TRANSACCION, tamano_chunk)]
+    base = [] if reconstruir else [cargar(ruta=ruta_clientes)]
+    tabla = combinar(base + parciales)
+    ultima = tabla['Ultima_Compra'].max()
+    _escribir(tabla, {'datos': actual, 'ultima_fecha': None if pd.isna(ultima) else str(ultima.date())},
+              ruta_clientes)
+    return tabla
+
+
+# --- CARACTERÍSTICAS DERIVADAS ---
+
+def perfiles(tabla, referencia=None):
+    """Recencia, frecuencia, monto, mezcla de categorías, distancia media y edad/gasto medios.
+
+    La recencia se mide hasta `referencia` (por defecto, la última compra de la tabla).
+    """
+    n = tabla['Transacciones'].where(tabla['Transacciones'] > 0)
+    referencia = pd.Timestamp(referencia) if referencia is not None else tabla['Ultima_Compra'].max()
+    salida = pd.DataFrame({
+        'Recencia_Dias': (referencia - tabla['Ultima_Compra']).dt.days,
+        'Frecuencia': tabla['Transacciones'],
+        'Monto_Total': tabla['Monto_Total'],
+        'Ticket_Medio': tabla['Monto_Total'] / n,
+        'Distancia_Media': tabla['Suma_Distancia'] / n,
+        'Edad_Cliente': tabla['Suma_Edad'] / n,
+        'Gasto_Hist_Cliente': tabla['Suma_Gasto_Hist'] / n,
+    }, index=tabla.index)
+    for c in (c for c in tabla.columns if c.startswith(PREFIJO_PEDIDOS)):
+        salida[PREFIJO_MEZCLA + c[len(PREFIJO_PEDIDOS):]] = tabla[c] / n
+    return salida
+
+
+if __name__ == '__main__':
+    tabla = actualizar()
+    print(f"✅ Almacén '{RUTA_CLIENTES}' actualizado: {len(tabla):,} clientes, "
+          f"{int(tabla['Transacciones'].sum()):,} transacciones.")
@@ -0,0 +1,274 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+
+import almacen
+import puntuar
+
+# --- MONITOR DE DERIVA DE DATOS Y MODELOS ---
+# ¿Los pedidos que llegan se parecen a los datos con que se entrenó modelos_finales.pkl?
+#   - referencia (entrenar.py): histograma de cada entrada y salida de los modelos sobre los datos
+#     de entrenamiento, con bordes fijos (cuantiles de una muestra) o categorías
+#   - en vivo (ingesta.py): los mismos histogramas sobre cada micro-lote; los conteos anteriores se
+#     atenúan según las filas nuevas, así reflejan aproximadamente los últimos MEMORIA_FILAS pedidos
+#   - memoria fija (unas decenas de conteos por variable): actualizar cuesta lo que el lote y
+#     nunca se relee el historial
+#   - PSI y KS de cada variable contra la referencia; el dashboard muestra la peor
+
+RUTA_REFERENCIA = 'deriva_referencia.json'
+RUTA_MONITOR = 'deriva_monitor.json'
+BINS = 20
+TAMANO_MUESTRA = 200_000  # filas para fijar los bordes de la referencia
+MEMORIA_FILAS = 50_000
+MINIMO_FILAS = 500  # con menos filas en vivo el PSI es sobre todo ruido
+UMBRALES_PSI = (0.1, 0.25)  # < 0.1 estable, < 0.25 vigilar, el resto deriva
+ESTADOS = ('Estable', 'Vigilar', 'Deriva')
+
+# Variable -> tipo de histograma ('num': bins por cuantiles, 'cat': un bin por categoría)
+ENTRADAS = {'Precio_Unitario': 'num', 'Distancia_KM': 'num', 'Nivel_Trafico': 'cat',
+            'Edad_Cliente': 'num', 'Gasto_Hist_Cliente': 'num'}
+SALIDAS = {puntuar.SALIDAS['demanda']: 'num', puntuar.SALIDAS['retraso']: 'num',
+           puntuar.SALIDAS['segmento']: 'cat'}
+COLUMNAS = list(ENTRADAS)
+
+
+# --- HISTOGRAMAS ---
+
+def _valores(pack, bloque):
+    """Entradas del bloque y, con pack, las predicciones de los tres modelos."""
+    bloque = bloque[COLUMNAS]
+    if pack is None:
+        return bloque
+    # Un nivel de tráfico nuevo no se puede puntuar: esa deriva ya la marca el bin de categorías nuevas
+    conocidos = bloque['Nivel_Trafico'].astype(str).isin(pack['le_trafico'].classes_).all()
+    return puntuar.puntuar_lote(pack, bloque, tuple(puntuar.ENTRADAS) if conocidos else ('demanda', 'segmento'))
+
+
+def _definir(muestra):
+    """Bordes (numéricas) o categorías (el último bin recoge las nuevas) de cada variable, con conteos a cero."""
+    variables = {}
+    for nombre, tipo in {**ENTRADAS, **SALIDAS}.items():
+        if nombre not in muestra:
+            continue
+        variable = {'tipo': 'entrada' if nombre in ENTRADAS else 'salida'}
+        if tipo == 'num':
+            cuantiles = np.quantile(muestra[nombre].to_numpy(float), np.linspace(0, 1, BINS + 1)[1:-1])
+            variable['bordes'] = np.unique(cuantiles).tolist()
+            bins = len(variable['bordes']) + 1
+        else:
+            variable['categorias'] = sorted(muestra[nombre].astype(str).unique().tolist())
+            bins = len(variable['categorias']) + 1
+        variable['conteos'] = [0.0] * bins
+        variables[nombre] = variable
+    return variables
+
+
+def _contar(variables, valores):
+    """Conteos por bin de un lote ya puntuado (una pasada vectorizada por variable)."""
+    conteos = {}
+    for nombre, variable in variables.items():
+        if nombre not in valores:
+            continue
+        bins = len(variable['conteos'])
+        if 'bordes' in variable:
+            indices = np.searchsorted(variable['bordes'], valores[nombre].to_numpy(float), side='right')
+        else:
+            codigos = pd.Index(variable['categorias']).get_indexer(valores[nombre].astype(str))
+            indices = np.where(codigos < 0, bins - 1, codigos)
+        conteos[nombre] = np.bincount(indices, minlength=bins).astype(float)
+    return conteos
+
+
+def _sumar(conteos, nuevos, factor=1.0):
+    """conteos * factor + nuevos, por variable (las que no trae el lote solo se atenúan)."""
+    for nombre, actuales in conteos.items():
+        conteos[nombre] = (np.asarray(actuales) * factor + nuevos.get(nombre, 0.0)).tolist()
+
+
+# --- REFERENCIA (AL ENTRENAR) ---
+
+def crear_referencia(bloques, pack=None, muestra=None, marca=None):
+    """Histogramas de todos los `bloques`; los bordes salen de `muestra` (o del primer bloque)."""
+    variables = conteos = None
+    filas = 0
+    for bloque in bloques:
+        valores = _valores(pack, bloque)
+        if variables is None:
+            variables = _definir(valores if muestra is None else _valores(pack, muestra))
+            conteos = {nombre: v['conteos'] for nombre, v in variables.items()}
+        _sumar(conteos, _contar(variables, valores))
+        filas += len(bloque)
+    if variables is None:
+        raise ValueError("No hay filas para la referencia de deriva")
+    for nombre, v in variables.items():
+        v['conteos'] = conteos[nombre]
+    return {'version': uuid.uuid4().hex[:12], 'creada': time.time(), 'marca': marca,
+            'filas': filas, 'variables': variables}
+
+
+def ampliar_referencia(referencia, bloques, pack=None, marca=None):
+    """Suma a la referencia solo las filas nuevas (entrenamiento incremental), con los mismos bordes.
+
+    Las salidas de las filas anteriores quedan contadas con el modelo de entonces.
+    """
+    variables = referencia['variables']
+    conteos = {nombre: v['conteos'] for nombre, v in variables.items()}
+    for bloque in bloques:
+        _sumar(conteos, _contar(variables, _valores(pack, bloque)))
+        referencia['filas'] += len(bloque)
+    for nombre, v in variables.items():
+        v['conteos'] = conteos[nombre]
+    referencia.update(version=uuid.uuid4().hex[:12], creada=time.time(), marca=marca)
+    return referencia
+
+
+def referencia_entrenamiento(pack, marca, df=None, incremental=False, tamano_bloque=puntuar.TAMANO_LOTE,
+                             ruta=RUTA_REFERENCIA):
+    """Referencia del pack recién entrenado: sobre `df` (en memoria) o leyendo el almacén hasta `marca`.
+
+    En modo incremental, si la referencia guardada cubre un prefijo de los datos, solo se le suman
+    las filas nuevas.
+    """
+    if df is not None:
+        bloques = (df.iloc[i:i + tamano_bloque] for i in range(0, len(df), tamano_bloque))
+        muestra = df.sample(min(len(df), TAMANO_MUESTRA), random_state=0)
+        return crear_referencia(bloques, pack, muestra, marca)
+    previa = leer_referencia(ruta)
+    if incremental and previa and previa.get('marca') and almacen.es_continuacion(previa['marca'], marca):
+        return ampliar_referencia(previa, almacen.leer_entre(previa['marca'], marca, COLUMNAS, tamano_bloque),
+                                  pack, marca)
+    return crear_referencia(almacen.leer_entre({}, marca, COLUMNAS, tamano_bloque), pack, marca=marca)
+
+
+def _leer(ruta):
+    try:
+        with open(ruta, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _guardar(datos, ruta):
+    """Escritura atómica: la app nunca lee un JSON a medio escribir."""
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    descriptor, temporal = tempfile.mkstemp(prefix='.deriva-', suffix='.tmp', dir=directorio)
+    with os.fdopen(descriptor, 'w', encoding='utf-8') as f:
+        json.dump(datos, f)
+    os.replace(temporal, ruta)
+
+
+def leer_referencia(ruta=RUTA_REFERENCIA):
+    return _leer(ruta)
+
+
+def guardar_referencia(referencia, ruta=RUTA_REFERENCIA):
+    _guardar(referencia, ruta)
+
+
+# --- MONITOR EN VIVO (EN CADA MICRO-LOTE) ---
+
+def observar(lote, pack=None, ruta_referencia=RUTA_REFERENCIA, ruta_monitor=RUTA_MONITOR):
+    """Suma un micro-lote a los histogramas en vivo; devuelve el monitor (None si no hay referencia)."""
+    referencia = _leer(ruta_referencia)
+    if referencia is None:
+        return None
+    monitor = _leer(ruta_monitor)
+    if monitor is None or monitor['referencia'] != referencia['version']:
+        # Referencia nueva (modelo re-entrenado): los histogramas en vivo empiezan de cero
+        monitor = {'referencia': referencia['version'], 'filas': 0, 'lotes': 0,
+                   'conteos': {nombre: [0.0] * len(v['conteos']) for nombre, v in referencia['variables'].items()}}
+    # Atenuación exponencial por filas: memoria fija y peso ~1/e para lo visto hace MEMORIA_FILAS pedidos
+    _sumar(monitor['conteos'], _contar(referencia['variables'], _valores(pack, lote)),
+           np.exp(-len(lote) / MEMORIA_FILAS))
+    monitor.update(filas=monitor['filas'] + len(lote), lotes=monitor['lotes'] + 1, actualizado=time.time())
+    _guardar(monitor, ruta_monitor)
+    return monitor
+
+
+# --- MÉTRICAS ---
+
+def _proporciones(conteos, suavizado=0.5):
+    conteos = np.asarray(conteos, dtype=float) + suavizado  # un bin vacío no da log(0)
+    return conteos / conteos.sum()
+
+
+def psi(referencia, vivo):
+    """Índice de estabilidad poblacional entre dos histogramas con los mismos bins."""
+    p, q = _proporciones(referencia), _proporciones(vivo)
+    return float(np.sum((q - p) * np.log(q / p)))
+
+
+def ks(referencia, vivo):
+    """Distancia de Kolmogorov-Smirnov evaluada en los bordes de los bins (cota inferior de la exacta)."""
+    p, q = _proporciones(referencia, 0.0), _proporciones(vivo, 0.0)
+    return float(np.max(np.abs(np.cumsum(p) - np.cumsum(q))))
+
+
+def estado(valor_psi):
+    return ESTADOS[int(np.searchsorted(UMBRALES_PSI, valor_psi, side='right'))]
+
+
+def informe(ruta_referencia=RUTA_REFERENCIA, ruta_monitor=RUTA_MONITOR):
+    """PSI y KS de cada variable en vivo contra la referencia (vacío si aún no hay datos que comparar)."""
+    columnas = ['Tipo', 'Filas', 'PSI', 'KS', 'Estado']
+    referencia, monitor = _leer(ruta_referencia), _leer(ruta_monitor)
+    if referencia is None or monitor is None or monitor['referencia'] != referencia['version']:
+        return pd.DataFrame(columns=columnas).rename_axis('Variable')
+    filas = {}
+    for nombre, variable in referencia['variables'].items():
+        vivo = np.asarray(monitor['conteos'][nombre])
+        if vivo.sum() < MINIMO_FILAS:
+            continue
+        valor = psi(variable['conteos'], vivo)
+        filas[nombre] = {'Tipo': variable['tipo'], 'Filas': vivo.sum(), 'PSI': valor,
+                         # KS solo tiene sentido con un orden entre bins (no en categorías)
+                         'KS': ks(variable['conteos'], vivo) if 'bordes' in variable else np.nan,
+                         'Estado': estado(valor)}
+    return pd.DataFrame.from_dict(filas, orient='index', columns=columnas).rename_axis('Variable')
+
+
+def resumen(tabla):
+    """Variable de mayor PSI del informe: {'variable', 'psi', 'estado'} o None si está vacío."""
+    if tabla.empty:
+        return None
+    peor = tabla['PSI'].idxmax()
+    return {'variable': peor, 'psi': float(tabla.loc[peor, 'PSI']), 'estado': tabla.loc[peor, 'Estado']}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Referencia y estado del monitor de deriva.")
+    sub = parser.add_subparsers(dest='comando', required=True)
+    p_ref = sub.add_parser('referencia', help="Crea la referencia con el pack actual sobre todo el dataset.")
+    p_ref.add_argument('--modelos', default=None,
+                       help="Artefacto (directorio) o pack .pkl (por defecto el artefacto si existe).")
+    p_ref.add_argument('--lote', type=int, default=puntuar.TAMANO_LOTE, help="Filas por bloque.")
+    sub.add_parser('informe', help="PSI y KS de los pedidos ingeridos contra la referencia.")
+    args = parser.parse_args()
+
+    if args.comando == 'referencia':
+        t0 = time.perf_counter()
+        pack = puntuar.cargar_pack(args.modelos)
+        referencia = referencia_entrenamiento(pack, almacen.marca_actual(), tamano_bloque=args.lote)
+        guardar_referencia(referencia)
+        print(f"✅ Referencia '{RUTA_REFERENCIA}' con {referencia['filas']:,} filas "
+              f"({time.perf_counter() - t0:.2f}s, versión {referencia['version']})")
+        return
+
+    tabla = informe()
+    if tabla.empty:
+        print(f"ℹ️ Sin datos que comparar: hace falta '{RUTA_REFERENCIA}' (entrenar.py) y al menos "
+              f"{MINIMO_FILAS} pedidos ingeridos con ella (ingesta.py).")
+        return
+    print(tabla.round(4).to_string())
+    peor = resumen(tabla)
+    print(f"➡️ {peor['estado']}: PSI máximo {peor['psi']:.3f} en {peor['variable']}")
+
+
+if __name__ == '__main__':
+    main()
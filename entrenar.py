@@ -1,45 +1,426 @@
-import pandas as pd
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
-from sklearn.linear_model import LinearRegression, LogisticRegression
+import pandas as pd
+from sklearn.linear_model import LinearRegression, LogisticRegression, SGDClassifier
 from sklearn.cluster import KMeans
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 import joblib
 
-# 1. Cargar datos
-print("Cargando datos...")
-df = pd.read_csv('dataset_market_final.csv')
-
-# 2. Modelo Lineal (Ventas)
-print("Entrenando Lineal...")
-X_lin = df[['Precio_Unitario']]
-y_lin = df['Cantidad']
-modelo_lineal = LinearRegression()
-modelo_lineal.fit(X_lin, y_lin)
-
-# 3. Modelo Logístico (Retrasos)
-print("Entrenando Logístico...")
-le_trafico = LabelEncoder()
-df['Trafico_Cod'] = le_trafico.fit_transform(df['Nivel_Trafico'])
-X_log = df[['Distancia_KM', 'Trafico_Cod']]
-y_log = df['Llega_Tarde']
-modelo_logistico = LogisticRegression()
-modelo_logistico.fit(X_log, y_log)
-
-# 4. K-Means (Clientes)
-print("Entrenando K-Means...")
-X_cluster = df[['Edad_Cliente', 'Gasto_Hist_Cliente']]
-scaler_kmeans = StandardScaler()
-X_scaled = scaler_kmeans.fit_transform(X_cluster)
-kmeans = KMeans(n_clusters=3, random_state=42)
-kmeans.fit(X_scaled)
-
-# 5. Guardar
-pack = {
-    'modelo_lineal': modelo_lineal,
-    'modelo_logistico': modelo_logistico,
-    'le_trafico': le_trafico,
-    'modelo_kmeans': kmeans,
-    'scaler_kmeans': scaler_kmeans
-}
-joblib.dump(pack, 'modelos_finales.pkl')
-print("¡CEREBRO NUEVO CREADO EXITOSAMENTE!")
\ No newline at end of file
+import almacen
+import artefacto
+import clientes
+import deriva
+import puntuar
+import segmentacion
+
+# --- ENTRENAMIENTO DE LOS MODELOS DE modelos_finales.pkl ---
+# Único punto de entrada: lee una vez las columnas compartidas, entrena los tres
+# modelos (independientes entre sí) en paralelo y guarda el pack de forma atómica.
+
+RUTA_MODELOS = 'modelos_finales.pkl'
+TAMANO_CHUNK = 500_000  # Filas por bloque en el modo streaming
+FILAS_EXACTO = 200_000  # Hasta aquí el modo streaming ajusta el logístico exacto (cabe en memoria)
+
+
+# --- MODELO 1: REGRESIÓN LINEAL (Predicción de Demanda) ---
+def entrenar_lineal(X, y):
+    t0 = time.perf_counter()
+    modelo_lineal = LinearRegression()
+    modelo_lineal.fit(X, y)
+    return {'modelo_lineal': modelo_lineal}, time.perf_counter() - t0
+
+
+# --- MODELO 2: REGRESIÓN LOGÍSTICA (Probabilidad de Retraso) ---
+def entrenar_logistico(X, y):
+    t0 = time.perf_counter()
+    modelo_logistico = LogisticRegression()
+    modelo_logistico.fit(X, y)
+    return {'modelo_logistico': modelo_logistico}, time.perf_counter() - t0
+
+
+# --- MODELO 3: K-MEANS (Segmentación de Clientes) ---
+# Se entrena sobre una fila por cliente (clientes.py), no sobre transacciones
+def entrenar_kmeans(X, centros=None):
+    """`centros` (en unidades originales) arranca desde una segmentación anterior para conservar sus grupos."""
+    t0 = time.perf_counter()
+    scaler_kmeans = StandardScaler()
+    X_scaled = scaler_kmeans.fit_transform(X)
+    if centros is not None and len(X_scaled) >= len(centros):
+        inicio = scaler_kmeans.transform(pd.DataFrame(centros, columns=list(X.columns)))
+        kmeans = KMeans(n_clusters=len(centros), init=inicio, n_init=1, random_state=42)
+    else:
+        kmeans = KMeans(n_clusters=3, random_state=42)
+    kmeans.fit(X_scaled)
+    return {'modelo_kmeans': kmeans, 'scaler_kmeans': scaler_kmeans}, time.perf_counter() - t0
+
+
+def preparar(df, perfiles):
+    """Entradas de cada modelo: transacciones (`df`) y una fila por cliente (`perfiles`, de clientes.py)."""
+    # Convertir 'Nivel_Trafico' a números (mismo orden de clases que LabelEncoder)
+    le_trafico = LabelEncoder().fit(df['Nivel_Trafico'].astype(str).unique())
+    X_log = pd.DataFrame({
+        'Distancia_KM': df['Distancia_KM'],
+        'Trafico_Cod': puntuar.codificar_trafico(le_trafico, df['Nivel_Trafico']),
+    })
+    tareas = {
+        'Lineal': (entrenar_lineal, df[['Precio_Unitario']], df['Cantidad']),
+        'Logístico': (entrenar_logistico, X_log, df['Llega_Tarde']),
+        'K-Means': (entrenar_kmeans, perfiles[segmentacion.COLUMNAS_CLUSTER]),
+    }
+    return le_trafico, tareas
+
+
+def entrenar(df, perfiles, trabajadores=3):
+    """Entrena los tres modelos (en procesos separados si trabajadores > 1) y devuelve (pack, tiempos)."""
+    le_trafico, tareas = preparar(df, perfiles)
+    pack = {'le_trafico': le_trafico}
+    tiempos = {}
+
+    if trabajadores > 1:
+        with ProcessPoolExecutor(max_workers=min(trabajadores, len(tareas))) as pool:
+            futuros = {nombre: pool.submit(f, *args) for nombre, (f, *args) in tareas.items()}
+            resultados = {nombre: futuro.result() for nombre, futuro in futuros.items()}
+    else:
+        resultados = {nombre: f(*args) for nombre, (f, *args) in tareas.items()}
+
+    for nombre, (objetos, segundos) in resultados.items():
+        pack.update(objetos)
+        tiempos[nombre] = segundos
+    return pack, tiempos
+
+
+# --- MODO STREAMING (fuera de memoria) ---
+# Recorre el dataset por bloques y actualiza los modelos de forma incremental,
+# así la memoria depende del tamaño del bloque y no del dataset:
+#   pasada 1: ecuaciones normales de la regresión lineal, media/varianza de la
+#             distancia y niveles de tráfico presentes
+#   pasada 2: SGD con pérdida logística (retrasos); con pocas filas (FILAS_EXACTO) una época
+#             de SGD queda mal calibrada y se ajusta el LogisticRegression exacto
+#   clientes: almacén por cliente (solo filas nuevas), K-Means sobre una fila por
+#             cliente y sus etiquetas (clientes.py, segmentacion.py)
+
+class EcuacionesNormales:
+    """Acumula X'X y X'y (con el intercepto como columna de unos) para una regresión lineal por bloques."""
+
+    def __init__(self, columnas):
+        self.columnas = list(columnas)
+        self.XtX = np.zeros((len(columnas) + 1, len(columnas) + 1))
+        self.Xty = np.zeros(len(columnas) + 1)
+        self.desplazamiento = None
+
+    def actualizar(self, X, y):
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float)
+        # Se desplazan los datos por las medias del primer bloque para no perder precisión
+        if self.desplazamiento is None:
+            self.desplazamiento = (X.mean(axis=0), y.mean())
+        X = np.column_stack([np.ones(len(X)), X - self.desplazamiento[0]])
+        y = y - self.desplazamiento[1]
+        self.XtX += X.T @ X
+        self.Xty += X.T @ y
+
+    def estado(self):
+        """Estadísticos suficientes como arreglos simples (se guardan en el pack)."""
+        return {'columnas': self.columnas, 'XtX': self.XtX.copy(), 'Xty': self.Xty.copy(),
+                'desplazamiento': self.desplazamiento}
+
+    @classmethod
+    def desde_estado(cls, estado):
+        normales = cls(estado['columnas'])
+        normales.XtX = estado['XtX'].copy()
+        normales.Xty = estado['Xty'].copy()
+        normales.desplazamiento = estado['desplazamiento']
+        return normales
+
+    def modelo(self):
+        beta = np.linalg.solve(self.XtX, self.Xty)
+        modelo = LinearRegression()
+        modelo.coef_ = beta[1:]
+        modelo.intercept_ = float(self.desplazamiento[1] + beta[0] - beta[1:] @ self.desplazamiento[0])
+        modelo.n_features_in_ = len(self.columnas)
+        modelo.feature_names_in_ = np.array(self.columnas, dtype=object)
+        modelo.rank_ = len(self.columnas)
+        modelo.singular_ = np.linalg.svd(self.XtX[1:, 1:], compute_uv=False)
+        return modelo
+
+
+def _plegar_escala(sgd, media, escala):
+    """Pasa los pesos del SGD de distancia estandarizada a distancia en km."""
+    sgd.intercept_ = sgd.intercept_ - sgd.coef_[:, 0] * media / escala
+    sgd.coef_[:, 0] = sgd.coef_[:, 0] / escala
+
+
+def _desplegar_escala(sgd, media, escala):
+    """Inversa de _plegar_escala: vuelve al espacio en el que se sigue entrenando el SGD."""
+    sgd.coef_[:, 0] = sgd.coef_[:, 0] * escala
+    sgd.intercept_ = sgd.intercept_ + sgd.coef_[:, 0] * media / escala
+
+
+def _actualizar_logistico(pack, leer_bloques, columnas, tamano_chunk, epocas, media, escala):
+    """Pasada 2: el SGD logístico continúa desde su estado actual."""
+    sgd = pack['modelo_logistico']
+    for _ in range(epocas):
+        for bloque in leer_bloques(columnas, tamano_chunk):
+            X_log = pd.DataFrame({
+                'Distancia_KM': (bloque['Distancia_KM'].to_numpy() - media) / escala,
+                'Trafico_Cod': puntuar.codificar_trafico(pack['le_trafico'], bloque['Nivel_Trafico']),
+            })
+            sgd.partial_fit(X_log, bloque['Llega_Tarde'], classes=np.array([0, 1]))
+
+
+def _segmentar(pack, marca, ruta, ruta_csv, tamano_chunk, centros=None):
+    """Actualiza el almacén por cliente hasta `marca`, entrena K-Means sobre él y guarda las etiquetas."""
+    perfiles = clientes.perfiles(clientes.actualizar(ruta=ruta, ruta_csv=ruta_csv,
+                                                     tamano_chunk=tamano_chunk, marca=marca))
+    objetos, _ = entrenar_kmeans(perfiles[segmentacion.COLUMNAS_CLUSTER], centros)
+    pack.update(objetos)
+    segmentacion.agregar_al_pack(pack, perfiles, pack['modelo_kmeans'], pack['scaler_kmeans'])
+
+
+def entrenar_streaming(tamano_chunk=TAMANO_CHUNK, epocas=1, ruta=almacen.RUTA_ALMACEN, ruta_csv=almacen.RUTA_CSV):
+    """Entrena los tres modelos recorriendo el dataset por bloques. Devuelve (pack, tiempos).
+
+    El pack incluye 'estado_incremental' (marca de agua y estadísticos suficientes)
+    para que entrenar_incremental pueda continuar solo con las filas nuevas.
+    """
+    columnas = almacen.COLUMNAS_ENTRENAMIENTO + ['Fecha']
+    # Las tres pasadas leen exactamente las mismas filas aunque lleguen datos durante el entrenamiento
+    marca = almacen.marca_actual(ruta, ruta_csv)
+    leer_bloques = lambda cols, tam: almacen.leer_entre({}, marca, cols, tam)
+    tiempos = {}
+
+    # Pasada 1: estadísticos suficientes
+    t0 = time.perf_counter()
+    lineal = EcuacionesNormales(['Precio_Unitario'])
+    scaler_distancia = StandardScaler()
+    niveles = set()
+    filas = 0
+    ultima_fecha = None
+    for bloque in leer_bloques(columnas, tamano_chunk):
+        lineal.actualizar(bloque[['Precio_Unitario']], bloque['Cantidad'])
+        scaler_distancia.partial_fit(bloque[['Distancia_KM']])
+        niveles.update(bloque['Nivel_Trafico'].astype(str).unique())
+        filas += len(bloque)
+        ultima_fecha = max(filter(None, [ultima_fecha, pd.to_datetime(bloque['Fecha']).max()]))
+    if not filas:
+        raise ValueError("El dataset no tiene filas para entrenar")
+    le_trafico = LabelEncoder().fit(sorted(niveles))
+    tiempos['Pasada 1 (lineal y escalador)'] = time.perf_counter() - t0
+
+    # Pasada 2: logística por SGD, o exacta si las filas caben de sobra en memoria
+    t0 = time.perf_counter()
+    pack = {'le_trafico': le_trafico, 'modelo_lineal': lineal.modelo()}
+    if filas <= FILAS_EXACTO:
+        df = pd.concat(leer_bloques(['Distancia_KM', 'Nivel_Trafico', 'Llega_Tarde'], tamano_chunk),
+                       ignore_index=True)
+        X_log = pd.DataFrame({
+            'Distancia_KM': df['Distancia_KM'],
+            'Trafico_Cod': puntuar.codificar_trafico(le_trafico, df['Nivel_Trafico']),
+        })
+        objetos, _ = entrenar_logistico(X_log, df['Llega_Tarde'])
+        pack.update(objetos)
+        tiempos['Pasada 2 (logístico exacto)'] = time.perf_counter() - t0
+    else:
+        pack['modelo_logistico'] = SGDClassifier(loss='log_loss', random_state=42)
+        media, escala = scaler_distancia.mean_[0], scaler_distancia.scale_[0]
+        _actualizar_logistico(pack, leer_bloques, columnas, tamano_chunk, epocas, media, escala)
+        # La distancia se escaló solo para estabilizar el SGD: se deshace en los pesos para
+        # que el modelo reciba Distancia_KM en km, igual que el LogisticRegression normal
+        _plegar_escala(pack['modelo_logistico'], media, escala)
+        tiempos['Pasada 2 (logístico SGD)'] = time.perf_counter() - t0
+
+    # Clientes: almacén por cliente, K-Means sobre una fila por cliente y etiquetas
+    t0 = time.perf_counter()
+    _segmentar(pack, marca, ruta, ruta_csv, tamano_chunk)
+    tiempos['Clientes (almacén y K-Means)'] = time.perf_counter() - t0
+
+    pack['estado_incremental'] = {
+        'marca': marca,
+        'filas': filas,
+        'ultima_fecha': ultima_fecha,
+        'lineal': lineal.estado(),
+        'scaler_distancia': scaler_distancia,
+    }
+    return pack, tiempos
+
+
+def entrenar_incremental(pack, tamano_chunk=TAMANO_CHUNK, epocas=1, ruta=almacen.RUTA_ALMACEN,
+                         ruta_csv=almacen.RUTA_CSV):
+    """Actualiza un pack con solo las filas añadidas desde su marca de agua. Devuelve (pack, tiempos).
+
+    Si el pack no tiene estado incremental o el dataset fue reescrito (no solo ampliado),
+    se hace un entrenamiento streaming completo; también si el logístico es el exacto (pocas
+    filas), que no se puede continuar y cuesta poco rehacer.
+    """
+    estado = (pack or {}).get('estado_incremental')
+    actual = almacen.marca_actual(ruta, ruta_csv)
+    if estado is None or not almacen.es_continuacion(estado['marca'], actual):
+        return entrenar_streaming(tamano_chunk, epocas, ruta, ruta_csv)
+    if estado['marca'] == actual:
+        return pack, {}
+    if not isinstance(pack['modelo_logistico'], SGDClassifier):
+        return entrenar_streaming(tamano_chunk, epocas, ruta, ruta_csv)
+
+    columnas = almacen.COLUMNAS_ENTRENAMIENTO + ['Fecha']
+    leer_bloques = lambda cols, tam: almacen.leer_entre(estado['marca'], actual, cols, tam)
+    tiempos = {}
+
+    # Pasada 1 (solo filas nuevas): ecuaciones normales
+    t0 = time.perf_counter()
+    lineal = EcuacionesNormales.desde_estado(estado['lineal'])
+    filas = 0
+    ultima_fecha = estado['ultima_fecha']
+    for bloque in leer_bloques(columnas, tamano_chunk):
+        if not set(bloque['Nivel_Trafico'].astype(str).unique()) <= set(pack['le_trafico'].classes_):
+            # Un nivel de tráfico nuevo cambia la codificación: hay que re-entrenar desde cero
+            return entrenar_streaming(tamano_chunk, epocas, ruta, ruta_csv)
+        lineal.actualizar(bloque[['Precio_Unitario']], bloque['Cantidad'])
+        filas += len(bloque)
+        ultima_fecha = max(filter(None, [ultima_fecha, pd.to_datetime(bloque['Fecha']).max()]))
+    pack['modelo_lineal'] = lineal.modelo()
+    tiempos['Pasada 1 (lineal)'] = time.perf_counter() - t0
+
+    # Pasada 2: el SGD continúa desde sus pesos actuales
+    t0 = time.perf_counter()
+    scaler_distancia = estado['scaler_distancia']
+    media, escala = scaler_distancia.mean_[0], scaler_distancia.scale_[0]
+    _desplegar_escala(pack['modelo_logistico'], media, escala)
+    _actualizar_logistico(pack, leer_bloques, columnas, tamano_chunk, epocas, media, escala)
+    _plegar_escala(pack['modelo_logistico'], media, escala)
+    tiempos['Pasada 2 (logístico SGD)'] = time.perf_counter() - t0
+
+    # Clientes: el almacén solo agrega las filas nuevas; K-Means (una fila por cliente)
+    # se re-ajusta arrancando de los centroides anteriores para conservar los grupos
+    t0 = time.perf_counter()
+    centros = segmentacion.centroides(pack['modelo_kmeans'], pack['scaler_kmeans']).to_numpy()
+    _segmentar(pack, actual, ruta, ruta_csv, tamano_chunk, centros)
+    tiempos['Clientes (almacén y K-Means)'] = time.perf_counter() - t0
+
+    pack['estado_incremental'] = {
+        'marca': actual,
+        'filas': estado['filas'] + filas,
+        'ultima_fecha': ultima_fecha,
+        'lineal': lineal.estado(),
+        'scaler_distancia': scaler_distancia,
+    }
+    return pack, tiempos
+
+
+def guardar_pack(pack, ruta=RUTA_MODELOS):
+    """Escritura atómica: la app nunca carga un pickle a medio escribir.
+
+    Las asignaciones de clusters que el pack lleva en memoria se escriben después, así
+    nunca corresponden a un pack distinto del guardado.
+    """
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    fd, temporal = tempfile.mkstemp(prefix='.modelos-', suffix='.tmp', dir=directorio)
+    os.close(fd)
+    try:
+        joblib.dump({k: v for k, v in pack.items() if k != 'asignaciones_pendientes'}, temporal)
+        os.replace(temporal, ruta)
+    except BaseException:
+        os.remove(temporal)
+        raise
+    pendientes = pack.pop('asignaciones_pendientes', None)
+    if pendientes is not None:
+        segmentacion.guardar_asignaciones(*pendientes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Entrena los modelos de la app y genera modelos_finales.pkl.")
+    parser.add_argument('--salida', default=RUTA_MODELOS, help="Ruta del pack de modelos.")
+    parser.add_argument('--artefacto', default=artefacto.RUTA_ARTEFACTO, help="Directorio del artefacto NumPy.")
+    parser.add_argument('--trabajadores', type=int, default=3, help="Procesos en paralelo (1 = secuencial).")
+    parser.add_argument('--streaming', action='store_true',
+                        help="Entrena por bloques (SGD logístico, ecuaciones normales) con memoria acotada.")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Actualiza el pack existente solo con las filas nuevas (implica --streaming).")
+    parser.add_argument('--chunk', type=int, default=TAMANO_CHUNK, help="Filas por bloque en modo streaming.")
+    parser.add_argument('--epocas', type=int, default=1, help="Pasadas del SGD en modo streaming.")
+    args = parser.parse_args()
+
+    t_total = time.perf_counter()
+
+    if args.streaming or args.incremental:
+        try:
+            if args.incremental:
+                previo = joblib.load(args.salida) if os.path.exists(args.salida) else None
+                print("⏳ Entrenamiento incremental (solo filas nuevas)...")
+                pack, tiempos = entrenar_incremental(previo, args.chunk, args.epocas)
+            else:
+                print(f"⏳ Entrenando por bloques de {args.chunk:,} filas...")
+                pack, tiempos = entrenar_streaming(args.chunk, args.epocas)
+        except FileNotFoundError:
+            print(f"❌ ERROR: No se encuentra '{almacen.RUTA_ALMACEN}/' ni '{almacen.RUTA_CSV}'.")
+            raise SystemExit(1)
+        except ValueError as e:
+            print(f"❌ ERROR: {e}.")
+            raise SystemExit(1)
+        if not tiempos:
+            print("✅ No hay filas nuevas: el pack ya está al día.")
+            return
+        for nombre, segundos in tiempos.items():
+            print(f"   - {nombre}: {segundos:.2f}s")
+        estado = pack['estado_incremental']
+        hasta = f" (hasta {estado['ultima_fecha']:%Y-%m-%d})" if estado['ultima_fecha'] is not None else ""
+        print(f"✅ {estado['filas']:,} filas incorporadas{hasta}")
+    else:
+        # 1. Cargar datos (solo las columnas que usan los modelos)
+        print("⏳ Cargando base de datos...")
+        t0 = time.perf_counter()
+        try:
+            marca = almacen.marca_actual()
+            df = almacen.leer(almacen.COLUMNAS_ENTRENAMIENTO)
+        except FileNotFoundError:
+            print(f"❌ ERROR: No se encuentra '{almacen.RUTA_ALMACEN}/' ni '{almacen.RUTA_CSV}'.")
+            raise SystemExit(1)
+        print(f"✅ {len(df):,} filas cargadas en {time.perf_counter() - t0:.2f}s")
+
+        # 1b. Almacén por cliente (solo agrega las transacciones nuevas): K-Means usa una fila por cliente
+        t0 = time.perf_counter()
+        perfiles = clientes.perfiles(clientes.actualizar())
+        print(f"✅ {len(perfiles):,} clientes en '{clientes.RUTA_CLIENTES}' ({time.perf_counter() - t0:.2f}s)")
+
+        # 2. Entrenar los tres modelos
+        print(f"⚙️ Entrenando Lineal, Logístico y K-Means ({args.trabajadores} procesos)...")
+        t0 = time.perf_counter()
+        pack, tiempos = entrenar(df, perfiles, args.trabajadores)
+        for nombre, segundos in tiempos.items():
+            print(f"   - {nombre}: {segundos:.2f}s")
+        print(f"✅ Modelos entrenados en {time.perf_counter() - t0:.2f}s")
+
+        # 3. Etiquetas, centroides y resumen de clusters (la app los lee, no re-entrena K-Means)
+        t0 = time.perf_counter()
+        segmentacion.agregar_al_pack(pack, perfiles, pack['modelo_kmeans'], pack['scaler_kmeans'])
+        print(f"✅ Asignaciones de clusters preparadas en {time.perf_counter() - t0:.2f}s")
+
+    # 4. Guardar
+    print(f"💾 Guardando '{args.salida}'...")
+    t0 = time.perf_counter()
+    guardar_pack(pack, args.salida)
+    print(f"✅ Guardado en {time.perf_counter() - t0:.2f}s")
+
+    # 5. Artefacto NumPy para la app y el servidor (cargan sin sklearn)
+    manifiesto = artefacto.exportar(pack, args.artefacto)
+    print(f"📦 Artefacto '{args.artefacto}/' exportado (checksum {manifiesto['checksum'][:12]})")
+
+    # 6. Referencia del monitor de deriva: histogramas de entradas y salidas con este modelo
+    t0 = time.perf_counter()
+    streaming = args.streaming or args.incremental
+    referencia = deriva.referencia_entrenamiento(
+        pack, pack['estado_incremental']['marca'] if streaming else marca, None if streaming else df,
+        incremental=args.incremental, tamano_bloque=args.chunk)
+    deriva.guardar_referencia(referencia)
+    print(f"🧭 Referencia de deriva '{deriva.RUTA_REFERENCIA}' ({referencia['filas']:,} filas, "
+          f"{time.perf_counter() - t0:.2f}s)")
+
+    print(f"🎉 ¡LISTO! Ya tienes el cerebro de tu IA actualizado ({time.perf_counter() - t_total:.2f}s en total).")
+
+
+if __name__ == '__main__':
+    main()
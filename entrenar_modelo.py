@@ -1,124 +1,187 @@
+import argparse
 import os
-import pandas as pd
-# ...el resto de tus imports...
+import time
+import warnings
+
+import joblib
 import pandas as pd
 from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestRegressor
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
 from sklearn.metrics import mean_absolute_error, r2_score
-import joblib
-import warnings
+
+import arboles
+import caracteristicas
 
 # Ignorar advertencias futuras para mantener la salida limpia
 warnings.filterwarnings('ignore', category=FutureWarning)
 
-print("--- Iniciando el Proceso de Entrenamiento ---")
-
-# --- Paso 2.1: Cargar y Preparar los Datos ---
-print("\n[Paso 2.1] Cargando y preparando datos...")
-
-# Obtener la ruta absoluta de la carpeta donde está este script
-script_dir = os.path.dirname(os.path.abspath(__file__))
-# Unir esa ruta con el nombre del archivo CSV
-csv_path = os.path.join(script_dir, 'ventas_market_delivery.csv')
-
-print(f"Buscando el archivo en: {csv_path}") # Línea de depuración
-
-try:
-    # Leemos el archivo CSV usando la ruta absoluta
-    df = pd.read_csv(csv_path)
-    print("Datos cargados exitosamente.")
-except FileNotFoundError:
-    print(f"Error: No se encontró el archivo en la ruta: {csv_path}")
-    print("Asegúrate de que 'ventas_market_delivery.csv' esté en la misma carpeta que 'entrenar_modelo.py'.")
-    exit()
-
-# --- Paso 2.2: Ingeniería de Características (Feature Engineering) ---
-print("[Paso 2.2] Realizando Ingeniería de Características...")
-
-# Convertir la columna 'Fecha' a un objeto datetime real
-df['Fecha'] = pd.to_datetime(df['Fecha'])
-
-# 1. Extraer características de la fecha
-# El día de la semana (Lunes=0, Domingo=6)
-df['dia_semana'] = df['Fecha'].dt.weekday 
-# El mes
-df['mes'] = df['Fecha'].dt.month
-# El día del mes
-df['dia_mes'] = df['Fecha'].dt.day
-# Característica binaria: ¿Es fin de semana? (1 si es Sábado/Domingo, 0 si no)
-df['es_fin_de_semana'] = (df['Fecha'].dt.weekday >= 5).astype(int)
-
-# 2. Convertir 'Promocion' a números (Binario: 1 = Si, 0 = No)
-df['Promocion'] = df['Promocion'].apply(lambda x: 1 if x == 'Si' else 0)
-
-# 3. Convertir variables categóricas (Producto y Categoría)
-# Usamos 'get_dummies' (One-Hot Encoding). Esto crea nuevas columnas
-# para cada producto/categoría, p.ej., 'Nombre_Producto_Manzana Fuji'
-# con un 1 o 0. Es crucial para el modelo.
-df_procesado = pd.get_dummies(df, columns=['Nombre_Producto', 'Categoria'], drop_first=False)
-
-# 4. Limpiar columnas que ya no necesitamos para el modelo
-# 'Fecha' original, 'ID_Producto' y 'Precio_Unitario' no se usarán como características
-df_procesado = df_procesado.drop(['Fecha', 'ID_Producto', 'Precio_Unitario'], axis=1)
-
-print("Datos procesados y listos para el modelo.")
-
-# --- Paso 2.3: Definir 'X' (Características) y 'y' (Objetivo) ---
-print("[Paso 2.3] Definiendo Características (X) y Objetivo (y)...")
-
-# 'y' es lo que queremos predecir: la Cantidad Vendida
-y = df_procesado['Cantidad_Vendida']
-
-# 'X' es todo lo demás que usaremos para predecir
-X = df_procesado.drop('Cantidad_Vendida', axis=1)
-
-# --- Paso 2.4: Dividir los Datos (Entrenamiento y Prueba) ---
-print("[Paso 2.4] Dividiendo datos en Entrenamiento y Prueba (80/20)...")
-# Separamos el 20% de los datos para evaluar el modelo.
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-# --- Paso 2.5: Entrenar el Modelo (Random Forest) ---
-print("[Paso 2.5] Entrenando el modelo (RandomForestRegressor)...")
-
-# Usamos un "Random Forest" (Bosque Aleatorio)
-modelo = RandomForestRegressor(n_estimators=100, random_state=42, max_depth=10)
-
-# Aquí el modelo aprende de los datos de entrenamiento
-modelo.fit(X_train, y_train)
-print("¡Modelo entrenado exitosamente!")
-
-# --- Paso 2.6: Evaluar el Modelo ---
-print("\n[Paso 2.6] Evaluando el rendimiento del modelo...")
-# Usamos el modelo para predecir sobre los datos de prueba
-predicciones = modelo.predict(X_test)
-
-# Calculamos métricas clave
-mae = mean_absolute_error(y_test, predicciones)
-r2 = r2_score(y_test, predicciones)
-
-print("--- Resultados de la Evaluación ---")
-print(f"Error Absoluto Medio (MAE): {mae:.2f} unidades")
-print(f"-> (En promedio, el pronóstico se desvía en {mae:.2f} unidades)")
-print(f"Coeficiente de Determinación (R²): {r2:.2%}")
-print("-----------------------------------")
-print("(Nota: Con los datos de muestra, la evaluación puede ser limitada,")
-print(" con más datos reales, estas métricas mejorarán)")
-
-
-# --- Paso 2.7: Guardar el Modelo y las Columnas ---
-print("\n[Paso 2.7] Guardando el modelo entrenado y las columnas...")
-
-# 1. Guardar el modelo entrenado
-joblib.dump(modelo, 'modelo_pronostico.pkl')
-
-# 2. Guardar la lista de columnas (MUY IMPORTANTE)
-# La aplicación web necesita saber exactamente qué columnas
-# y en qué orden las espera el modelo.
-columnas_del_modelo = X.columns.tolist()
-joblib.dump(columnas_del_modelo, 'columnas_modelo.pkl')
-
-print("\n--- ¡Proceso Completado! ---")
-print("Se han generado dos archivos:")
-print("1. modelo_pronostico.pkl (Tu modelo de IA listo para usarse)")
-print("2. columnas_modelo.pkl (La estructura de datos que espera el modelo)")
-print("\nAhora puedes crear el archivo 'app.py' (Punto 3).")
\ No newline at end of file
+# --- MODELO DE PRONÓSTICO DE VENTAS POR PRODUCTO ---
+# Las características salen de caracteristicas.py, el mismo pipeline que usa
+# pronosticar() al predecir: ya no hace falta alinear a mano una lista de columnas.
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+RUTA_DATOS = os.path.join(DIRECTORIO, 'ventas_market_delivery.csv')
+RUTA_MODELO = 'modelo_pronostico.pkl'
+DIAS_REJILLA = 365  # horizonte de la rejilla catálogo x fecha del reporte de rendimiento
+
+
+def cargar_datos(ruta=RUTA_DATOS):
+    """CSV de ventas, o el directorio (o archivo) Parquet de generar_datos.py --formato parquet."""
+    if os.path.isdir(ruta) or ruta.endswith('.parquet'):
+        return pd.read_parquet(ruta)
+    return pd.read_csv(ruta)
+
+
+def preparar(df, codificadores=None):
+    """Devuelve (X, y, codificadores); si no se pasan codificadores se ajustan con `df`."""
+    if codificadores is None:
+        codificadores = caracteristicas.ajustar(df)
+    return caracteristicas.transformar(df, codificadores), df[caracteristicas.OBJETIVO], codificadores
+
+
+def crear_modelo(motor='bosque', trabajadores=-1):
+    if motor == 'bosque':
+        # Un "Random Forest" (Bosque Aleatorio); la profundidad acota el tamaño de cada árbol
+        return RandomForestRegressor(n_estimators=100, random_state=42, max_depth=10, n_jobs=trabajadores)
+    if motor == 'boosting':
+        # Boosting sobre histogramas: usa todos los núcleos (OpenMP) y árboles de 31 hojas
+        return HistGradientBoostingRegressor(max_iter=200, learning_rate=0.1, random_state=42)
+    raise ValueError(f"Motor desconocido: {motor!r} (usa 'bosque' o 'boosting').")
+
+
+def entrenar(X_train, y_train, motor='bosque', trabajadores=-1):
+    modelo = crear_modelo(motor, trabajadores)
+    # Aquí el modelo aprende de los datos de entrenamiento
+    modelo.fit(X_train, y_train)
+    return modelo
+
+
+def evaluar(modelo, X_test, y_test):
+    predicciones = modelo.predict(X_test)
+    return {'mae': mean_absolute_error(y_test, predicciones), 'r2': r2_score(y_test, predicciones)}
+
+
+def pronosticar(df, modelo=None, codificadores=None):
+    """Cantidad pronosticada para cada fila de `df` (Fecha, Nombre_Producto, Categoria, Promocion).
+
+    Sin `modelo`, usa el modelo compacto de arboles.py si existe y si no el .pkl de sklearn; con
+    lotes de arboles.FILAS_SKLEARN filas o más, el .pkl del mismo entrenamiento (más rápido ahí).
+    """
+    if modelo is None and os.path.exists(arboles.RUTA_COMPACTO):
+        modelo, guardados = arboles.cargar()
+        codificadores = codificadores if codificadores is not None else guardados
+        if len(df) >= arboles.FILAS_SKLEARN[modelo.combinar] and arboles.mismo_origen(modelo, RUTA_MODELO):
+            modelo = joblib.load(RUTA_MODELO)
+    modelo = modelo if modelo is not None else joblib.load(RUTA_MODELO)
+    codificadores = codificadores if codificadores is not None else caracteristicas.cargar()
+    return modelo.predict(caracteristicas.transformar(df, codificadores))
+
+
+def _mb(ruta):
+    return os.path.getsize(ruta) / 1e6
+
+
+def _segundos_prediccion(modelo, X, repeticiones=5):
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        modelo.predict(X)
+        tiempos.append(time.perf_counter() - t0)
+    return max(min(tiempos), 1e-9)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Entrena el modelo de pronóstico de ventas por producto.")
+    parser.add_argument('--datos', default=RUTA_DATOS, help="CSV o Parquet de ventas (generar_datos.py).")
+    parser.add_argument('--modelo', default=RUTA_MODELO, help="Ruta del modelo entrenado.")
+    parser.add_argument('--codificadores', default=caracteristicas.RUTA_CODIFICADORES,
+                        help="Ruta de los codificadores de características.")
+    parser.add_argument('--compacto', default=arboles.RUTA_COMPACTO,
+                        help="Ruta del modelo compacto (árboles planos) para servir.")
+    parser.add_argument('--motor', choices=['bosque', 'boosting'], default='bosque',
+                        help="RandomForest (por defecto) o HistGradientBoosting.")
+    parser.add_argument('--trabajadores', type=int, default=-1,
+                        help="Núcleos para el bosque (-1 = todos).")
+    args = parser.parse_args()
+
+    print("--- Iniciando el Proceso de Entrenamiento ---")
+
+    # --- Paso 2.1: Cargar los Datos ---
+    print("\n[Paso 2.1] Cargando datos...")
+    print(f"Buscando el archivo en: {args.datos}")
+    try:
+        df = cargar_datos(args.datos)
+        print(f"Datos cargados exitosamente ({len(df):,} filas).")
+    except FileNotFoundError:
+        print(f"Error: No se encontró el archivo en la ruta: {args.datos}")
+        print("Genera los datos con 'generar_datos.py' o indica la ruta con --datos.")
+        raise SystemExit(1)
+
+    # --- Paso 2.2 y 2.3: Características (X) y Objetivo (y) ---
+    print("[Paso 2.2] Calculando características (fecha, promoción y códigos de producto/categoría)...")
+    t0 = time.perf_counter()
+    X, y, codificadores = preparar(df)
+    print(f"{X.shape[1]} características en {time.perf_counter() - t0:.2f}s "
+          f"({len(codificadores['categorias']['Nombre_Producto'])} productos, "
+          f"{len(codificadores['categorias']['Categoria'])} categorías).")
+
+    # --- Paso 2.4: Dividir los Datos (Entrenamiento y Prueba) ---
+    print("[Paso 2.4] Dividiendo datos en Entrenamiento y Prueba (80/20)...")
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    # --- Paso 2.5: Entrenar el Modelo ---
+    print(f"[Paso 2.5] Entrenando el modelo ({type(crear_modelo(args.motor)).__name__})...")
+    t0 = time.perf_counter()
+    modelo = entrenar(X_train, y_train, args.motor, args.trabajadores)
+    tiempo_ajuste = time.perf_counter() - t0
+    print(f"¡Modelo entrenado exitosamente en {tiempo_ajuste:.2f}s!")
+
+    # --- Paso 2.6: Evaluar el Modelo ---
+    print("\n[Paso 2.6] Evaluando el rendimiento del modelo...")
+    metricas = evaluar(modelo, X_test, y_test)
+    print("--- Resultados de la Evaluación ---")
+    print(f"Error Absoluto Medio (MAE): {metricas['mae']:.2f} unidades")
+    print(f"-> (En promedio, el pronóstico se desvía en {metricas['mae']:.2f} unidades)")
+    print(f"Coeficiente de Determinación (R²): {metricas['r2']:.2%}")
+    print("-----------------------------------")
+
+    # --- Paso 2.7: Guardar el Modelo, los Codificadores y el Modelo Compacto ---
+    print("\n[Paso 2.7] Guardando el modelo entrenado y los codificadores...")
+    joblib.dump(modelo, args.modelo)
+    caracteristicas.guardar(codificadores, args.codificadores)
+    compacto = arboles.exportar(modelo, codificadores, args.compacto, origen=args.modelo)
+
+    # --- Paso 2.8: Rendimiento (tamaño, ajuste y velocidad de predicción) ---
+    print("\n[Paso 2.8] Midiendo el rendimiento...")
+    fechas = pd.date_range(pd.to_datetime(df['Fecha']).max() + pd.Timedelta(days=1), periods=DIAS_REJILLA)
+    X_rejilla = caracteristicas.transformar(caracteristicas.rejilla(codificadores, fechas), codificadores)
+    t0 = time.perf_counter()
+    cargado, _ = arboles.cargar(args.compacto)
+    tiempo_carga_compacto = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    joblib.load(args.modelo)
+    tiempo_carga_pkl = time.perf_counter() - t0
+    diferencia = abs(cargado.predict(X_rejilla) - modelo.predict(X_rejilla)).max()
+    print(f"--- Rendimiento ({compacto.n_arboles} árboles, profundidad {compacto.profundidad}) ---")
+    print(f"Ajuste: {tiempo_ajuste:.2f}s ({len(X_train) / max(tiempo_ajuste, 1e-9):,.0f} filas/s)")
+    print(f"Tamaño: {_mb(args.modelo):.2f} MB el .pkl, {_mb(args.compacto):.2f} MB el compacto")
+    print(f"Carga: {tiempo_carga_pkl * 1000:.1f} ms el .pkl, {tiempo_carga_compacto * 1000:.1f} ms el compacto")
+    print(f"Rejilla catálogo x fecha: {len(X_rejilla):,} filas "
+          f"({len(codificadores['catalogo'])} productos x {DIAS_REJILLA} días)")
+    print(f"Predicción: {len(X_rejilla) / _segundos_prediccion(modelo, X_rejilla):,.0f} filas/s sklearn, "
+          f"{len(X_rejilla) / _segundos_prediccion(cargado, X_rejilla):,.0f} filas/s compacto "
+          f"(diferencia máxima {diferencia:.2g})")
+    X_dia = X_rejilla.iloc[::DIAS_REJILLA]  # el catálogo completo para un solo día
+    print(f"Un día del catálogo ({len(X_dia)} filas): {_segundos_prediccion(modelo, X_dia) * 1000:.1f} ms sklearn, "
+          f"{_segundos_prediccion(cargado, X_dia) * 1000:.1f} ms compacto")
+    print("-----------------------------------")
+
+    print("\n--- ¡Proceso Completado! ---")
+    print("Se han generado tres archivos:")
+    print(f"1. {args.modelo} (Tu modelo de IA listo para usarse)")
+    print(f"2. {args.codificadores} (Categorías y orden de columnas; úsalos con pronosticar())")
+    print(f"3. {args.compacto} (Árboles planos + codificadores para servir sin sklearn)")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,21 @@
-import pandas as pd
+import argparse
+import math
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
-import random
-from datetime import datetime, timedelta
+import pandas as pd
 
-print("Iniciando la generación de datos... esto puede tardar un momento.")
+# --- SIMULADOR DE VENTAS DIARIAS POR PRODUCTO (entrenar_modelo.py) ---
+# Una fila por SKU del catálogo y por día (la rejilla completa producto x fecha), con los
+# efectos de siempre calculados sobre arreglos enteros en lugar de fila por fila:
+#   fin de semana (+20-80%), promoción (20% de los días, +50-120%) y ruido normal (15%).
+# El catálogo se reparte en fragmentos de productos que se generan en paralelo (un proceso
+# por fragmento) y cada uno se escribe a disco en cuanto termina: la memoria depende del
+# tamaño del fragmento, no del total. Cada fragmento tiene su propia semilla derivada de
+# --semilla, así el resultado no depende del número de procesos.
 
 # --- Configuración de Productos (¡Catálogo Extendido!) ---
 products_list = [
@@ -47,68 +59,141 @@ products_list = [
 ]
 
 # --- Configuración de Fechas ---
-start_date = datetime(2024, 1, 1)
-end_date = datetime(2025, 11, 12) # Hasta la fecha actual
-n_rows = 500 # Mantenemos 500 filas, pero con más variedad
-date_range_days = (end_date - start_date).days
-
-# --- Generación de Datos ---
-data = []
-for i in range(n_rows):
-    
-    # 1. Seleccionar Producto al azar
-    prod_name, prod_cat, prod_price, base_qty = random.choice(products_list)
-    
-    # 2. Generar Fecha al azar
-    random_days = random.randint(0, date_range_days)
-    fecha = start_date + timedelta(days=random_days)
-    weekday = fecha.weekday() # Lunes=0, Domingo=6
-    
+FECHA_INICIO = '2024-01-01'
+FECHA_FIN = '2025-11-12'
+
+SEMILLA = 42
+FILAS_POR_FRAGMENTO = 1_000_000  # filas que genera y escribe cada proceso de una vez
+ARCHIVO_SALIDA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ventas_market_delivery.csv')
+
+COLUMNAS = ['Fecha', 'ID_Producto', 'Nombre_Producto', 'Categoria',
+            'Cantidad_Vendida', 'Precio_Unitario', 'Promocion']
+
+
+def catalogo(n_skus=len(products_list), semilla=SEMILLA):
+    """SKUs a simular: los productos base y, si se piden más, variantes con su propio precio y demanda."""
+    base = pd.DataFrame(products_list, columns=['Nombre_Producto', 'Categoria', 'Precio_Unitario', 'Cantidad_Base'])
+    rng = np.random.default_rng([semilla, n_skus])
+    i = np.arange(n_skus)
+    origen, variante = i % len(base), i // len(base)
+    skus = base.iloc[origen].reset_index(drop=True)
+    es_variante = variante > 0
+    skus['Precio_Unitario'] = np.where(es_variante, np.round(skus['Precio_Unitario'] * rng.uniform(0.8, 1.2, n_skus), 2),
+                                       skus['Precio_Unitario'])
+    skus['Cantidad_Base'] = np.where(es_variante, skus['Cantidad_Base'] * rng.uniform(0.7, 1.3, n_skus),
+                                     skus['Cantidad_Base'])
+    skus['Nombre_Producto'] = [f"{n} V{v + 1}" if v else n for n, v in zip(skus['Nombre_Producto'], variante)]
+    # ID estable por SKU (ej. F-001)
+    skus.insert(0, 'ID_Producto', [f"{c[0]}-{k:03d}" for c, k in zip(skus['Categoria'], i)])
+    return skus
+
+
+def generar_fragmento(skus, fechas, semilla):
+    """Ventas diarias de los SKUs dados en todas las fechas, ordenadas por fecha."""
+    rng = np.random.default_rng(semilla)
+    n = len(fechas) * len(skus)
+    dia = np.repeat(np.arange(len(fechas)), len(skus))
+    sku = np.tile(np.arange(len(skus)), len(fechas))
+
     # 3. Calcular Cantidad (con lógica profesional)
-    cantidad = base_qty
-    
+    cantidad = skus['Cantidad_Base'].to_numpy(dtype=float)[sku]
+
     # Efecto Fin de Semana (Ventas suben 20-80%)
-    if weekday >= 5: # Sábado o Domingo
-        cantidad *= np.random.uniform(1.2, 1.8)
-    
+    fin_de_semana = (fechas.weekday >= 5)[dia]
+    cantidad *= np.where(fin_de_semana, rng.uniform(1.2, 1.8, n), 1.0)
+
     # Efecto Promoción (20% de prob, ventas suben 50-120%)
-    if random.random() < 0.2: 
-        promocion = "Si"
-        cantidad *= np.random.uniform(1.5, 2.2)
-    else:
-        promocion = "No"
-        
+    promocion = rng.random(n) < 0.2
+    cantidad *= np.where(promocion, rng.uniform(1.5, 2.2, n), 1.0)
+
     # Ruido aleatorio (variación diaria natural)
-    cantidad *= np.random.normal(1.0, 0.15)
-    
-    # Asegurar que la cantidad sea un entero positivo
-    cantidad_vendida = max(5, int(cantidad))
-    
-    # 4. Generar ID de producto (ej. F-001)
-    id_prod = f"{prod_cat[0]}-{i:03d}"
-    
-    # 5. Guardar fila
-    data.append([
-        fecha, id_prod, prod_name, prod_cat, 
-        cantidad_vendida, prod_price, promocion
-    ])
-
-# --- Creación del DataFrame ---
-df = pd.DataFrame(data, columns=[
-    'Fecha', 'ID_Producto', 'Nombre_Producto', 'Categoria', 
-    'Cantidad_Vendida', 'Precio_Unitario', 'Promocion'
-])
-
-# Ordenar por fecha (importante para series temporales)
-df = df.sort_values(by='Fecha')
-# Formatear la fecha como texto (mejor para CSV)
-df['Fecha'] = df['Fecha'].dt.strftime('%Y-%m-%d')
-
-# --- Guardar Archivo ---
-# Usaremos el mismo nombre de archivo para sobreescribir
-nuevo_nombre_archivo = 'Ventas_market_delivery.csv'
-df.to_csv(nuevo_nombre_archivo, index=False)
-
-print("¡Éxito!")
-print(f"Se ha sobreescrito el archivo '{nuevo_nombre_archivo}' con {len(df)} filas y un catálogo de productos extendido.")
-print("¡El siguiente paso es RE-ENTRENAR EL MODELO!")
\ No newline at end of file
+    cantidad *= rng.normal(1.0, 0.15, n)
+
+    return pd.DataFrame({
+        'Fecha': fechas.to_numpy()[dia],
+        'ID_Producto': pd.Categorical.from_codes(sku, skus['ID_Producto']),
+        'Nombre_Producto': pd.Categorical.from_codes(sku, skus['Nombre_Producto']),
+        'Categoria': skus['Categoria'].to_numpy()[sku],
+        # Asegurar que la cantidad sea un entero positivo
+        'Cantidad_Vendida': np.maximum(5, cantidad.astype(np.int64)),
+        'Precio_Unitario': skus['Precio_Unitario'].to_numpy()[sku],
+        'Promocion': pd.Categorical.from_codes(promocion.astype(np.int8), ['No', 'Si']),
+    }, columns=COLUMNAS)
+
+
+def _escribir_fragmento(skus, fechas, semilla, ruta):
+    bloque = generar_fragmento(skus, fechas, semilla)
+    if ruta.endswith('.parquet'):
+        bloque.to_parquet(ruta, index=False)
+    else:
+        bloque.to_csv(ruta, index=False, header=False, date_format='%Y-%m-%d')
+    return len(bloque)
+
+
+def generar(salida=ARCHIVO_SALIDA, n_skus=len(products_list), desde=FECHA_INICIO, hasta=FECHA_FIN,
+            semilla=SEMILLA, filas_por_fragmento=FILAS_POR_FRAGMENTO, trabajadores=None, formato='csv'):
+    """Escribe la rejilla SKU x día en `salida` (un CSV, o un directorio de partes Parquet). Devuelve las filas."""
+    fechas = pd.date_range(desde, hasta, freq='D')
+    skus = catalogo(n_skus, semilla)
+    por_fragmento = max(1, filas_por_fragmento // max(1, len(fechas)))
+    cortes = range(0, n_skus, por_fragmento)
+    semillas = np.random.SeedSequence(semilla).spawn(len(cortes))
+
+    # Se escribe en un directorio temporal y se publica al final (nunca queda una salida a medias)
+    partes = salida + '.tmp'
+    shutil.rmtree(partes, ignore_errors=True)
+    os.makedirs(partes)
+    extension = '.parquet' if formato == 'parquet' else '.csv'
+    rutas = [os.path.join(partes, f'parte-{i:05d}{extension}') for i in range(len(cortes))]
+    fragmentos = [skus.iloc[c:c + por_fragmento] for c in cortes]
+    with ProcessPoolExecutor(max_workers=trabajadores) as pool:
+        filas = sum(pool.map(_escribir_fragmento, fragmentos, [fechas] * len(rutas), semillas, rutas))
+
+    if formato == 'parquet':
+        shutil.rmtree(salida, ignore_errors=True)
+        os.replace(partes, salida)
+        return filas
+    # CSV único: cabecera y partes concatenadas byte a byte, sin volver a leerlas con pandas
+    temporal = os.path.join(partes, 'completo.csv')
+    with open(temporal, 'wb') as destino:
+        destino.write((','.join(COLUMNAS) + '\n').encode('utf-8'))
+        for ruta in rutas:
+            with open(ruta, 'rb') as origen:
+                shutil.copyfileobj(origen, destino, 1 << 20)
+    os.replace(temporal, salida)
+    shutil.rmtree(partes)
+    return filas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simula ventas diarias de cada SKU del catálogo (rejilla SKU x día).")
+    parser.add_argument('--salida', default=None,
+                        help=f"CSV de salida o directorio Parquet (por defecto '{ARCHIVO_SALIDA}').")
+    parser.add_argument('--desde', default=FECHA_INICIO, help="Primer día (AAAA-MM-DD).")
+    parser.add_argument('--hasta', default=FECHA_FIN, help="Último día (AAAA-MM-DD).")
+    parser.add_argument('--skus', type=int, default=len(products_list),
+                        help="SKUs del catálogo; los que pasan del catálogo base son variantes.")
+    parser.add_argument('--filas', type=int, default=None,
+                        help="Filas aproximadas: calcula --skus a partir del rango de fechas.")
+    parser.add_argument('--semilla', type=int, default=SEMILLA, help="Semilla para resultados reproducibles.")
+    parser.add_argument('--fragmento', type=int, default=FILAS_POR_FRAGMENTO, help="Filas por fragmento de productos.")
+    parser.add_argument('--trabajadores', type=int, default=None, help="Procesos (por defecto, todos los núcleos).")
+    parser.add_argument('--formato', choices=['csv', 'parquet'], default='csv')
+    args = parser.parse_args()
+
+    dias = len(pd.date_range(args.desde, args.hasta, freq='D'))
+    n_skus = max(1, math.ceil(args.filas / dias)) if args.filas else args.skus
+    salida = args.salida or (ARCHIVO_SALIDA if args.formato == 'csv' else os.path.splitext(ARCHIVO_SALIDA)[0])
+
+    print(f"Iniciando la generación de datos: {n_skus:,} SKUs x {dias:,} días = {n_skus * dias:,} filas...")
+    t0 = time.perf_counter()
+    filas = generar(salida, n_skus, args.desde, args.hasta, args.semilla, args.fragmento,
+                    args.trabajadores, args.formato)
+    segundos = time.perf_counter() - t0
+    print("¡Éxito!")
+    print(f"Se ha escrito '{salida}' con {filas:,} filas en {segundos:.1f}s ({filas / max(segundos, 1e-9):,.0f} filas/s).")
+    print("¡El siguiente paso es RE-ENTRENAR EL MODELO! (python entrenar_modelo.py)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+# --- AGREGACIÓN DE GRÁFICOS EN EL SERVIDOR ---
+# Los gráficos de dispersión e histogramas no envían filas al navegador: se agrupan
+# aquí en celdas (conteo por celda) recorriendo el dataset por bloques. El tamaño del
+# gráfico depende del número de celdas, no del número de filas.
+# `leer(columnas)` es cualquier función que devuelva bloques (p.ej. almacen.leer_bloques).
+
+CELDAS = 60
+CELDAS_1D = 40
+
+
+def _rangos(leer, columnas):
+    """Mínimo, máximo y si es entera cada columna (primera pasada sobre los bloques)."""
+    rangos = {}
+    for bloque in leer(columnas):
+        if not len(bloque):
+            continue
+        for c in columnas:
+            minimo, maximo, _ = rangos.get(c, (np.inf, -np.inf, None))
+            rangos[c] = (min(minimo, bloque[c].min()), max(maximo, bloque[c].max()),
+                         pd.api.types.is_integer_dtype(bloque[c]))
+    return rangos
+
+
+def bordes(minimo, maximo, celdas, entero=False):
+    """Bordes de las celdas; para enteros con pocos valores, una celda por valor (sin huecos)."""
+    if entero and maximo - minimo + 1 <= 2 * celdas:
+        return np.arange(minimo - 0.5, maximo + 1.5)
+    if maximo == minimo:
+        return np.array([minimo - 0.5, maximo + 0.5])
+    return np.linspace(minimo, maximo, celdas + 1)
+
+
+def _bordes_de(leer, columnas, celdas):
+    rangos = _rangos(leer, columnas)
+    if len(rangos) < len(columnas):
+        return None
+    # Los enteros (edad, cantidad) van en celdas unitarias si tienen pocos valores distintos
+    return [bordes(float(rangos[c][0]), float(rangos[c][1]), celdas, entero=rangos[c][2]) for c in columnas]
+
+
+def _centros(b):
+    return (b[:-1] + b[1:]) / 2
+
+
+def histograma(leer, x, por=None, celdas=CELDAS_1D):
+    """Conteos de `x` por celda (y por cada valor de `por`): columnas x, [por], Conteo."""
+    columnas = [x] + ([por] if por else [])
+    b = _bordes_de(leer, [x], celdas)
+    if b is None:
+        return pd.DataFrame(columns=columnas + ['Conteo'])
+    conteos = {}
+    for bloque in leer(columnas):
+        grupos = bloque.groupby(por, observed=True) if por else [(None, bloque)]
+        for clave, g in grupos:
+            h, _ = np.histogram(g[x].to_numpy(dtype=float), bins=b[0])
+            conteos[clave] = conteos.get(clave, 0) + h
+    partes = []
+    for clave, h in sorted(conteos.items(), key=lambda kv: str(kv[0])):
+        parte = pd.DataFrame({x: _centros(b[0]), 'Conteo': h})
+        if por:
+            parte.insert(1, por, clave)
+        partes.append(parte[parte['Conteo'] > 0])
+    return pd.concat(partes, ignore_index=True)
+
+
+def histograma_2d(leer, x, y, por=None, celdas=CELDAS):
+    """Conteos en una rejilla x-y (y por cada valor de `por`), solo celdas no vacías: x, y, [por], Conteo."""
+    columnas = [x, y] + ([por] if por else [])
+    b = _bordes_de(leer, [x, y], celdas)
+    if b is None:
+        return pd.DataFrame(columns=columnas + ['Conteo'])
+    conteos = {}
+    for bloque in leer(columnas):
+        grupos = bloque.groupby(por, observed=True) if por else [(None, bloque)]
+        for clave, g in grupos:
+            h, _, _ = np.histogram2d(g[x].to_numpy(dtype=float), g[y].to_numpy(dtype=float), bins=b)
+            conteos[clave] = conteos.get(clave, 0) + h
+    cx, cy = np.meshgrid(_centros(b[0]), _centros(b[1]), indexing='ij')
+    partes = []
+    for clave, h in sorted(conteos.items(), key=lambda kv: str(kv[0])):
+        llenas = h > 0
+        parte = pd.DataFrame({x: cx[llenas], y: cy[llenas], 'Conteo': h[llenas].astype(np.int64)})
+        if por:
+            parte.insert(2, por, clave)
+        partes.append(parte)
+    return pd.concat(partes, ignore_index=True)
@@ -0,0 +1,158 @@
+import argparse
+import importlib.util
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+import almacen
+import artefacto
+import cache_compartido
+import clientes
+import deriva
+import kpis
+import puntuar
+
+# --- INGESTA CONTINUA DE PEDIDOS ---
+# Los pedidos nuevos llegan en micro-lotes y se añaden al almacén sin reescribir nada:
+#   1. el lote se escribe como partes nuevas del almacén particionado por mes (Fecha)
+#   2. el cubo de KPIs y el almacén por cliente se ponen al día con su marca de agua:
+#      leen solo las partes nuevas, no el historial
+#   3. el monitor de deriva (deriva.py) suma el lote a sus histogramas en vivo
+#   4. una señal (cache_compartido.senalar) hace que la app descarte solo las entradas de
+#      caché que dependen de las transacciones; el dashboard en vivo las rehace en su
+#      siguiente refresco leyendo el cubo ya actualizado
+# Pensado para un solo proceso de ingesta a la vez.
+
+COLUMNAS = ['Fecha', 'Categoria', 'Producto', 'Cantidad', 'Precio_Unitario', 'Total_Venta',
+            'Distancia_KM', 'Nivel_Trafico', 'Llega_Tarde',
+            'ID_Cliente', 'Edad_Cliente', 'Gasto_Hist_Cliente']  # las del generador Data/data.py
+NUMERICAS = ['Cantidad', 'Precio_Unitario', 'Total_Venta', 'Distancia_KM', 'Llega_Tarde',
+             'ID_Cliente', 'Edad_Cliente', 'Gasto_Hist_Cliente']
+TAMANO_LOTE = 5_000
+CADA_SEGUNDOS = 60
+
+
+def validar(lote, pack=None):
+    """Lote con las columnas del dataset en su orden; uno inválido se rechaza antes de escribir nada.
+
+    Un nivel de tráfico que el modelo no conoce o un número ausente quedarían para siempre en el
+    almacén y romperían cada actualización posterior del cubo.
+    """
+    faltan = [c for c in COLUMNAS if c not in lote.columns]
+    if faltan:
+        raise ValueError(f"Faltan columnas en el lote: {faltan}")
+    fechas = pd.to_datetime(lote['Fecha'], errors='coerce')
+    if fechas.isna().any():
+        raise ValueError(f"'Fecha' inválida o vacía en {int(fechas.isna().sum())} filas")
+    numericas = {c: pd.to_numeric(lote[c], errors='coerce') for c in NUMERICAS}
+    for columna, valores in numericas.items():
+        malas = ~np.isfinite(valores.to_numpy(float))
+        if malas.any():
+            raise ValueError(f"'{columna}' debe ser numérica y finita: {int(malas.sum())} filas no lo son")
+    if lote['Nivel_Trafico'].isna().any():
+        raise ValueError(f"'Nivel_Trafico' vacío en {int(lote['Nivel_Trafico'].isna().sum())} filas")
+    if pack is not None:
+        niveles = lote['Nivel_Trafico'].astype(str)
+        desconocidos = sorted(set(niveles[~niveles.isin(pack['le_trafico'].classes_)]))
+        if desconocidos:
+            raise ValueError(f"Nivel de tráfico desconocido: {desconocidos} "
+                             f"(válidos: {list(pack['le_trafico'].classes_)})")
+    return lote[COLUMNAS].assign(Fecha=fechas, **numericas)
+
+
+def ingerir(lote, pack=None, ruta=almacen.RUTA_ALMACEN, ruta_csv=almacen.RUTA_CSV,
+            ruta_cubo=kpis.RUTA_CUBO, ruta_clientes=clientes.RUTA_CLIENTES, ruta_deriva=deriva.RUTA_MONITOR):
+    """Añade un micro-lote de pedidos y pone al día los agregados; devuelve un resumen con los tiempos."""
+    if not os.path.isdir(ruta) and os.path.exists(ruta_csv):
+        raise ValueError(f"El dataset está en '{ruta_csv}': conviértelo al almacén con 'python almacen.py' "
+                         f"antes de ingerir (si no, la app dejaría de ver el historial).")
+    lote = validar(lote, pack)
+    tiempos = {}
+
+    t0 = time.perf_counter()
+    almacen.anexar_bloques([lote], ruta, prefijo='ingesta')
+    tiempos['anexar'] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    kpis.actualizar(pack, ruta_cubo=ruta_cubo, ruta=ruta, ruta_csv=ruta_csv)
+    tiempos['cubo'] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    n_clientes = len(clientes.actualizar(ruta_clientes, ruta, ruta_csv))
+    tiempos['clientes'] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    deriva.observar(lote, pack, ruta_monitor=ruta_deriva)
+    tiempos['deriva'] = time.perf_counter() - t0
+
+    meses = sorted(lote['Fecha'].dt.strftime('%Y-%m').unique().tolist())
+    secuencia = cache_compartido.senalar(['transacciones'])
+    return {'filas': len(lote), 'meses': meses, 'clientes': n_clientes, 'secuencia': secuencia, 'tiempos': tiempos}
+
+
+# --- FUENTES DE PEDIDOS ---
+
+def _generador():
+    """Data/data.py como módulo (es un script dentro de una carpeta, no un paquete)."""
+    ruta = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Data', 'data.py')
+    spec = importlib.util.spec_from_file_location('generador_datos', ruta)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def simular(filas, rng, generador):
+    """Un micro-lote de pedidos sintéticos con la fecha de hoy."""
+    hoy = np.datetime64(pd.Timestamp.now().date(), 'D')
+    dias = np.full(filas, (hoy - generador.FECHA_INICIO).astype(int))
+    return generador.generar_bloque(rng, dias)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Añade pedidos nuevos al almacén y pone al día los agregados.")
+    parser.add_argument('pedidos', nargs='?', help="CSV de pedidos nuevos (se ingiere en micro-lotes).")
+    parser.add_argument('--lote', type=int, default=TAMANO_LOTE, help="Filas por micro-lote al leer un CSV.")
+    parser.add_argument('--simular', action='store_true', help="Genera pedidos sintéticos con la fecha de hoy.")
+    parser.add_argument('--filas', type=int, default=200, help="Pedidos por micro-lote simulado.")
+    parser.add_argument('--cada', type=float, default=CADA_SEGUNDOS, help="Segundos entre micro-lotes simulados.")
+    parser.add_argument('--veces', type=int, default=None, help="Micro-lotes simulados (por defecto, sin fin).")
+    parser.add_argument('--semilla', type=int, default=None)
+    args = parser.parse_args()
+    if not args.pedidos and not args.simular:
+        parser.error("indica un CSV de pedidos o --simular")
+
+    if not almacen.existe():
+        print("ℹ️ No hay dataset: el almacén se crea con los pedidos ingeridos.")
+    elif not os.path.isdir(almacen.RUTA_ALMACEN):
+        print(f"⏳ Convirtiendo '{almacen.RUTA_CSV}' al almacén particionado (solo la primera vez)...")
+        almacen.convertir_csv()
+
+    # Los aciertos del modelo de retrasos del cubo y las salidas del monitor de deriva necesitan el pack
+    pack = puntuar.cargar_pack() if artefacto.existe() or os.path.exists(puntuar.RUTA_MODELOS) else None
+
+    def reportar(resumen):
+        t = resumen['tiempos']
+        print(f"✅ #{resumen['secuencia']}: {resumen['filas']:,} pedidos ({', '.join(resumen['meses'])}) en "
+              f"{sum(t.values()):.2f}s (anexar {t['anexar']:.2f}s, cubo {t['cubo']:.2f}s, "
+              f"clientes {t['clientes']:.2f}s, deriva {t['deriva']:.2f}s; {resumen['clientes']:,} clientes)")
+
+    if args.pedidos:
+        for lote in pd.read_csv(args.pedidos, chunksize=args.lote):
+            reportar(ingerir(lote, pack))
+        return
+
+    rng = np.random.default_rng(args.semilla)
+    generador = _generador()
+    n = 0
+    while args.veces is None or n < args.veces:
+        inicio = time.monotonic()
+        reportar(ingerir(simular(args.filas, rng, generador), pack))
+        n += 1
+        if args.veces is None or n < args.veces:
+            time.sleep(max(0.0, args.cada - (time.monotonic() - inicio)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+from sklearn.cluster import MiniBatchKMeans
+
+import almacen
+import clientes
+import segmentacion
+
+# --- ESTRUCTURA JERÁRQUICA DE CLIENTES A ESCALA ---
+# Ward sobre todas las transacciones es O(n²) en memoria. En su lugar:
+#   1. se parte del perfil por ID_Cliente (medias de edad y gasto) del almacén clientes.py
+#   2. se resumen los clientes en micro-clusters de K-Means, cada uno con su peso
+#   3. se aplica Ward ponderado sobre los micro-clusters (unos cientos de puntos)
+# La matriz de enlace resultante tiene el formato de scipy y sus conteos son clientes.
+
+MICRO_CLUSTERS = 256
+TAMANO_CHUNK = 1_000_000
+
+
+def microclusters(X, k=MICRO_CLUSTERS, semilla=42):
+    """Reduce X (n x d) a como mucho k centros con su peso (puntos que representa cada uno)."""
+    if len(X) <= k:
+        return X.copy(), np.ones(len(X))
+    kmeans = MiniBatchKMeans(n_clusters=k, random_state=semilla, batch_size=4096, n_init=3).fit(X)
+    pesos = np.bincount(kmeans.labels_, minlength=k).astype(float)
+    usados = pesos > 0
+    return kmeans.cluster_centers_[usados], pesos[usados]
+
+
+def ward_ponderado(centros, pesos):
+    """Enlace de Ward con puntos ponderados. Devuelve (Z, peso de cada nodo del árbol).
+
+    Cada punto entra como un grupo ya formado de `peso` elementos, así la distancia entre
+    grupos es la misma que daría Ward sobre los datos originales (sqrt(2 * ΔSCE)). Z sigue
+    el formato de scipy (su cuarta columna cuenta puntos, no pesos); los pesos de los
+    2m-1 nodos se devuelven aparte para etiquetar el dendrograma.
+    """
+    m = len(centros)
+    centros = np.asarray(centros, dtype=float).copy()
+    pesos = np.asarray(pesos, dtype=float).copy()
+    ids = np.arange(m)
+    tamanos = np.ones(m)
+    Z = np.empty((max(m - 1, 0), 4))
+    pesos_nodo = np.concatenate([pesos, np.empty(max(m - 1, 0))])
+
+    def costo(i):
+        # Aumento de la suma de cuadrados al unir el grupo i con cada uno de los demás
+        return pesos[i] * pesos / (pesos[i] + pesos) * ((centros - centros[i]) ** 2).sum(axis=1)
+
+    d = np.vstack([costo(i) for i in range(m)]) if m else np.empty((0, 0))
+    np.fill_diagonal(d, np.inf)
+    activo = np.ones(m, dtype=bool)
+    for paso in range(m - 1):
+        i, j = sorted(np.unravel_index(np.argmin(d), d.shape))
+        nuevo = pesos[i] + pesos[j]
+        tamanos[i] += tamanos[j]
+        Z[paso] = [min(ids[i], ids[j]), max(ids[i], ids[j]), np.sqrt(2 * d[i, j]), tamanos[i]]
+        pesos_nodo[m + paso] = nuevo
+
+        # El grupo unido ocupa la fila i; la j queda fuera
+        centros[i] = (pesos[i] * centros[i] + pesos[j] * centros[j]) / nuevo
+        pesos[i] = nuevo
+        ids[i] = m + paso
+        activo[j] = False
+        fila = costo(i)
+        fila[~activo] = np.inf
+        fila[i] = np.inf
+        d[i, :] = d[:, i] = fila
+        d[j, :] = d[:, j] = np.inf
+    return Z, pesos_nodo
+
+
+def construir(k=MICRO_CLUSTERS, tamano_chunk=TAMANO_CHUNK, ruta=almacen.RUTA_ALMACEN, ruta_csv=almacen.RUTA_CSV):
+    """Árbol jerárquico de todos los clientes: micro-clusters, sus pesos y la matriz de enlace."""
+    perfiles = clientes.perfiles(clientes.actualizar(ruta=ruta, ruta_csv=ruta_csv, tamano_chunk=tamano_chunk))
+    X = perfiles[segmentacion.COLUMNAS_CLUSTER].to_numpy(dtype=float)
+    # Variables estandarizadas: sin esto el gasto (soles) dominaría a la edad (años)
+    media, escala = X.mean(axis=0), X.std(axis=0)
+    escala[escala == 0] = 1.0
+    centros, pesos = microclusters((X - media) / escala, k)
+    Z, pesos_nodo = ward_ponderado(centros, pesos)
+    return {
+        'linkage': Z,
+        'pesos_nodo': pesos_nodo,
+        'centros': pd.DataFrame(centros * escala + media, columns=segmentacion.COLUMNAS_CLUSTER),
+        'pesos': pesos,
+        'clientes': len(perfiles),
+        'transacciones': int(perfiles['Frecuencia'].sum()),
+    }
+
+
+def grupos(arbol, n):
+    """Corta el árbol en `n` grupos y resume cada uno (clientes y perfil medio ponderado)."""
+    from scipy.cluster.hierarchy import fcluster
+
+    centros, pesos = arbol['centros'], arbol['pesos']
+    if len(centros) < 2:
+        etiquetas = np.ones(len(centros), dtype=int)
+    else:
+        etiquetas = fcluster(arbol['linkage'], t=n, criterion='maxclust')
+    tabla = centros.mul(pesos, axis=0).assign(Clientes=pesos, Grupo=etiquetas).groupby('Grupo').sum()
+    tabla[segmentacion.COLUMNAS_CLUSTER] = tabla[segmentacion.COLUMNAS_CLUSTER].div(tabla['Clientes'], axis=0)
+    tabla['Clientes'] = tabla['Clientes'].astype(int)
+    return tabla.reset_index()
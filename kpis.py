@@ -0,0 +1,171 @@
+import hashlib
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+
+import almacen
+
+# --- CUBO DE KPIs PRE-AGREGADO ---
+# El Dashboard Ejecutivo no recorre las transacciones: lee este cubo diario
+# (unos pocos miles de filas) y lo agrupa por mes o por periodo al vuelo.
+# El cubo se actualiza de forma incremental: solo se agregan las filas nuevas
+# desde su última marca de agua (ver almacen.marca_actual).
+
+RUTA_CUBO = 'cubo_kpis.pkl'
+RUTA_MODELOS = 'modelos_finales.pkl'
+TAMANO_CHUNK = 1_000_000
+
+COLUMNAS_CUBO = ['Fecha', 'Categoria', 'Producto', 'Cantidad', 'Total_Venta',
+                 'Distancia_KM', 'Nivel_Trafico', 'Llega_Tarde']
+CLAVES_VENTAS = ['Fecha', 'Categoria', 'Producto']
+CLAVES_LOGISTICA = ['Fecha', 'Nivel_Trafico']
+
+
+_VERSIONES = {}  # ruta -> ((tamaño, mtime), sha1): el pack solo se relee cuando se reescribe
+
+
+def version_modelo(ruta=RUTA_MODELOS):
+    try:
+        info = os.stat(ruta)
+    except FileNotFoundError:
+        return None
+    firma = (info.st_size, info.st_mtime_ns)
+    guardada = _VERSIONES.get(ruta)
+    if guardada is None or guardada[0] != firma:
+        h = hashlib.sha1()
+        with open(ruta, 'rb') as f:
+            for bloque in iter(lambda: f.read(1 << 20), b''):
+                h.update(bloque)
+        guardada = _VERSIONES[ruta] = (firma, h.hexdigest())
+    return guardada[1]
+
+
+def agregar(df, pack=None):
+    """Agrega un bloque de transacciones al nivel del cubo (día x producto, día x tráfico)."""
+    df = df.assign(Fecha=pd.to_datetime(df['Fecha']).dt.normalize(), Pedidos=1)
+
+    ventas = df.groupby(CLAVES_VENTAS, observed=True).agg(
+        Total_Venta=('Total_Venta', 'sum'),
+        Cantidad=('Cantidad', 'sum'),
+        Pedidos=('Pedidos', 'sum'),
+    ).reset_index()
+
+    # Aciertos del modelo logístico: la "Precisión Modelos" del dashboard es real
+    if pack is not None:
+        # Un nivel que el modelo no conoce (-1) no se puntúa y cuenta como fallo: el cubo se sigue
+        # actualizando en lugar de quedar bloqueado por esas filas
+        trafico_cod = pd.Index(pack['le_trafico'].classes_).get_indexer(df['Nivel_Trafico'].astype(str))
+        conocidos = trafico_cod >= 0
+        X = pd.DataFrame({'Distancia_KM': df['Distancia_KM'].to_numpy()[conocidos],
+                          'Trafico_Cod': trafico_cod[conocidos]})
+        aciertos = np.zeros(len(df), dtype=int)
+        if conocidos.any():
+            aciertos[conocidos] = pack['modelo_logistico'].predict(X) == df['Llega_Tarde'].to_numpy()[conocidos]
+        df['Aciertos'] = aciertos
+    else:
+        df['Aciertos'] = 0
+    logistica = df.groupby(CLAVES_LOGISTICA, observed=True).agg(
+        Pedidos=('Pedidos', 'sum'),
+        Tardes=('Llega_Tarde', 'sum'),
+        Aciertos=('Aciertos', 'sum'),
+    ).reset_index()
+
+    return {'ventas': ventas, 'logistica': logistica}
+
+
+def combinar(cubos):
+    """Suma varios cubos parciales (un mismo día puede venir repartido en varios bloques)."""
+    cubos = [c for c in cubos if c is not None]
+    if len(cubos) == 1:
+        return cubos[0]
+    ventas = pd.concat([c['ventas'] for c in cubos], ignore_index=True)
+    logistica = pd.concat([c['logistica'] for c in cubos], ignore_index=True)
+    for col in ['Categoria', 'Producto']:
+        ventas[col] = ventas[col].astype(str)
+    logistica['Nivel_Trafico'] = logistica['Nivel_Trafico'].astype(str)
+    return {
+        'ventas': ventas.groupby(CLAVES_VENTAS, as_index=False).sum(),
+        'logistica': logistica.groupby(CLAVES_LOGISTICA, as_index=False).sum(),
+    }
+
+
+def actualizar(pack=None, ruta_cubo=RUTA_CUBO, ruta=almacen.RUTA_ALMACEN, ruta_csv=almacen.RUTA_CSV,
+               ruta_modelos=RUTA_MODELOS, tamano_chunk=TAMANO_CHUNK):
+    """Devuelve el cubo al día, agregando solo lo nuevo desde la última actualización."""
+    version = version_modelo(ruta_modelos)
+    if pack is None and version is not None:
+        pack = joblib.load(ruta_modelos)
+
+    cubo = joblib.load(ruta_cubo) if os.path.exists(ruta_cubo) else None
+    anterior = cubo.get('marca', {}) if cubo is not None else {}
+    actual = almacen.marca_actual(ruta, ruta_csv)
+    # Un modelo distinto invalida los aciertos acumulados; un dataset reescrito, todo el cubo
+    reconstruir = (cubo is None or cubo.get('version_modelo') != version
+                   or not almacen.es_continuacion(anterior, actual))
+    if reconstruir:
+        anterior = {}
+    elif anterior == actual:
+        return cubo
+
+    parciales = [agregar(b, pack) for b in almacen.leer_entre(anterior, actual, COLUMNAS_CUBO, tamano_chunk)]
+    base = [] if reconstruir else [cubo]
+    if not base and not parciales:
+        parciales = [agregar(pd.DataFrame(columns=COLUMNAS_CUBO))]
+    cubo = combinar(base + parciales)
+    cubo['marca'] = actual
+    cubo['version_modelo'] = version
+
+    # Escritura atómica: la app nunca lee un cubo a medio escribir
+    temporal = f'{ruta_cubo}.{os.getpid()}.tmp'  # la ingesta y la app pueden actualizarlo a la vez
+    joblib.dump(cubo, temporal)
+    os.replace(temporal, ruta_cubo)
+    return cubo
+
+
+# --- CONSULTAS PARA EL DASHBOARD ---
+
+def filtrar(cubo, desde=None, hasta=None):
+    def _rango(tabla):
+        mascara = pd.Series(True, index=tabla.index)
+        if desde is not None:
+            mascara &= tabla['Fecha'] >= pd.Timestamp(desde)
+        if hasta is not None:
+            mascara &= tabla['Fecha'] <= pd.Timestamp(hasta)
+        return tabla[mascara]
+
+    return {'ventas': _rango(cubo['ventas']), 'logistica': _rango(cubo['logistica'])}
+
+
+def indicadores(cubo):
+    """KPIs del periodo: ingresos, pedidos, puntualidad y precisión del modelo de retrasos."""
+    ventas, logistica = cubo['ventas'], cubo['logistica']
+    pedidos = int(logistica['Pedidos'].sum())
+    return {
+        'ingresos': float(ventas['Total_Venta'].sum()),
+        'pedidos': pedidos,
+        'puntualidad': float(1 - logistica['Tardes'].sum() / pedidos) if pedidos else None,
+        'precision': float(logistica['Aciertos'].sum() / pedidos) if pedidos else None,
+    }
+
+
+def ventas_mensuales(cubo, por=None):
+    claves = ['Mes'] + ([por] if por else [])
+    ventas = cubo['ventas'].assign(Mes=cubo['ventas']['Fecha'].dt.strftime('%Y-%m'))
+    return ventas.groupby(claves, as_index=False, observed=True)[['Total_Venta', 'Cantidad', 'Pedidos']].sum()
+
+
+def distribucion_trafico(cubo):
+    return cubo['logistica'].groupby('Nivel_Trafico', as_index=False, observed=True)[['Pedidos', 'Tardes']].sum()
+
+
+def rango_fechas(cubo):
+    fechas = cubo['ventas']['Fecha']
+    return fechas.min().date(), fechas.max().date()
+
+
+if __name__ == '__main__':
+    cubo = actualizar()
+    print(f"✅ Cubo '{RUTA_CUBO}' actualizado: {len(cubo['ventas']):,} filas de ventas, "
+          f"{len(cubo['logistica']):,} de logística.")
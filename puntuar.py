@@ -0,0 +1,189 @@
+import argparse
+import os
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+import artefacto
+
+# --- PUNTUACIÓN MASIVA CON LOS MODELOS DE modelos_finales.pkl ---
+# Carga el pack una sola vez y puntúa lotes completos con una llamada por modelo:
+#   demanda  -> modelo_lineal (Precio_Unitario)
+#   retraso  -> modelo_logistico + le_trafico (Distancia_KM, Nivel_Trafico)
+#   segmento -> modelo_kmeans + scaler_kmeans (Edad_Cliente, Gasto_Hist_Cliente)
+# Si existe el artefacto NumPy (artefacto.py) se usa ese: no hace falta importar sklearn.
+
+RUTA_MODELOS = 'modelos_finales.pkl'
+TAMANO_LOTE = 200_000
+
+ENTRADAS = {
+    'demanda': ['Precio_Unitario'],
+    'retraso': ['Distancia_KM', 'Nivel_Trafico'],
+    'segmento': ['Edad_Cliente', 'Gasto_Hist_Cliente'],
+}
+SALIDAS = {'demanda': 'Demanda_Pred', 'retraso': 'Prob_Retraso', 'segmento': 'Cluster'}
+
+
+def cargar_pack(ruta=None):
+    """Artefacto NumPy (directorio) o pack de joblib (.pkl); por defecto el artefacto si existe."""
+    if ruta is None:
+        ruta = artefacto.RUTA_ARTEFACTO if artefacto.existe() else RUTA_MODELOS
+    if os.path.isdir(ruta):
+        return artefacto.cargar(ruta)
+    return joblib.load(ruta)
+
+
+def codificar_trafico(le, trafico):
+    """Equivalente vectorizado de le.transform: un solo mapeo por categorías para todo el lote."""
+    codigos = pd.Index(le.classes_).get_indexer(np.asarray(trafico, dtype=str))
+    if (codigos < 0).any():
+        desconocidos = sorted(set(np.asarray(trafico, dtype=str)[codigos < 0].tolist()))
+        raise ValueError(f"Nivel de tráfico desconocido: {desconocidos} (válidos: {le.classes_.tolist()})")
+    return codigos.astype(np.int64)
+
+
+def predecir_demanda(pack, precio):
+    X = pd.DataFrame({'Precio_Unitario': np.asarray(precio, dtype=float)})
+    return pack['modelo_lineal'].predict(X)
+
+
+def barrido_precios(pack, rangos, puntos=200):
+    """Curva de demanda e ingreso (precio x demanda) de cada grupo, con una sola predicción.
+
+    `rangos` tiene índice de grupo (p.ej. Categoria) y columnas Precio_Min y Precio_Max;
+    devuelve columnas grupo, Precio, Demanda e Ingreso (`puntos` precios por grupo).
+    """
+    t = np.linspace(0.0, 1.0, puntos)
+    minimo, maximo = rangos['Precio_Min'].to_numpy(float), rangos['Precio_Max'].to_numpy(float)
+    precios = (minimo[:, None] + (maximo - minimo)[:, None] * t).ravel()
+    # Una demanda negativa (precio fuera de lo observado) es cero unidades, no ingreso negativo
+    demanda = np.clip(predecir_demanda(pack, precios), 0.0, None)
+    return pd.DataFrame({rangos.index.name or 'Grupo': np.repeat(rangos.index.to_numpy(), puntos),
+                         'Precio': precios, 'Demanda': demanda, 'Ingreso': precios * demanda})
+
+
+def precio_optimo(curva):
+    """Fila de mayor ingreso de cada grupo de barrido_precios()."""
+    grupo = curva.columns[0]
+    return curva.loc[curva.groupby(grupo, sort=False)['Ingreso'].idxmax()].set_index(grupo)
+
+
+def predecir_retraso(pack, distancia, trafico):
+    """Probabilidad de que cada envío llegue tarde."""
+    X = pd.DataFrame({'Distancia_KM': np.asarray(distancia, dtype=float),
+                      'Trafico_Cod': codificar_trafico(pack['le_trafico'], trafico)})
+    return pack['modelo_logistico'].predict_proba(X)[:, 1]
+
+
+def rejilla_riesgo(pack, distancias, niveles=None):
+    """Probabilidad de retraso de cada nivel de tráfico (filas) y distancia (columnas), con una sola predicción."""
+    niveles = list(pack['le_trafico'].classes_ if niveles is None else niveles)
+    distancias = np.asarray(distancias, dtype=float)
+    prob = predecir_retraso(pack, np.tile(distancias, len(niveles)), np.repeat(niveles, len(distancias)))
+    return pd.DataFrame(prob.reshape(len(niveles), len(distancias)),
+                        index=pd.Index(niveles, name='Nivel_Trafico'), columns=distancias)
+
+
+def consultar_riesgo(rejilla, distancia, trafico):
+    """Probabilidad en el punto de la rejilla más cercano a `distancia` (sin llamar al modelo)."""
+    d = rejilla.columns.to_numpy()
+    j = int(np.clip(np.searchsorted(d, distancia), 1, len(d) - 1))
+    j -= int(distancia - d[j - 1] < d[j] - distancia)
+    return float(rejilla.loc[trafico].iloc[j])
+
+
+def asignar_segmento(pack, edad, gasto):
+    X = pd.DataFrame({'Edad_Cliente': np.asarray(edad, dtype=float),
+                      'Gasto_Hist_Cliente': np.asarray(gasto, dtype=float)})
+    return pack['modelo_kmeans'].predict(pack['scaler_kmeans'].transform(X))
+
+
+def puntuar_lote(pack, df, tareas=tuple(ENTRADAS)):
+    """Añade al lote una columna de predicción por tarea."""
+    salida = df.copy()
+    if 'demanda' in tareas:
+        salida[SALIDAS['demanda']] = predecir_demanda(pack, df['Precio_Unitario'])
+    if 'retraso' in tareas:
+        salida[SALIDAS['retraso']] = predecir_retraso(pack, df['Distancia_KM'], df['Nivel_Trafico'])
+    if 'segmento' in tareas:
+        salida[SALIDAS['segmento']] = asignar_segmento(pack, df['Edad_Cliente'], df['Gasto_Hist_Cliente'])
+    return salida
+
+
+# --- LECTURA Y ESCRITURA POR LOTES ---
+
+def _es_parquet(ruta):
+    return os.path.isdir(ruta) or ruta.endswith('.parquet')
+
+
+def leer_lotes(ruta, columnas, tamano_lote=TAMANO_LOTE):
+    """Lotes de `columnas` desde un CSV, un archivo Parquet o el almacén particionado."""
+    if _es_parquet(ruta):
+        import pyarrow.dataset as ds
+
+        dataset = ds.dataset(ruta, format='parquet', partitioning='hive' if os.path.isdir(ruta) else None)
+        for lote in dataset.to_batches(columns=columnas, batch_size=tamano_lote):
+            if lote.num_rows:
+                yield lote.to_pandas()
+    else:
+        yield from pd.read_csv(ruta, usecols=columnas, chunksize=tamano_lote)
+
+
+def escribir_lotes(lotes, ruta):
+    """Escribe los lotes en CSV o Parquet sin acumularlos en memoria. Devuelve las filas escritas."""
+    filas = 0
+    escritor = None
+    try:
+        for i, lote in enumerate(lotes):
+            if ruta.endswith('.parquet'):
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+
+                tabla = pa.Table.from_pandas(lote, preserve_index=False)
+                if escritor is None:
+                    escritor = pq.ParquetWriter(ruta, tabla.schema)
+                escritor.write_table(tabla.cast(escritor.schema))
+            else:
+                lote.to_csv(ruta, index=False, mode='w' if i == 0 else 'a', header=(i == 0))
+            filas += len(lote)
+    finally:
+        if escritor is not None:
+            escritor.close()
+    return filas
+
+
+def puntuar_archivo(entrada, salida, tareas=tuple(ENTRADAS), incluir=(), pack=None,
+                    tamano_lote=TAMANO_LOTE, ruta_modelos=None):
+    """Puntúa `entrada` completo por lotes y devuelve (filas, segundos)."""
+    pack = pack if pack is not None else cargar_pack(ruta_modelos)
+    columnas = list(dict.fromkeys(list(incluir) + [c for t in tareas for c in ENTRADAS[t]]))
+
+    t0 = time.perf_counter()
+    lotes = (puntuar_lote(pack, lote, tareas) for lote in leer_lotes(entrada, columnas, tamano_lote))
+    filas = escribir_lotes(lotes, salida)
+    return filas, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Puntúa envíos y clientes en lote con modelos_finales.pkl.")
+    parser.add_argument('entrada', help="CSV, archivo .parquet o directorio del almacén.")
+    parser.add_argument('salida', help="Archivo de salida (.csv o .parquet).")
+    parser.add_argument('--tareas', nargs='+', choices=list(ENTRADAS), default=list(ENTRADAS),
+                        help="Modelos a aplicar (por defecto todos).")
+    parser.add_argument('--incluir', nargs='*', default=[],
+                        help="Columnas extra de la entrada a copiar en la salida (p.ej. ID_Cliente).")
+    parser.add_argument('--lote', type=int, default=TAMANO_LOTE, help="Filas por lote.")
+    parser.add_argument('--modelos', default=None,
+                        help="Artefacto (directorio) o pack .pkl (por defecto el artefacto si existe).")
+    args = parser.parse_args()
+
+    filas, segundos = puntuar_archivo(args.entrada, args.salida, args.tareas, args.incluir,
+                                      tamano_lote=args.lote, ruta_modelos=args.modelos)
+    print(f"✅ {filas:,} filas puntuadas en {segundos:.2f}s "
+          f"({filas / max(segundos, 1e-9):,.0f} filas/s) -> '{args.salida}'")
+
+
+if __name__ == '__main__':
+    main()
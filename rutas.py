@@ -0,0 +1,129 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+import puntuar
+
+# --- RIESGO DE RETRASO POR RUTA ---
+# El modelo logístico puntúa un envío (Distancia_KM, Nivel_Trafico). Una ruta de reparto son
+# 20-40 paradas en orden, cada una al final de un tramo con su distancia y su tráfico:
+#   - la distancia de cada parada es la acumulada desde el almacén (suma de sus tramos)
+#   - el tráfico es el del tramo con que se llega a la parada
+#   - todas las paradas del plan del día se puntúan con una sola llamada a predict_proba
+#   - por ruta: P(al menos una parada tarde) = 1 - prod(1 - p), retrasos esperados y parada crítica
+# Todo sobre arreglos ordenados por ruta (sin bucles por ruta ni por parada).
+
+COLUMNAS = ['ID_Ruta', 'Orden', 'Distancia_Tramo_KM', 'Nivel_Trafico']
+PARADAS_POR_RUTA = (20, 40)
+
+
+def validar(paradas):
+    """Plan con sus columnas y distancias comprobadas; sin 'Orden' las paradas van en el orden de sus filas.
+
+    Cualquier problema del plan es un ValueError (la vista lo muestra como mensaje, no como traza).
+    """
+    if paradas.empty:
+        raise ValueError("El plan de rutas no tiene paradas")
+    faltan = [c for c in COLUMNAS if c not in paradas.columns and c != 'Orden']
+    if faltan:
+        raise ValueError(f"Faltan columnas en el plan de rutas: {faltan}")
+    if 'Orden' not in paradas.columns:
+        paradas = paradas.assign(Orden=paradas.groupby('ID_Ruta', sort=False).cumcount() + 1)
+    if paradas['ID_Ruta'].isna().any():
+        raise ValueError("Hay paradas sin ID_Ruta")
+    numericas = {c: pd.to_numeric(paradas[c], errors='coerce') for c in ('Orden', 'Distancia_Tramo_KM')}
+    for columna, valores in numericas.items():
+        malas = ~np.isfinite(valores.to_numpy(float))
+        if malas.any():
+            raise ValueError(f"'{columna}' debe ser numérica y finita: {int(malas.sum())} filas no lo son "
+                             f"(la primera, fila {int(np.flatnonzero(malas)[0]) + 1})")
+    if (numericas['Distancia_Tramo_KM'] < 0).any():
+        raise ValueError("Hay tramos con distancia negativa")
+    return paradas.assign(**numericas)
+
+
+def puntuar_rutas(pack, paradas):
+    """Probabilidad de retraso de cada parada y de cada ruta. Devuelve (paradas, rutas).
+
+    `paradas` tiene una fila por parada: ID_Ruta, Orden, Distancia_Tramo_KM (desde la parada
+    anterior o el almacén) y Nivel_Trafico del tramo. Se añaden Distancia_KM (acumulada) y
+    Prob_Retraso; `rutas` tiene una fila por ID_Ruta.
+    """
+    paradas = validar(paradas).sort_values(['ID_Ruta', 'Orden'], kind='stable', ignore_index=True)
+    ids, inicio, tamanos = np.unique(paradas['ID_Ruta'].to_numpy(), return_index=True, return_counts=True)
+
+    # Distancia acumulada por ruta: suma acumulada global menos lo acumulado antes de cada ruta
+    tramo = paradas['Distancia_Tramo_KM'].to_numpy(float)
+    total = np.cumsum(tramo)
+    acumulada = total - np.repeat(total[inicio] - tramo[inicio], tamanos)
+    prob = puntuar.predecir_retraso(pack, acumulada, paradas['Nivel_Trafico'])
+    paradas = paradas.assign(Distancia_KM=acumulada, Prob_Retraso=prob)
+
+    # Paradas independientes: P(ninguna tarde) es el producto por ruta, sumado en logaritmos
+    with np.errstate(divide='ignore'):
+        log_puntual = np.add.reduceat(np.log1p(-prob), inicio)
+    # Parada crítica: la primera de cada ruta que alcanza el máximo de su ruta
+    maximo = np.maximum.reduceat(prob, inicio)
+    posiciones = np.flatnonzero(prob == np.repeat(maximo, tamanos))
+    critica = posiciones[np.searchsorted(posiciones, inicio)]
+    rutas = pd.DataFrame({
+        'Paradas': tamanos,
+        'Distancia_KM': acumulada[inicio + tamanos - 1],
+        'Retrasos_Esperados': np.add.reduceat(prob, inicio),
+        'Parada_Critica': paradas['Orden'].to_numpy()[critica],
+        'Prob_Max_Parada': prob[critica],
+        'Prob_Algun_Retraso': -np.expm1(log_puntual),
+    }, index=pd.Index(ids, name='ID_Ruta'))
+    return paradas, rutas
+
+
+def simular_plan(rutas, rng, niveles):
+    """Plan sintético de un día: 20 a 40 paradas por ruta, tramos urbanos cortos y tráfico al azar por tramo."""
+    tamanos = rng.integers(PARADAS_POR_RUTA[0], PARADAS_POR_RUTA[1] + 1, rutas)
+    n = int(tamanos.sum())
+    return pd.DataFrame({
+        'ID_Ruta': np.repeat(np.arange(1, rutas + 1), tamanos),
+        'Orden': np.arange(n) - np.repeat(np.cumsum(tamanos) - tamanos, tamanos) + 1,
+        'Distancia_Tramo_KM': rng.uniform(0.1, 0.8, n).round(2),
+        'Nivel_Trafico': rng.choice(np.asarray(niveles), n),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Probabilidad de retraso de cada ruta de reparto del día.")
+    parser.add_argument('plan', nargs='?', help="CSV o Parquet con ID_Ruta, Orden, Distancia_Tramo_KM y Nivel_Trafico.")
+    parser.add_argument('--simular', type=int, default=None, metavar='RUTAS',
+                        help="Puntúa un plan sintético con este número de rutas.")
+    parser.add_argument('--semilla', type=int, default=None)
+    parser.add_argument('--salida', default=None, help="Resumen por ruta (.csv o .parquet).")
+    parser.add_argument('--paradas', default=None, help="Detalle por parada (.csv o .parquet).")
+    parser.add_argument('--modelos', default=None,
+                        help="Artefacto (directorio) o pack .pkl (por defecto el artefacto si existe).")
+    args = parser.parse_args()
+    if not args.plan and args.simular is None:
+        parser.error("indica un plan de rutas o --simular")
+
+    pack = puntuar.cargar_pack(args.modelos)
+    if args.plan:
+        plan = pd.read_parquet(args.plan) if args.plan.endswith('.parquet') else pd.read_csv(args.plan)
+    else:
+        plan = simular_plan(args.simular, np.random.default_rng(args.semilla), pack['le_trafico'].classes_)
+
+    t0 = time.perf_counter()
+    paradas, rutas = puntuar_rutas(pack, plan)
+    segundos = time.perf_counter() - t0
+    print(f"✅ {len(paradas):,} paradas en {len(rutas):,} rutas puntuadas en {segundos:.2f}s "
+          f"({len(paradas) / max(segundos, 1e-9):,.0f} paradas/s)")
+    print("🚨 Rutas con más riesgo:")
+    print(rutas.sort_values('Prob_Algun_Retraso', ascending=False).head(10).round(3).to_string())
+
+    if args.salida:
+        puntuar.escribir_lotes([rutas.reset_index()], args.salida)
+    if args.paradas:
+        puntuar.escribir_lotes([paradas], args.paradas)
+
+
+if __name__ == '__main__':
+    main()
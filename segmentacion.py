@@ -0,0 +1,87 @@
+import os
+import shutil
+import tempfile
+import uuid
+
+import pandas as pd
+
+# --- ASIGNACIONES DE CLUSTERS PRECALCULADAS ---
+# El entrenamiento guarda la etiqueta de cada cliente (una fila por ID_Cliente, con su
+# perfil del almacén clientes.py) junto al pack de modelos, para que la app solo tenga
+# que leerlas (nunca re-entrenar K-Means). Se guardan como un directorio Parquet, que solo
+# reemplaza al anterior cuando el pack nuevo ya está guardado.
+
+RUTA_ASIGNACIONES = 'clusters_clientes'
+COLUMNAS_CLUSTER = ['Edad_Cliente', 'Gasto_Hist_Cliente']
+
+
+def asignaciones(perfiles, etiquetas):
+    """Tabla ID_Cliente / Edad / Gasto / Transacciones / Cluster a partir de clientes.perfiles()."""
+    salida = perfiles[COLUMNAS_CLUSTER].copy()
+    salida['Transacciones'] = perfiles['Frecuencia'].to_numpy()
+    salida['Cluster'] = pd.Series(etiquetas, index=perfiles.index).astype('int8')
+    return salida.rename_axis('ID_Cliente').reset_index()
+
+
+def centroides(kmeans, scaler):
+    """Centroides en unidades originales (años y soles), uno por cluster."""
+    return pd.DataFrame(scaler.inverse_transform(kmeans.cluster_centers_), columns=COLUMNAS_CLUSTER)
+
+
+def resumen(asig):
+    """Estadísticas por cluster: clientes, sus transacciones y medias de edad y gasto por cliente."""
+    return asig.groupby('Cluster').agg(
+        Transacciones=('Transacciones', 'sum'),
+        Clientes=('ID_Cliente', 'size'),
+        Edad_Media=('Edad_Cliente', 'mean'),
+        Gasto_Medio=('Gasto_Hist_Cliente', 'mean'),
+    ).reset_index()
+
+
+def guardar_asignaciones(asig, ruta=RUTA_ASIGNACIONES):
+    """Reemplaza el directorio de asignaciones por una sola parte Parquet (de forma atómica)."""
+    padre = os.path.dirname(os.path.abspath(ruta))
+    temporal = tempfile.mkdtemp(prefix='.clusters-', dir=padre)
+    try:
+        asig.to_parquet(os.path.join(temporal, f'parte-{uuid.uuid4().hex[:8]}.parquet'), index=False)
+        # Un directorio no se puede reemplazar atómicamente: se aparta el viejo y se renombra el nuevo
+        viejo = None
+        if os.path.exists(ruta):
+            viejo = tempfile.mkdtemp(prefix='.clusters-viejo-', dir=padre)
+            os.replace(ruta, os.path.join(viejo, 'anterior'))
+        os.replace(temporal, ruta)
+        if viejo is not None:
+            shutil.rmtree(viejo)
+    except BaseException:
+        shutil.rmtree(temporal, ignore_errors=True)
+        raise
+
+
+def agregar_al_pack(pack, perfiles, kmeans, scaler, ruta=RUTA_ASIGNACIONES):
+    """Asigna cada cliente a su cluster y añade centroides y resumen al pack.
+
+    Las asignaciones quedan en memoria en pack['asignaciones_pendientes'] (sin tocar el disco);
+    entrenar.guardar_pack las escribe en `ruta` justo después de guardar el pack.
+    """
+    asig = asignaciones(perfiles, kmeans.predict(scaler.transform(perfiles[COLUMNAS_CLUSTER])))
+    pack['asignaciones_pendientes'] = (asig, ruta)
+    pack['centroides_kmeans'] = centroides(kmeans, scaler)
+    pack['resumen_clusters'] = resumen(asig)
+    return pack
+
+
+def leer_asignaciones(columnas, tamano_chunk=1_000_000, ruta=RUTA_ASIGNACIONES):
+    """Recorre las asignaciones por bloques de `columnas`."""
+    import pyarrow.dataset as ds
+
+    if not os.path.isdir(ruta):
+        raise FileNotFoundError(ruta)
+    for lote in ds.dataset(ruta, format='parquet').to_batches(columns=list(columnas), batch_size=tamano_chunk):
+        if lote.num_rows:
+            yield lote.to_pandas()
+
+
+def cargar_asignaciones(ruta=RUTA_ASIGNACIONES):
+    if not os.path.isdir(ruta):
+        raise FileNotFoundError(ruta)
+    return pd.read_parquet(ruta)
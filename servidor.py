@@ -0,0 +1,290 @@
+import argparse
+import json
+import math
+import numbers
+import queue
+import threading
+import time
+import urllib.request
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+import puntuar
+
+# --- SERVIDOR LOCAL DE INFERENCIA ---
+# Carga los modelos una sola vez (el artefacto NumPy si existe, sin sklearn) y expone:
+#   POST /demanda   {"Precio_Unitario": 5.0}
+#   POST /retraso   {"Distancia_KM": 8.5, "Nivel_Trafico": "Alto"}
+#   POST /segmento  {"Edad_Cliente": 30, "Gasto_Hist_Cliente": 50.0}
+#   GET  /metricas  (latencias p50/p99 y tamaño medio de lote por endpoint)
+# El cuerpo puede ser un objeto o una lista de objetos. Las peticiones que llegan
+# dentro de la misma ventana (unos milisegundos) se agrupan en un solo predict; cada una se
+# valida antes de entrar en la cola, así una petición mala no cambia el resultado de las demás.
+
+PUERTO = 8502
+VENTANA_MS = 2.0
+MAX_LOTE = 4096
+MUESTRAS_LATENCIA = 10_000
+
+
+# Campos de cada endpoint: numéricos (float) o texto (Nivel_Trafico)
+CAMPOS = {tarea: {c: (str if c == 'Nivel_Trafico' else float) for c in columnas}
+          for tarea, columnas in puntuar.ENTRADAS.items()}
+
+
+def _finito(valor):
+    try:
+        return math.isfinite(valor)
+    except OverflowError:  # un entero JSON enorme no cabe en un float
+        return False
+
+
+def validar(endpoint, datos):
+    """Filas de una petición (objeto o lista de objetos) con sus campos y tipos comprobados."""
+    filas = [datos] if isinstance(datos, dict) else datos
+    if not isinstance(filas, list) or not filas:
+        raise ValueError("El cuerpo debe ser un objeto o una lista no vacía de objetos")
+    for i, fila in enumerate(filas):
+        if not isinstance(fila, dict):
+            raise ValueError(f"Fila {i}: se esperaba un objeto")
+        for campo, tipo in CAMPOS[endpoint].items():
+            if campo not in fila:
+                raise ValueError(f"Fila {i}: falta '{campo}'")
+            valor = fila[campo]
+            if tipo is str:
+                if not isinstance(valor, str):
+                    raise ValueError(f"Fila {i}: '{campo}' debe ser texto")
+            elif isinstance(valor, bool) or not isinstance(valor, numbers.Real) or not _finito(valor):
+                raise ValueError(f"Fila {i}: '{campo}' debe ser un número finito")
+    return filas
+
+
+def _funciones(pack):
+    return {
+        'demanda': lambda df: puntuar.predecir_demanda(pack, df['Precio_Unitario']),
+        'retraso': lambda df: puntuar.predecir_retraso(pack, df['Distancia_KM'], df['Nivel_Trafico']),
+        'segmento': lambda df: puntuar.asignar_segmento(pack, df['Edad_Cliente'], df['Gasto_Hist_Cliente']),
+    }
+
+
+class MicroLotes:
+    """Agrupa las peticiones concurrentes de un endpoint y las resuelve con una sola llamada al modelo."""
+
+    def __init__(self, funcion, ventana_ms=VENTANA_MS, max_lote=MAX_LOTE):
+        self.funcion = funcion
+        self.ventana = ventana_ms / 1000
+        self.max_lote = max_lote
+        self.cola = queue.Queue()
+        self.lotes = 0
+        self.filas = 0
+        threading.Thread(target=self._bucle, daemon=True).start()
+
+    def enviar(self, filas):
+        futuro = Future()
+        self.cola.put((filas, futuro))
+        return futuro
+
+    def _bucle(self):
+        while True:
+            pendientes = [self.cola.get()]
+            n = len(pendientes[0][0])
+            limite = time.monotonic() + self.ventana
+            while n < self.max_lote:
+                resto = limite - time.monotonic()
+                if resto <= 0:
+                    break
+                try:
+                    pendientes.append(self.cola.get(timeout=resto))
+                except queue.Empty:
+                    break
+                n += len(pendientes[-1][0])
+            self._resolver(pendientes)
+
+    def _resolver(self, pendientes):
+        try:
+            df = pd.DataFrame([fila for filas, _ in pendientes for fila in filas])
+            resultados = np.asarray(self.funcion(df))
+        except Exception as e:
+            if len(pendientes) == 1:
+                pendientes[0][1].set_exception(e)
+                return
+            # Una petición inválida no debe tumbar al resto del lote: se resuelven por separado
+            for p in pendientes:
+                self._resolver([p])
+            return
+
+        inicio = 0
+        for filas, futuro in pendientes:
+            parte = resultados[inicio:inicio + len(filas)]
+            if np.isfinite(parte).all():
+                futuro.set_result(parte.tolist())
+            else:
+                # NaN o infinito no es JSON válido: esa petición recibe un 400, el resto su resultado
+                futuro.set_exception(ValueError("El modelo devolvió un resultado no finito"))
+            inicio += len(filas)
+        self.lotes += 1
+        self.filas += inicio
+
+
+class Metricas:
+    def __init__(self):
+        self.latencias = {}
+        self.errores = {}
+        self.candado = threading.Lock()
+
+    def registrar(self, endpoint, segundos, error=False):
+        with self.candado:
+            self.latencias.setdefault(endpoint, deque(maxlen=MUESTRAS_LATENCIA)).append(segundos)
+            if error:
+                self.errores[endpoint] = self.errores.get(endpoint, 0) + 1
+
+    def resumen(self, micro_lotes):
+        with self.candado:
+            copia = {k: np.array(v) for k, v in self.latencias.items()}
+        salida = {}
+        for endpoint, lat in copia.items():
+            salida[endpoint] = {
+                'peticiones': len(lat),
+                'p50_ms': float(np.percentile(lat, 50) * 1000),
+                'p99_ms': float(np.percentile(lat, 99) * 1000),
+                'errores': self.errores.get(endpoint, 0),
+            }
+            if endpoint in micro_lotes and micro_lotes[endpoint].lotes:
+                salida[endpoint]['filas_por_lote'] = micro_lotes[endpoint].filas / micro_lotes[endpoint].lotes
+        return salida
+
+
+class _Servidor(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # El valor por defecto (5) rechaza conexiones con muchos clientes simultáneos
+
+
+def crear_servidor(pack, host='127.0.0.1', puerto=PUERTO, ventana_ms=VENTANA_MS, max_lote=MAX_LOTE):
+    micro_lotes = {nombre: MicroLotes(f, ventana_ms, max_lote) for nombre, f in _funciones(pack).items()}
+    metricas = Metricas()
+
+    class Manejador(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _responder(self, codigo, cuerpo):
+            datos = json.dumps(cuerpo).encode('utf-8')
+            self.send_response(codigo)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(datos)))
+            self.end_headers()
+            self.wfile.write(datos)
+
+        def do_GET(self):
+            if self.path == '/salud':
+                self._responder(200, {'estado': 'ok'})
+            elif self.path == '/metricas':
+                self._responder(200, metricas.resumen(micro_lotes))
+            else:
+                self._responder(404, {'error': f"Ruta desconocida: {self.path}"})
+
+        def do_POST(self):
+            t0 = time.perf_counter()
+            endpoint = self.path.strip('/')
+            try:
+                longitud = int(self.headers.get('Content-Length', ''))
+                if longitud < 0:
+                    raise ValueError
+            except ValueError:
+                # Sin una longitud válida no se sabe dónde acaba el cuerpo: se cierra la conexión
+                self.close_connection = True
+                self._responder(400, {'error': "Falta Content-Length o no es un entero no negativo"})
+                return
+            cuerpo = self.rfile.read(longitud)
+            if endpoint not in micro_lotes:
+                self._responder(404, {'error': f"Ruta desconocida: {self.path}"})
+                return
+            try:
+                datos = json.loads(cuerpo)
+                unico = isinstance(datos, dict)
+                filas = validar(endpoint, datos)
+                resultados = micro_lotes[endpoint].enviar(filas).result()
+            except (ValueError, KeyError, TypeError) as e:
+                metricas.registrar(endpoint, time.perf_counter() - t0, error=True)
+                self._responder(400, {'error': f"{type(e).__name__}: {e}"})
+                return
+            except Exception as e:
+                metricas.registrar(endpoint, time.perf_counter() - t0, error=True)
+                self._responder(500, {'error': f"{type(e).__name__}: {e}"})
+                return
+            self._responder(200, {'resultado': resultados[0] if unico else resultados})
+            metricas.registrar(endpoint, time.perf_counter() - t0)
+
+        def log_message(self, formato, *args):
+            pass  # Sin log por petición: a miles de peticiones/s domina el costo
+
+    return _Servidor((host, puerto), Manejador)
+
+
+# --- PRUEBA DE CARGA LOCAL ---
+
+EJEMPLOS = {
+    'demanda': lambda rng: {'Precio_Unitario': float(rng.uniform(1, 30))},
+    'retraso': lambda rng: {'Distancia_KM': float(rng.uniform(0.5, 20)),
+                            'Nivel_Trafico': str(rng.choice(['Bajo', 'Medio', 'Alto']))},
+    'segmento': lambda rng: {'Edad_Cliente': int(rng.integers(18, 90)),
+                             'Gasto_Hist_Cliente': float(rng.uniform(0, 500))},
+}
+
+
+def prueba_carga(url, endpoint, peticiones, concurrencia):
+    rng = np.random.default_rng(0)
+    cuerpos = [json.dumps(EJEMPLOS[endpoint](rng)).encode('utf-8') for _ in range(peticiones)]
+
+    def llamar(cuerpo):
+        t0 = time.perf_counter()
+        req = urllib.request.Request(f'{url}/{endpoint}', data=cuerpo, headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(req) as r:
+            r.read()
+        return time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(concurrencia) as pool:
+        latencias = np.array(list(pool.map(llamar, cuerpos)))
+    total = time.perf_counter() - t0
+    print(f"📈 {peticiones:,} peticiones a /{endpoint} con {concurrencia} clientes: "
+          f"{peticiones / total:,.0f} pet/s | p50 {np.percentile(latencias, 50) * 1000:.2f} ms "
+          f"| p99 {np.percentile(latencias, 99) * 1000:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local de inferencia con micro-lotes.")
+    sub = parser.add_subparsers(dest='comando')
+    servir = sub.add_parser('servir', help="Inicia el servidor (comando por defecto).")
+    servir.add_argument('--host', default='127.0.0.1')
+    servir.add_argument('--puerto', type=int, default=PUERTO)
+    servir.add_argument('--ventana-ms', type=float, default=VENTANA_MS, help="Espera máxima para formar un lote.")
+    servir.add_argument('--max-lote', type=int, default=MAX_LOTE, help="Filas máximas por lote.")
+    servir.add_argument('--modelos', default=None,
+                        help="Artefacto (directorio) o pack .pkl (por defecto el artefacto si existe).")
+    carga = sub.add_parser('carga', help="Prueba de carga contra un servidor en marcha.")
+    carga.add_argument('--url', default=f'http://127.0.0.1:{PUERTO}')
+    carga.add_argument('--endpoint', choices=list(EJEMPLOS), default='retraso')
+    carga.add_argument('--peticiones', type=int, default=5000)
+    carga.add_argument('--concurrencia', type=int, default=32)
+    args = parser.parse_args()
+
+    if args.comando == 'carga':
+        prueba_carga(args.url, args.endpoint, args.peticiones, args.concurrencia)
+        return
+
+    if args.comando is None:
+        args = servir.parse_args([])
+    servidor = crear_servidor(puntuar.cargar_pack(args.modelos), args.host, args.puerto, args.ventana_ms, args.max_lote)
+    print(f"🚀 Servidor de inferencia en http://{args.host}:{args.puerto} (Ctrl+C para detener)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        servidor.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import artefacto  # noqa: E402
+import clientes  # noqa: E402
+import entrenar  # noqa: E402
+import ingesta  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def transacciones():
+    """Transacciones sintéticas con el generador de Data/data.py (semilla fija)."""
+    generador = ingesta._generador()
+    rng = np.random.default_rng(7)
+    return generador.generar_bloque(rng, np.sort(rng.integers(0, 300, 5_000)))
+
+
+@pytest.fixture(scope='session')
+def pack(transacciones):
+    """Pack sklearn entrenado con entrenar.entrenar sobre las transacciones sintéticas."""
+    perfiles = clientes.perfiles(clientes.combinar([clientes.agregar(transacciones)]))
+    pack, _ = entrenar.entrenar(transacciones, perfiles, trabajadores=1)
+    return pack
+
+
+@pytest.fixture(scope='session')
+def pack_artefacto(pack, tmp_path_factory):
+    """El mismo pack exportado y cargado como artefacto NumPy."""
+    ruta = str(tmp_path_factory.mktemp('artefacto') / 'modelos_finales')
+    artefacto.exportar(pack, ruta)
+    return artefacto.cargar(ruta)
@@ -0,0 +1,90 @@
+import pandas as pd
+import pytest
+
+import almacen
+
+COLUMNAS = ['Fecha', 'Precio_Unitario', 'Cantidad']
+
+
+def _leer(anterior, actual):
+    bloques = list(almacen.leer_entre(anterior, actual, COLUMNAS, 700))
+    return pd.concat(bloques, ignore_index=True) if bloques else pd.DataFrame(columns=COLUMNAS)
+
+
+def _mismas_filas(obtenido, esperado):
+    clave = ['Precio_Unitario', 'Cantidad']
+    obtenido = obtenido.sort_values(clave, ignore_index=True)
+    esperado = esperado.sort_values(clave, ignore_index=True)
+    pd.testing.assert_frame_equal(obtenido[clave], esperado[clave], check_dtype=False)
+
+
+@pytest.fixture(params=['csv', 'parquet'])
+def fuente(request, tmp_path, transacciones):
+    """Escribe el primer tramo en la fuente indicada y devuelve (rutas, anexar)."""
+    rutas = {'ruta': str(tmp_path / 'almacen'), 'ruta_csv': str(tmp_path / 'ventas.csv')}
+    inicial = transacciones.iloc[:3_000]
+    if request.param == 'csv':
+        inicial.to_csv(rutas['ruta_csv'], index=False)
+        anexar = lambda df: df.to_csv(rutas['ruta_csv'], mode='a', header=False, index=False)  # noqa: E731
+    else:
+        almacen.anexar_bloques([inicial], rutas['ruta'])
+        anexar = lambda df: almacen.anexar_bloques([df], rutas['ruta'])  # noqa: E731
+    return rutas, anexar
+
+
+def test_leer_entre_solo_devuelve_lo_anexado(fuente, transacciones):
+    rutas, anexar = fuente
+    marca = almacen.marca_actual(**rutas)
+    _mismas_filas(_leer({}, marca), transacciones.iloc[:3_000])
+    assert _leer(marca, marca).empty
+
+    anexar(transacciones.iloc[3_000:])
+    actual = almacen.marca_actual(**rutas)
+    assert almacen.es_continuacion(marca, actual)
+    _mismas_filas(_leer(marca, actual), transacciones.iloc[3_000:])
+    _mismas_filas(pd.concat([_leer({}, marca), _leer(marca, actual)]), transacciones)
+
+
+def test_reescritura_no_es_continuacion(tmp_path, transacciones):
+    ruta_csv = str(tmp_path / 'ventas.csv')
+    transacciones.iloc[:3_000].to_csv(ruta_csv, index=False)
+    marca = almacen.marca_actual(ruta=str(tmp_path / 'nada'), ruta_csv=ruta_csv)
+    transacciones.iloc[1_000:5_000].to_csv(ruta_csv, index=False)
+    actual = almacen.marca_actual(ruta=str(tmp_path / 'nada'), ruta_csv=ruta_csv)
+    assert not almacen.es_continuacion(marca, actual)
+    assert not almacen.es_continuacion({}, actual)
+
+
+def test_parte_borrada_no_es_continuacion(tmp_path, transacciones):
+    ruta = str(tmp_path / 'almacen')
+    almacen.anexar_bloques([transacciones.iloc[:3_000]], ruta)
+    marca = almacen.marca_actual(ruta=ruta)
+    almacen.escribir_bloques([transacciones.iloc[:2_000]], ruta)
+    assert not almacen.es_continuacion(marca, almacen.marca_actual(ruta=ruta))
+
+
+@pytest.mark.parametrize('origen', ['csv', 'parquet'])
+def test_leer_solo_el_rango_de_fechas(tmp_path, transacciones, origen):
+    rutas = {'ruta': str(tmp_path / 'almacen'), 'ruta_csv': str(tmp_path / 'ventas.csv')}
+    if origen == 'csv':
+        transacciones.to_csv(rutas['ruta_csv'], index=False)
+    else:
+        almacen.anexar_bloques([transacciones], rutas['ruta'])
+    fechas = pd.to_datetime(transacciones['Fecha'])
+    desde, hasta = '2024-03-15', '2024-05-10'
+    esperado = transacciones[(fechas >= desde) & (fechas <= hasta)]
+
+    df = almacen.leer(['Precio_Unitario', 'Cantidad'], desde, hasta, **rutas)
+    assert list(df.columns) == ['Precio_Unitario', 'Cantidad']
+    _mismas_filas(df, esperado)
+    con_fecha = almacen.leer(['Fecha'], desde=desde, **rutas)['Fecha']
+    assert con_fecha.min() >= pd.Timestamp(desde) and len(con_fecha) == (fechas >= desde).sum()
+    assert len(almacen.leer(hasta=hasta, **rutas)) == (fechas <= hasta).sum()
+
+
+def test_filtro_de_fechas_poda_las_particiones(tmp_path, transacciones):
+    ruta = str(tmp_path / 'almacen')
+    almacen.anexar_bloques([transacciones], ruta)
+    filtro = almacen._filtro_fechas('2024-03-15', '2024-05-10')
+    fragmentos = list(almacen.abrir_dataset(ruta).get_fragments(filter=filtro))
+    assert {f.path.split('Mes=')[1][:7] for f in fragmentos} == {'2024-03', '2024-04', '2024-05'}
@@ -0,0 +1,75 @@
+import copy
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+import arboles
+import caracteristicas
+import entrenar_modelo
+import generar_datos
+
+
+@pytest.fixture(scope='module')
+def ventas():
+    fechas = pd.date_range('2024-01-01', periods=120)
+    df = generar_datos.generar_fragmento(generar_datos.catalogo(), fechas, 3)
+    return entrenar_modelo.preparar(df)
+
+
+@pytest.fixture(scope='module', params=['bosque', 'boosting'])
+def modelo(request, ventas):
+    X, y, _ = ventas
+    return entrenar_modelo.entrenar(X, y, request.param, trabajadores=1)
+
+
+def test_arboles_planos_igual_que_sklearn(modelo, ventas):
+    X, _, codificadores = ventas
+    rejilla = caracteristicas.transformar(caracteristicas.rejilla(codificadores, pd.date_range('2025-01-01', periods=30)),
+                                          codificadores)
+    plano = arboles.aplanar(modelo)
+    for lote in (X, rejilla, rejilla.iloc[:1]):
+        np.testing.assert_allclose(plano.predict(lote), modelo.predict(lote), rtol=1e-5, atol=1e-5)
+
+
+def test_exportar_y_cargar(modelo, ventas, tmp_path):
+    X, _, codificadores = ventas
+    ruta = str(tmp_path / 'modelo.npz')
+    plano = arboles.exportar(modelo, codificadores, ruta)
+    cargado, guardados = arboles.cargar(ruta)
+    assert guardados == codificadores
+    np.testing.assert_array_equal(cargado.predict(X), plano.predict(X))
+
+
+def test_pronosticar_usa_sklearn_en_lotes_grandes(modelo, ventas, tmp_path, monkeypatch):
+    X, _, codificadores = ventas
+    monkeypatch.chdir(tmp_path)
+    joblib.dump(modelo, entrenar_modelo.RUTA_MODELO)
+    arboles.exportar(modelo, codificadores, origen=entrenar_modelo.RUTA_MODELO)
+    usados = []
+    monkeypatch.setattr(entrenar_modelo.joblib, 'load', lambda ruta: usados.append(ruta) or modelo)
+
+    fechas = pd.date_range('2025-01-01', periods=60)
+    df = caracteristicas.rejilla(codificadores, fechas)
+    limite = arboles.FILAS_SKLEARN[arboles.aplanar(modelo).combinar]
+    np.testing.assert_allclose(entrenar_modelo.pronosticar(df.iloc[:limite - 1]),
+                               modelo.predict(caracteristicas.transformar(df.iloc[:limite - 1], codificadores)),
+                               rtol=1e-5, atol=1e-5)
+    assert usados == []
+    entrenar_modelo.pronosticar(df.iloc[:limite])
+    assert usados == [entrenar_modelo.RUTA_MODELO]
+
+    # Un .pkl que ya no es el del entrenamiento exportado no se usa
+    joblib.dump({'otro': modelo}, entrenar_modelo.RUTA_MODELO)
+    usados.clear()
+    entrenar_modelo.pronosticar(df.iloc[:limite])
+    assert usados == []
+
+
+def test_boosting_sin_atributos_privados_falla_claro(ventas):
+    X, y, _ = ventas
+    modelo = copy.deepcopy(entrenar_modelo.entrenar(X.iloc[:500], y.iloc[:500], 'boosting'))
+    del modelo._baseline_prediction
+    with pytest.raises(TypeError, match='_baseline_prediction'):
+        arboles.aplanar(modelo)
@@ -0,0 +1,76 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import artefacto
+import puntuar
+
+
+def test_artefacto_predice_igual_que_el_pack(pack, pack_artefacto, transacciones):
+    esperado = puntuar.puntuar_lote(pack, transacciones)
+    obtenido = puntuar.puntuar_lote(pack_artefacto, transacciones)
+    pd.testing.assert_frame_equal(obtenido, esperado, check_dtype=False, rtol=1e-9)
+    pd.testing.assert_frame_equal(pack_artefacto['centroides_kmeans'],
+                                  pd.DataFrame(pack['scaler_kmeans'].inverse_transform(
+                                      pack['modelo_kmeans'].cluster_centers_),
+                                      columns=pack_artefacto['centroides_kmeans'].columns))
+
+
+def test_codificador_igual_a_label_encoder(pack, pack_artefacto):
+    niveles = np.array(['Alto', 'Bajo', 'Medio', 'Bajo'])
+    np.testing.assert_array_equal(pack_artefacto['le_trafico'].transform(niveles),
+                                  pack['le_trafico'].transform(niveles))
+    with pytest.raises(ValueError, match="Nivel desconocido"):
+        pack_artefacto['le_trafico'].transform(['Extremo'])
+
+
+def test_exportar_reemplaza_sin_dejar_temporales(pack, tmp_path):
+    ruta = str(tmp_path / 'modelos')
+    primero = artefacto.exportar(pack, ruta)
+    segundo = artefacto.exportar(pack, ruta)
+    assert sorted(os.listdir(tmp_path)) == ['modelos']
+    assert artefacto.cargar(ruta)['version_artefacto'] == segundo['checksum']
+    assert primero['arreglos'] == segundo['arreglos']
+
+
+@pytest.fixture
+def exportado(pack, tmp_path):
+    ruta = str(tmp_path / 'modelos')
+    artefacto.exportar(pack, ruta)
+    return ruta
+
+
+def test_arreglo_corrupto(exportado):
+    with open(os.path.join(exportado, 'lineal_coef.npy'), 'r+b') as f:
+        f.seek(-1, os.SEEK_END)
+        ultimo = f.read(1)[0]
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([ultimo ^ 0xFF]))
+    with pytest.raises(artefacto.ArtefactoInvalido, match="corrupto"):
+        artefacto.cargar(exportado)
+
+
+def test_manifiesto_alterado_o_de_otro_formato(exportado):
+    archivo = os.path.join(exportado, artefacto.MANIFIESTO)
+    with open(archivo, encoding='utf-8') as f:
+        manifiesto = json.load(f)
+    manifiesto['clases_trafico'].append('Extremo')
+    with open(archivo, 'w', encoding='utf-8') as f:
+        json.dump(manifiesto, f)
+    with pytest.raises(artefacto.ArtefactoInvalido, match="checksum"):
+        artefacto.cargar(exportado)
+
+    manifiesto['formato'] = artefacto.FORMATO + 1
+    with open(archivo, 'w', encoding='utf-8') as f:
+        json.dump(manifiesto, f)
+    with pytest.raises(artefacto.ArtefactoInvalido, match="no soportado"):
+        artefacto.cargar(exportado)
+
+
+def test_falta_un_arreglo(exportado):
+    os.remove(os.path.join(exportado, 'kmeans_centros.npy'))
+    with pytest.raises(artefacto.ArtefactoInvalido, match="Falta"):
+        artefacto.cargar(exportado)
@@ -0,0 +1,74 @@
+import builtins
+import os
+
+import pytest
+
+import cache_compartido
+import kpis
+
+
+def test_version_modelo_solo_relee_el_pack_cuando_cambia(tmp_path, monkeypatch):
+    ruta = str(tmp_path / 'modelos.pkl')
+    with open(ruta, 'wb') as f:
+        f.write(b'a' * 1000)
+    lecturas = []
+    abrir = builtins.open
+    monkeypatch.setattr(builtins, 'open', lambda r, *a, **k: lecturas.append(r) or abrir(r, *a, **k))
+
+    version = kpis.version_modelo(ruta)
+    assert kpis.version_modelo(ruta) == version
+    assert lecturas == [ruta]
+
+    with abrir(ruta, 'wb') as f:
+        f.write(b'b' * 2000)
+    assert kpis.version_modelo(ruta) != version
+    assert len(lecturas) == 2
+    os.remove(ruta)
+    assert kpis.version_modelo(ruta) is None
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """Caché vacía con la huella de datos en una lista que el test puede cambiar."""
+    huella = ['h1']
+    monkeypatch.setattr(cache_compartido, 'CACHE', cache_compartido.CacheCompartida(2**20))
+    monkeypatch.setitem(cache_compartido._estado, 'vigente', None)
+    monkeypatch.setattr(cache_compartido, '_huella_datos', lambda: huella[0])
+    return huella
+
+
+def test_resultado_descarta_lo_de_datos_anteriores(cache):
+    pack = {'version_artefacto': 'v1'}
+    llamadas = []
+    calcular = lambda x: llamadas.append(x) or x * 2  # noqa: E731
+
+    assert cache_compartido.resultado('doble', calcular, 3, pack=pack) == 6
+    assert cache_compartido.resultado('doble', calcular, 3, pack=pack) == 6
+    assert cache_compartido.resultado('fijo', calcular, 4, pack=pack, datos=False) == 8
+    assert llamadas == [3, 4]
+
+    cache[0] = 'h2'
+    cache_compartido.resultado('doble', calcular, 3, pack=pack)
+    cache_compartido.resultado('fijo', calcular, 4, pack=pack, datos=False)
+    assert llamadas == [3, 4, 3]
+    cache_compartido.resultado('fijo', calcular, 4, pack={'version_artefacto': 'v2'}, datos=False)
+    assert llamadas == [3, 4, 3, 4]
+
+
+def test_senal_de_ingesta_descarta_solo_lo_que_depende_de_los_datos(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(cache_compartido, 'CACHE', cache_compartido.CacheCompartida(2**20))
+    monkeypatch.setattr(cache_compartido.almacen, 'huella_contenido', lambda: 'h')
+    for clave, valor in {('ventas', ('h', 'v'), ()): 1, ('grafo', (None, 'v'), ()): 2}.items():
+        cache_compartido.CACHE.obtener(clave, lambda: valor)
+    monkeypatch.setattr(cache_compartido, '_estado', {**cache_compartido._estado, 'marca_senal': None,
+                                                      'secuencia': 0, 'revisada': -float('inf')})
+
+    assert cache_compartido.senalar(['transacciones']) == 1
+    assert cache_compartido.leer_senal()['eventos'][0]['afecta'] == ['transacciones']
+    cache_compartido._huella_datos()
+    assert list(cache_compartido.CACHE._entradas) == [('grafo', (None, 'v'), ())]
+
+    cache_compartido.senalar(['grafo'])
+    cache_compartido._huella_datos()
+    assert not cache_compartido.CACHE._entradas
@@ -0,0 +1,36 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+import caracteristicas
+
+
+def _ventas():
+    return pd.DataFrame({
+        'Fecha': ['2024-03-01', '2024-03-02', '2024-03-03'],
+        'Nombre_Producto': ['Arroz', 'Leche', 'Pollo'],
+        'Categoria': ['Abarrotes', 'Lacteos', 'Carnes'],
+        'Promocion': ['Si', 'No', 'No'],
+        'Cantidad_Vendida': [3, 5, 2],
+    })
+
+
+def test_producto_desconocido_es_el_codigo_desconocido():
+    codificadores = caracteristicas.ajustar(_ventas())
+    nuevo = _ventas().assign(Nombre_Producto=['Arroz', 'Quinua', 'Pollo'], Categoria=['Abarrotes', 'Granos', 'Carnes'])
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')  # sin Pandas4Warning por valores fuera de las categorías
+        X = caracteristicas.transformar(nuevo, codificadores)
+    np.testing.assert_array_equal(X['Nombre_Producto_cod'], [0, caracteristicas.DESCONOCIDO, 2])
+    np.testing.assert_array_equal(X['Categoria_cod'], [0, caracteristicas.DESCONOCIDO, 1])
+    assert caracteristicas.desconocidos(nuevo, codificadores) == {'Nombre_Producto': ['Quinua'],
+                                                                 'Categoria': ['Granos']}
+
+
+def test_columnas_y_fechas():
+    codificadores = caracteristicas.ajustar(_ventas())
+    X = caracteristicas.transformar(_ventas(), codificadores)
+    assert list(X.columns) == codificadores['columnas']
+    assert X['dia_semana'].tolist() == [4, 5, 6] and X['es_fin_de_semana'].tolist() == [0, 1, 1]
+    assert X['Promocion'].tolist() == [1, 0, 0]
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import almacen
+import ingesta
+
+FILAS = 2_500
+
+
+@pytest.fixture(scope='module')
+def generador():
+    return ingesta._generador()
+
+
+def _dataset(generador, semilla=3, chunk=1_000):
+    return pd.concat(generador.generar_dataset(FILAS, semilla, chunk), ignore_index=True)
+
+
+def test_esquema_y_rangos(generador):
+    df = _dataset(generador)
+    assert list(df.columns) == ingesta.COLUMNAS
+    assert len(df) == FILAS
+    assert df['Fecha'].is_monotonic_increasing
+    assert df['Fecha'].min() >= pd.Timestamp('2024-01-01')
+    assert df['Fecha'].max() < pd.Timestamp('2024-01-01') + pd.Timedelta(days=generador.DIAS_RANGO)
+
+    # Cada producto pertenece a su categoría y el precio varía ±10% sobre el base
+    for categoria, productos in generador.productos_data.items():
+        assert set(df.loc[df['Categoria'] == categoria, 'Producto']) <= set(productos)
+    base = df['Producto'].astype(str).map(generador.precios_base)
+    assert ((df['Precio_Unitario'] >= (base * 0.9).round(2)) & (df['Precio_Unitario'] <= (base * 1.1).round(2))).all()
+    np.testing.assert_allclose(df['Total_Venta'], (df['Cantidad'] * df['Precio_Unitario']).round(2))
+
+    assert df['Cantidad'].between(1, 9).all()
+    assert df['Distancia_KM'].between(0.5, 15.0).all()
+    assert set(df['Nivel_Trafico']) <= set(generador.NIVELES_TRAFICO)
+    assert set(df['Llega_Tarde'].unique()) <= {0, 1}
+    assert df['ID_Cliente'].between(1001, 1100).all()
+    assert df['Edad_Cliente'].between(18, 64).all()
+    mayor = df['Edad_Cliente'] > 50
+    assert df.loc[mayor, 'Gasto_Hist_Cliente'].between(50, 150).all()
+    assert df.loc[~mayor, 'Gasto_Hist_Cliente'].between(20, 80).all()
+
+
+def test_misma_semilla_mismo_dataset(generador):
+    pd.testing.assert_frame_equal(_dataset(generador), _dataset(generador))
+    assert not _dataset(generador).equals(_dataset(generador, semilla=4))
+
+
+def test_csv_y_parquet_tienen_las_mismas_filas(generador, tmp_path):
+    ruta_csv, ruta = str(tmp_path / 'ventas.csv'), str(tmp_path / 'almacen')
+    assert generador.guardar_csv(generador.generar_dataset(FILAS, 3, 1_000), ruta_csv) == FILAS
+    assert almacen.escribir_bloques(generador.generar_dataset(FILAS, 3, 1_000), ruta) == FILAS
+
+    clave = ['Fecha', 'ID_Cliente', 'Producto', 'Precio_Unitario', 'Distancia_KM']
+    desde_csv = pd.read_csv(ruta_csv, parse_dates=['Fecha'])
+    desde_parquet = almacen.leer(ruta=ruta, ruta_csv=ruta_csv)
+    assert list(desde_parquet.columns) == ingesta.COLUMNAS
+    normalizar = lambda df: df.astype({'Fecha': 'datetime64[ns]', 'Categoria': str, 'Producto': str,  # noqa: E731
+                                       'Nivel_Trafico': str}).sort_values(clave, ignore_index=True)
+    pd.testing.assert_frame_equal(normalizar(desde_parquet), normalizar(desde_csv), check_dtype=False)
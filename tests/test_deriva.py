@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+import deriva
+
+
+@pytest.fixture
+def rutas(tmp_path):
+    return {'ruta_referencia': str(tmp_path / 'referencia.json'), 'ruta_monitor': str(tmp_path / 'monitor.json')}
+
+
+@pytest.fixture
+def referencia(pack, transacciones, rutas):
+    bloques = [transacciones.iloc[i:i + 1_000] for i in range(0, len(transacciones), 1_000)]
+    ref = deriva.crear_referencia(bloques, pack, muestra=transacciones)
+    deriva.guardar_referencia(ref, rutas['ruta_referencia'])
+    return ref
+
+
+def test_psi_y_ks():
+    a = np.array([100, 200, 300, 400])
+    assert deriva.psi(a, a * 3) == pytest.approx(0, abs=1e-4)
+    assert deriva.ks(a, a * 3) == pytest.approx(0)
+    # Toda la masa movida al último bin: KS es la masa que cambió de lado
+    assert deriva.ks([50, 50, 0, 0], [0, 0, 50, 50]) == pytest.approx(1.0)
+    assert deriva.psi([50, 50, 0, 0], [0, 0, 50, 50]) > deriva.UMBRALES_PSI[1]
+    assert [deriva.estado(v) for v in (0.05, 0.1, 0.2, 0.3)] == ['Estable', 'Vigilar', 'Vigilar', 'Deriva']
+
+
+def test_referencia_cuenta_todas_las_filas(referencia, transacciones):
+    assert referencia['filas'] == len(transacciones)
+    for nombre, variable in referencia['variables'].items():
+        assert sum(variable['conteos']) == pytest.approx(len(transacciones)), nombre
+    assert set(referencia['variables']) == set(deriva.ENTRADAS) | set(deriva.SALIDAS)
+
+
+def test_misma_distribucion_es_estable(pack, referencia, transacciones, rutas):
+    for i in range(0, 3_000, 500):
+        deriva.observar(transacciones.iloc[i:i + 500], pack, **rutas)
+    tabla = deriva.informe(**rutas)
+    assert len(tabla) == len(referencia['variables'])
+    assert deriva.resumen(tabla)['estado'] == 'Estable'
+
+
+def test_distancia_desplazada_es_deriva(pack, referencia, transacciones, rutas):
+    lote = transacciones.iloc[:2_000].assign(Distancia_KM=lambda d: d['Distancia_KM'] * 1.6)
+    deriva.observar(lote, pack, **rutas)
+    tabla = deriva.informe(**rutas)
+    assert tabla.loc['Distancia_KM', 'Estado'] == 'Deriva'
+    assert tabla.loc['Precio_Unitario', 'Estado'] == 'Estable'
+
+
+def test_nivel_nuevo_va_al_ultimo_bin_sin_romper(pack, referencia, transacciones, rutas):
+    lote = transacciones.iloc[:1_000].assign(Nivel_Trafico='Extremo')
+    monitor = deriva.observar(lote, pack, **rutas)
+    assert monitor['conteos']['Nivel_Trafico'][-1] == pytest.approx(1_000)
+    # Con un nivel que el modelo no conoce la salida de retrasos no se puntúa en ese lote
+    assert sum(monitor['conteos']['Prob_Retraso']) == 0
+    assert deriva.informe(**rutas).loc['Nivel_Trafico', 'Estado'] == 'Deriva'
+
+
+def test_memoria_fija_y_reinicio_con_referencia_nueva(pack, referencia, transacciones, rutas):
+    lote = transacciones.iloc[:1_000]
+    for _ in range(5):
+        monitor = deriva.observar(lote, pack, **rutas)
+    # Atenuación: el peso efectivo queda por debajo de las filas vistas
+    esperado = sum(1_000 * np.exp(-1_000 / deriva.MEMORIA_FILAS) ** k for k in range(5))
+    assert sum(monitor['conteos']['Precio_Unitario']) == pytest.approx(esperado)
+    assert len(monitor['conteos']['Precio_Unitario']) == len(referencia['variables']['Precio_Unitario']['conteos'])
+
+    nueva = deriva.crear_referencia([transacciones], pack)
+    deriva.guardar_referencia(nueva, rutas['ruta_referencia'])
+    assert deriva.informe(**rutas).empty
+    monitor = deriva.observar(lote, pack, **rutas)
+    assert monitor['filas'] == 1_000 and monitor['referencia'] == nueva['version']
+
+
+def test_sin_referencia_no_hace_nada(pack, transacciones, rutas):
+    assert deriva.observar(transacciones.iloc[:100], pack, **rutas) is None
+    assert deriva.resumen(deriva.informe(**rutas)) is None
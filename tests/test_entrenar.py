@@ -0,0 +1,55 @@
+import os
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.metrics import log_loss
+
+import entrenar
+import puntuar
+
+
+@pytest.fixture
+def rutas(transacciones, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # almacén por cliente y asignaciones del entrenamiento
+    ruta_csv = str(tmp_path / 'ventas.csv')
+    transacciones.to_csv(ruta_csv, index=False)
+    return {'ruta': str(tmp_path / 'sin_almacen'), 'ruta_csv': ruta_csv}
+
+
+def _perdida(pack, df):
+    return log_loss(df['Llega_Tarde'], puntuar.predecir_retraso(pack, df['Distancia_KM'], df['Nivel_Trafico']))
+
+
+def test_streaming_con_pocas_filas_ajusta_el_logistico_exacto(pack, transacciones, rutas):
+    streaming, tiempos = entrenar.entrenar_streaming(tamano_chunk=1_000, **rutas)
+    assert isinstance(streaming['modelo_logistico'], LogisticRegression)
+    assert 'Pasada 2 (logístico exacto)' in tiempos
+    assert _perdida(streaming, transacciones) == pytest.approx(_perdida(pack, transacciones), rel=1e-6)
+    np.testing.assert_allclose(streaming['modelo_lineal'].coef_, pack['modelo_lineal'].coef_)
+    assert streaming['estado_incremental']['filas'] == len(transacciones)
+    # Entrenar sin guardar no deja asignaciones ni temporales: solo el almacén por cliente y los datos
+    assert sorted(os.listdir('.')) == sorted(['clientes_market.parquet', 'ventas.csv'])
+
+
+def test_streaming_sgd_por_encima_del_umbral(pack, transacciones, rutas, monkeypatch):
+    monkeypatch.setattr(entrenar, 'FILAS_EXACTO', 0)
+    streaming, tiempos = entrenar.entrenar_streaming(tamano_chunk=1_000, **rutas)
+    assert isinstance(streaming['modelo_logistico'], SGDClassifier)
+    assert 'Pasada 2 (logístico SGD)' in tiempos
+    # Con 5.000 filas una época de SGD queda peor calibrada que el exacto: por eso el umbral
+    assert _perdida(streaming, transacciones) > _perdida(pack, transacciones)
+
+
+def test_incremental_con_logistico_exacto_reentrena(transacciones, rutas):
+    previo, _ = entrenar.entrenar_streaming(**rutas)
+    transacciones.iloc[:500].to_csv(rutas['ruta_csv'], mode='a', header=False, index=False)
+    nuevo, tiempos = entrenar.entrenar_incremental(previo, **rutas)
+    assert 'Pasada 1 (lineal y escalador)' in tiempos
+    assert nuevo['estado_incremental']['filas'] == len(transacciones) + 500
+
+
+def test_dataset_vacio(transacciones, rutas):
+    transacciones.iloc[:0].to_csv(rutas['ruta_csv'], index=False)
+    with pytest.raises(ValueError, match="no tiene filas"):
+        entrenar.entrenar_streaming(**rutas)
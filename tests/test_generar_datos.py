@@ -0,0 +1,69 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import generar_datos
+
+DESDE, HASTA = '2024-01-01', '2024-02-29'
+N_SKUS = 45  # más que el catálogo base: incluye variantes
+
+
+def _generar(tmp_path, nombre, formato='csv', semilla=5, fragmento=600):
+    salida = str(tmp_path / nombre)
+    filas = generar_datos.generar(salida, N_SKUS, DESDE, HASTA, semilla, fragmento, trabajadores=2, formato=formato)
+    return salida, filas
+
+
+def _leer(salida):
+    if os.path.isdir(salida):
+        df = pd.read_parquet(salida)
+        return df.astype({c: str for c in ['ID_Producto', 'Nombre_Producto', 'Promocion']})
+    return pd.read_csv(salida, parse_dates=['Fecha'])
+
+
+@pytest.fixture(scope='module')
+def ventas(tmp_path_factory):
+    salida, filas = _generar(tmp_path_factory.mktemp('ventas'), 'ventas.csv')
+    return _leer(salida), filas
+
+
+def test_esquema_y_rangos(ventas):
+    df, filas = ventas
+    dias = len(pd.date_range(DESDE, HASTA, freq='D'))
+    assert list(df.columns) == generar_datos.COLUMNAS
+    assert filas == len(df) == N_SKUS * dias
+    # Rejilla completa: cada SKU aparece exactamente una vez por día
+    assert df.groupby(['Fecha', 'ID_Producto']).size().eq(1).all()
+    assert df['ID_Producto'].nunique() == N_SKUS
+    assert df['Fecha'].min() == pd.Timestamp(DESDE) and df['Fecha'].max() == pd.Timestamp(HASTA)
+
+    skus = generar_datos.catalogo(N_SKUS, 5).set_index('ID_Producto')
+    por_sku = df.groupby('ID_Producto').agg(Categoria=('Categoria', 'first'), Precio=('Precio_Unitario', 'first'),
+                                            Precios=('Precio_Unitario', 'nunique'))
+    assert (por_sku['Precios'] == 1).all()
+    np.testing.assert_allclose(por_sku['Precio'], skus.loc[por_sku.index, 'Precio_Unitario'])
+    assert (por_sku['Categoria'] == skus.loc[por_sku.index, 'Categoria']).all()
+
+    assert (df['Cantidad_Vendida'] >= 5).all()
+    assert set(df['Promocion']) == {'No', 'Si'}
+    assert 0.15 < (df['Promocion'] == 'Si').mean() < 0.25
+
+
+def test_misma_semilla_misma_salida(tmp_path, ventas):
+    # Otro tamaño de fragmento cambia el reparto, así que se compara con el mismo
+    salida, _ = _generar(tmp_path, 'otra.csv')
+    pd.testing.assert_frame_equal(_leer(salida), ventas[0])
+    salida, _ = _generar(tmp_path, 'semilla.csv', semilla=6)
+    assert not _leer(salida)['Cantidad_Vendida'].equals(ventas[0]['Cantidad_Vendida'])
+    assert not os.path.exists(salida + '.tmp')
+
+
+def test_csv_y_parquet_tienen_las_mismas_filas(tmp_path, ventas):
+    salida, filas = _generar(tmp_path, 'ventas', formato='parquet')
+    assert filas == ventas[1]
+    clave = ['Fecha', 'ID_Producto']
+    desde_parquet = _leer(salida).sort_values(clave, ignore_index=True)
+    desde_csv = ventas[0].sort_values(clave, ignore_index=True)
+    pd.testing.assert_frame_equal(desde_parquet, desde_csv, check_dtype=False)
@@ -0,0 +1,55 @@
+import os
+
+import numpy as np
+import pytest
+
+import almacen
+import ingesta
+import kpis
+
+
+@pytest.fixture
+def rutas(tmp_path, monkeypatch, transacciones):
+    monkeypatch.chdir(tmp_path)  # la señal de caché se escribe junto al almacén
+    rutas = {'ruta': str(tmp_path / 'almacen'), 'ruta_csv': str(tmp_path / 'no_hay.csv'),
+             'ruta_cubo': str(tmp_path / 'cubo.pkl'), 'ruta_clientes': str(tmp_path / 'clientes.parquet'),
+             'ruta_deriva': str(tmp_path / 'monitor.json')}
+    almacen.anexar_bloques([transacciones.iloc[:3_000]], rutas['ruta'])
+    return rutas
+
+
+def _partes(ruta):
+    return sorted(os.path.join(r, f) for r, _, archivos in os.walk(ruta) for f in archivos)
+
+
+def _cubo(pack, rutas):
+    return kpis.actualizar(pack, ruta_cubo=rutas['ruta_cubo'], ruta=rutas['ruta'], ruta_csv=rutas['ruta_csv'])
+
+
+def test_ingerir_anexa_y_actualiza_el_cubo(pack, transacciones, rutas):
+    resumen = ingesta.ingerir(transacciones.iloc[3_000:3_500], pack, **rutas)
+    assert resumen['filas'] == 500
+    assert kpis.indicadores(_cubo(pack, rutas))['pedidos'] == 3_500
+
+
+@pytest.mark.parametrize('columna, valor, mensaje', [
+    ('Nivel_Trafico', 'Extremo', "tráfico desconocido"),
+    ('Nivel_Trafico', None, "vacío"),
+    ('Distancia_KM', np.nan, "Distancia_KM"),
+    ('Precio_Unitario', 'caro', "Precio_Unitario"),
+    ('Cantidad', np.inf, "Cantidad"),
+    ('Fecha', 'ayer', "Fecha"),
+])
+def test_lote_invalido_no_escribe_nada(pack, transacciones, rutas, columna, valor, mensaje):
+    _cubo(pack, rutas)
+    antes = _partes(rutas['ruta'])
+    lote = transacciones.iloc[3_000:3_100].copy()
+    lote[columna] = lote[columna].astype(object)
+    lote.iloc[5, lote.columns.get_loc(columna)] = valor
+    with pytest.raises(ValueError, match=mensaje):
+        ingesta.ingerir(lote, pack, **rutas)
+    assert _partes(rutas['ruta']) == antes
+
+    # El almacén sigue sano: el siguiente lote válido entra y el cubo se pone al día
+    ingesta.ingerir(transacciones.iloc[3_100:3_200], pack, **rutas)
+    assert kpis.indicadores(_cubo(pack, rutas))['pedidos'] == 3_100
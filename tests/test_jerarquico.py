@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+from scipy.cluster.hierarchy import linkage
+
+import jerarquico
+
+
+def test_ward_sin_pesos_igual_a_scipy():
+    X = np.random.default_rng(0).normal(size=(40, 2))
+    Z, pesos_nodo = jerarquico.ward_ponderado(X, np.ones(len(X)))
+    np.testing.assert_allclose(Z, linkage(X, method='ward'))
+    assert pesos_nodo[-1] == len(X)
+
+
+def test_ward_ponderado_igual_a_scipy_con_puntos_repetidos():
+    rng = np.random.default_rng(1)
+    centros = rng.normal(size=(25, 2)) * 3
+    pesos = rng.integers(1, 6, len(centros))
+    Z, pesos_nodo = jerarquico.ward_ponderado(centros, pesos)
+
+    # Un punto de peso w equivale a w puntos repetidos: scipy los une primero a distancia 0
+    completo = linkage(np.repeat(centros, pesos, axis=0), method='ward')
+    fusiones = completo[completo[:, 2] > 1e-9]
+    np.testing.assert_allclose(np.sort(Z[:, 2]), np.sort(fusiones[:, 2]))
+    assert pesos_nodo[-1] == pesos.sum()
+    assert Z[-1, 3] == len(centros)
+
+
+@pytest.mark.parametrize('m', [0, 1])
+def test_ward_con_menos_de_dos_puntos(m):
+    Z, pesos_nodo = jerarquico.ward_ponderado(np.zeros((m, 2)), np.ones(m))
+    assert Z.shape == (0, 4) and len(pesos_nodo) == m
@@ -0,0 +1,38 @@
+import pandas as pd
+import pytest
+
+import almacen
+import kpis
+import puntuar
+
+
+def test_aciertos_del_cubo(pack, transacciones):
+    cubo = kpis.agregar(transacciones, pack)
+    prob = puntuar.predecir_retraso(pack, transacciones['Distancia_KM'], transacciones['Nivel_Trafico'])
+    assert cubo['logistica']['Aciertos'].sum() == ((prob > 0.5) == transacciones['Llega_Tarde']).sum()
+    assert cubo['logistica']['Pedidos'].sum() == len(transacciones)
+    assert cubo['ventas']['Total_Venta'].sum() == pytest.approx(transacciones['Total_Venta'].sum())
+
+
+def test_nivel_desconocido_no_bloquea_el_cubo(pack, transacciones):
+    lote = transacciones.iloc[:200].assign(Nivel_Trafico=lambda d: d['Nivel_Trafico'].astype(str))
+    lote.loc[lote.index[:50], 'Nivel_Trafico'] = 'Extremo'
+    logistica = kpis.agregar(lote, pack)['logistica'].set_index('Nivel_Trafico')
+    assert logistica.loc['Extremo', 'Aciertos'].sum() == 0
+    assert logistica.loc['Extremo', 'Pedidos'].sum() == 50
+    conocidos = kpis.agregar(lote.iloc[50:], pack)['logistica']
+    assert logistica.drop('Extremo')['Aciertos'].sum() == conocidos['Aciertos'].sum()
+
+
+def test_actualizar_incremental_igual_a_reconstruir(pack, transacciones, tmp_path):
+    rutas = {'ruta': str(tmp_path / 'almacen'), 'ruta_csv': str(tmp_path / 'no_hay.csv'),
+             'ruta_modelos': str(tmp_path / 'no_hay.pkl')}
+    almacen.anexar_bloques([transacciones.iloc[:3_000]], rutas['ruta'])
+    kpis.actualizar(pack, ruta_cubo=str(tmp_path / 'cubo.pkl'), **rutas)
+    almacen.anexar_bloques([transacciones.iloc[3_000:]], rutas['ruta'])
+    incremental = kpis.actualizar(pack, ruta_cubo=str(tmp_path / 'cubo.pkl'), **rutas)
+    completo = kpis.actualizar(pack, ruta_cubo=str(tmp_path / 'otro.pkl'), **rutas)
+    for tabla, claves in (('ventas', kpis.CLAVES_VENTAS), ('logistica', kpis.CLAVES_LOGISTICA)):
+        pd.testing.assert_frame_equal(incremental[tabla].sort_values(claves, ignore_index=True),
+                                      completo[tabla].sort_values(claves, ignore_index=True), check_dtype=False)
+    assert kpis.indicadores(incremental)['pedidos'] == len(transacciones)
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import cache_compartido
+import puntuar
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """Caché compartida vacía con una huella de datos fija."""
+    monkeypatch.setattr(cache_compartido, 'CACHE', cache_compartido.CacheCompartida(2**24))
+    monkeypatch.setitem(cache_compartido._estado, 'vigente', None)
+    monkeypatch.setattr(cache_compartido, '_huella_datos', lambda: 'h')
+    return cache_compartido.CACHE
+
+
+def _rangos():
+    return pd.DataFrame({'Precio_Min': [1.0, 4.0], 'Precio_Max': [10.0, 30.0]},
+                        index=pd.Index(['Carnes', 'Frutas'], name='Categoria'))
+
+
+def test_barrido_monotono_y_precio_optimo(pack_artefacto):
+    curvas = puntuar.barrido_precios(pack_artefacto, _rangos(), puntos=50)
+    pendiente = np.sign(pack_artefacto['modelo_lineal'].coef_[0])
+    for categoria, curva in curvas.groupby('Categoria'):
+        assert len(curva) == 50 and np.all(np.diff(curva['Precio']) > 0)
+        # Demanda lineal en el precio (recortada a cero): monótona en el sentido de la pendiente
+        assert np.all(pendiente * np.diff(curva['Demanda']) >= 0)
+        np.testing.assert_allclose(curva['Demanda'],
+                                   np.clip(puntuar.predecir_demanda(pack_artefacto, curva['Precio']), 0, None))
+        optimo = puntuar.precio_optimo(curvas).loc[categoria]
+        assert optimo['Ingreso'] == curva['Ingreso'].max()
+        assert optimo['Precio'] == curva['Precio'].iloc[curva['Ingreso'].argmax()]
+
+
+def test_barrido_cambia_de_clave_con_el_modelo(pack_artefacto, cache):
+    calcular = lambda n: puntuar.barrido_precios(pack_artefacto, _rangos(), n)  # noqa: E731
+    v1, v2 = {**pack_artefacto, 'version_artefacto': 'v1'}, {**pack_artefacto, 'version_artefacto': 'v2'}
+    cache_compartido.resultado('barrido_precios', calcular, 20, pack=v1)
+    claves = set(cache._entradas)
+    cache_compartido.resultado('barrido_precios', calcular, 20, pack=v1)
+    assert set(cache._entradas) == claves and cache.aciertos == 1
+    cache_compartido.resultado('barrido_precios', calcular, 20, pack=v2)
+    assert [clave[1][1] for clave in cache._entradas] == ['v2']
+
+
+@pytest.fixture
+def rejilla(pack):
+    return puntuar.rejilla_riesgo(pack, np.round(np.arange(0.5, 20.0 + 0.005, 0.01), 6))
+
+
+def test_rejilla_igual_a_predecir_por_celda(pack, rejilla):
+    assert list(rejilla.index) == list(pack['le_trafico'].classes_)
+    for nivel in rejilla.index:
+        np.testing.assert_allclose(rejilla.loc[nivel],
+                                   puntuar.predecir_retraso(pack, rejilla.columns, [nivel] * rejilla.shape[1]))
+
+
+def test_consultar_riesgo_usa_la_distancia_mas_cercana(pack, rejilla):
+    distancias = rejilla.columns.to_numpy()
+    rng = np.random.default_rng(0)
+    for distancia, nivel in zip(rng.uniform(0, 25, 200), rng.choice(rejilla.index, 200)):
+        cercana = distancias[np.abs(distancias - distancia).argmin()]
+        directa = puntuar.predecir_retraso(pack, [cercana], [nivel])[0]
+        assert puntuar.consultar_riesgo(rejilla, distancia, nivel) == pytest.approx(directa)
+
+
+def test_rejilla_cambia_de_clave_con_el_modelo(pack, cache):
+    calcular = lambda *d: puntuar.rejilla_riesgo(pack, np.arange(*d))  # noqa: E731
+    for version in ('v1', 'v1', 'v2'):
+        cache_compartido.resultado('mapa_riesgo', calcular, 0.5, 20.0, 0.5,
+                                   pack={**pack, 'version_artefacto': version}, datos=False)
+    assert cache.fallos == 2 and cache.aciertos == 1
+    assert [clave[1] for clave in cache._entradas] == [(None, 'v2')]
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import puntuar
+import rutas
+
+
+@pytest.fixture
+def plan(pack):
+    plan = rutas.simular_plan(50, np.random.default_rng(0), pack['le_trafico'].classes_)
+    plan['ID_Ruta'] = 'R' + plan['ID_Ruta'].astype(str)
+    return plan.sample(frac=1, random_state=1)  # filas desordenadas: el orden lo da 'Orden'
+
+
+def test_igual_que_ruta_a_ruta(pack, plan):
+    paradas, resumen = rutas.puntuar_rutas(pack, plan)
+    assert len(paradas) == len(plan) and len(resumen) == plan['ID_Ruta'].nunique()
+    for id_ruta, g in plan.groupby('ID_Ruta'):
+        g = g.sort_values('Orden')
+        p = puntuar.predecir_retraso(pack, g['Distancia_Tramo_KM'].cumsum(), g['Nivel_Trafico'])
+        fila = resumen.loc[id_ruta]
+        assert fila['Prob_Algun_Retraso'] == pytest.approx(1 - np.prod(1 - p), abs=1e-10)
+        assert fila['Retrasos_Esperados'] == pytest.approx(p.sum())
+        assert fila['Distancia_KM'] == pytest.approx(g['Distancia_Tramo_KM'].sum())
+        assert fila['Parada_Critica'] == g['Orden'].to_numpy()[np.argmax(p)]
+
+
+def test_sin_orden_usa_el_orden_de_las_filas(pack, plan):
+    ordenado = plan.sort_values(['ID_Ruta', 'Orden'])
+    _, con_orden = rutas.puntuar_rutas(pack, ordenado)
+    _, sin_orden = rutas.puntuar_rutas(pack, ordenado.drop(columns='Orden'))
+    pd.testing.assert_frame_equal(con_orden, sin_orden)
+
+
+@pytest.mark.parametrize('modificar, mensaje', [
+    (lambda p: p.drop(columns=['ID_Ruta', 'Orden']), 'Faltan columnas'),
+    (lambda p: p.drop(columns=['Distancia_Tramo_KM']), 'Faltan columnas'),
+    (lambda p: p.assign(Distancia_Tramo_KM=p['Distancia_Tramo_KM'].astype(object).where(p.index != p.index[3], 'dos')),
+     'numérica y finita'),
+    (lambda p: p.assign(Distancia_Tramo_KM=p['Distancia_Tramo_KM'].where(p.index != p.index[0], np.inf)),
+     'numérica y finita'),
+    (lambda p: p.assign(Orden=p['Orden'].astype(float).where(p.index != p.index[0], np.nan)), 'numérica y finita'),
+    (lambda p: p.assign(Distancia_Tramo_KM=-p['Distancia_Tramo_KM']), 'negativa'),
+    (lambda p: p.iloc[:0], 'no tiene paradas'),
+])
+def test_plan_invalido_es_value_error(pack, plan, modificar, mensaje):
+    with pytest.raises(ValueError, match=mensaje):
+        rutas.puntuar_rutas(pack, modificar(plan))
+
+
+def test_nivel_de_trafico_desconocido(pack, plan):
+    with pytest.raises(ValueError, match='tráfico desconocido'):
+        rutas.puntuar_rutas(pack, plan.assign(Nivel_Trafico='Extremo'))
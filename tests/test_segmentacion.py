@@ -0,0 +1,53 @@
+import os
+
+import joblib
+import pytest
+
+import clientes
+import entrenar
+import segmentacion
+
+
+@pytest.fixture
+def perfiles(transacciones):
+    return clientes.perfiles(clientes.combinar([clientes.agregar(transacciones)]))
+
+
+def _pack_segmentado(perfiles, ruta):
+    pack, _ = entrenar.entrenar_kmeans(perfiles[segmentacion.COLUMNAS_CLUSTER])
+    return segmentacion.agregar_al_pack(pack, perfiles, pack['modelo_kmeans'], pack['scaler_kmeans'], ruta)
+
+
+def test_asignaciones_se_publican_despues_del_pack(perfiles, tmp_path):
+    ruta = str(tmp_path / 'clusters')
+    pack = _pack_segmentado(perfiles, ruta)
+    assert os.listdir(tmp_path) == []  # construir el pack no toca el disco
+
+    entrenar.guardar_pack(pack, str(tmp_path / 'modelos.pkl'))
+    assert 'asignaciones_pendientes' not in pack
+    assert 'asignaciones_pendientes' not in joblib.load(tmp_path / 'modelos.pkl')
+    asig = segmentacion.cargar_asignaciones(ruta)
+    assert len(asig) == len(perfiles)
+    assert sorted(os.listdir(tmp_path)) == ['clusters', 'modelos.pkl']
+
+
+def test_pack_sin_guardar_no_toca_las_asignaciones_vigentes(perfiles, tmp_path, monkeypatch):
+    ruta = str(tmp_path / 'clusters')
+    entrenar.guardar_pack(_pack_segmentado(perfiles, ruta), str(tmp_path / 'modelos.pkl'))
+    vigentes = os.listdir(ruta)
+
+    pack = _pack_segmentado(perfiles.iloc[:10], ruta)
+
+    def fallar(*args):
+        raise OSError("disco lleno")
+    monkeypatch.setattr(joblib, 'dump', fallar)
+    with pytest.raises(OSError):
+        entrenar.guardar_pack(pack, str(tmp_path / 'modelos.pkl'))
+    assert os.listdir(ruta) == vigentes
+    assert len(segmentacion.cargar_asignaciones(ruta)) == len(perfiles)
+    assert sorted(os.listdir(tmp_path)) == ['clusters', 'modelos.pkl']
+
+    # El pack conserva sus asignaciones: se puede volver a guardar
+    monkeypatch.undo()
+    entrenar.guardar_pack(pack, str(tmp_path / 'modelos.pkl'))
+    assert len(segmentacion.cargar_asignaciones(ruta)) == 10
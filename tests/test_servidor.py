@@ -0,0 +1,101 @@
+import http.client
+import json
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+import servidor
+
+
+@pytest.fixture(params=['sklearn', 'artefacto'])
+def url(request, pack, pack_artefacto):
+    # Ventana larga: las peticiones concurrentes caen en el mismo micro-lote
+    modelos = pack if request.param == 'sklearn' else pack_artefacto
+    srv = servidor.crear_servidor(modelos, puerto=0, ventana_ms=200)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{srv.server_address[1]}'
+    srv.shutdown()
+    srv.server_close()
+
+
+def _post(url, endpoint, cuerpo):
+    datos = cuerpo if isinstance(cuerpo, bytes) else json.dumps(cuerpo).encode('utf-8')
+    req = urllib.request.Request(f'{url}/{endpoint}', data=datos, headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(req) as r:
+            return r.status, json.loads(r.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_peticion_sin_campo_da_400_sola(url):
+    codigo, cuerpo = _post(url, 'retraso', {'Nivel_Trafico': 'Alto'})
+    assert codigo == 400
+    assert 'Distancia_KM' in cuerpo['error']
+
+
+def test_peticion_sin_campo_da_400_en_lote(url):
+    cuerpos = [{'Distancia_KM': 5.0, 'Nivel_Trafico': 'Alto'}, {'Nivel_Trafico': 'Alto'},
+               {'Distancia_KM': 12.0, 'Nivel_Trafico': 'Bajo'}]
+    with ThreadPoolExecutor(len(cuerpos)) as pool:
+        respuestas = list(pool.map(lambda c: _post(url, 'retraso', c), cuerpos))
+    assert [codigo for codigo, _ in respuestas] == [200, 400, 200]
+    for codigo, cuerpo in respuestas[::2]:
+        assert np.isfinite(cuerpo['resultado'])
+
+
+@pytest.mark.parametrize('cuerpo', [
+    {'Distancia_KM': 'cinco', 'Nivel_Trafico': 'Alto'},
+    {'Distancia_KM': True, 'Nivel_Trafico': 'Alto'},
+    {'Distancia_KM': 5.0, 'Nivel_Trafico': 3},
+    [],
+    b'{"Distancia_KM": NaN, "Nivel_Trafico": "Alto"}',
+    pytest.param(b'{"Distancia_KM": 1' + b'0' * 400 + b', "Nivel_Trafico": "Alto"}', id='entero-que-desborda'),
+])
+def test_tipos_invalidos_dan_400(url, cuerpo):
+    codigo, _ = _post(url, 'retraso', cuerpo)
+    assert codigo == 400
+
+
+def test_lista_y_nivel_desconocido(url):
+    codigo, cuerpo = _post(url, 'segmento', [{'Edad_Cliente': 30, 'Gasto_Hist_Cliente': 50.0},
+                                             {'Edad_Cliente': 60, 'Gasto_Hist_Cliente': 120.0}])
+    assert codigo == 200 and len(cuerpo['resultado']) == 2
+    codigo, _ = _post(url, 'retraso', {'Distancia_KM': 5.0, 'Nivel_Trafico': 'Extremo'})
+    assert codigo == 400
+
+
+def test_resultado_no_finito_da_400():
+    lotes = servidor.MicroLotes(lambda df: np.where(df['x'] > 0, df['x'], np.nan), ventana_ms=50)
+    buena, mala = lotes.enviar([{'x': 1.0}]), lotes.enviar([{'x': -1.0}])
+    assert buena.result(timeout=5) == [1.0]
+    with pytest.raises(ValueError):
+        mala.result(timeout=5)
+
+
+def _post_crudo(url, longitud):
+    """POST con un Content-Length arbitrario (None = sin la cabecera)."""
+    direccion = urllib.parse.urlsplit(url)
+    conexion = http.client.HTTPConnection(direccion.hostname, direccion.port, timeout=5)
+    cuerpo = b'{"Distancia_KM": 5.0, "Nivel_Trafico": "Alto"}'
+    conexion.putrequest('POST', '/retraso', skip_accept_encoding=True)
+    if longitud is not None:
+        conexion.putheader('Content-Length', longitud)
+    conexion.endheaders(cuerpo)
+    respuesta = conexion.getresponse()
+    resultado = respuesta.status, json.loads(respuesta.read())
+    conexion.close()
+    return resultado
+
+
+@pytest.mark.parametrize('longitud', [None, 'cuarenta', '-5'])
+def test_content_length_invalido_da_400(url, longitud):
+    codigo, cuerpo = _post_crudo(url, longitud)
+    assert codigo == 400 and 'Content-Length' in cuerpo['error']
+    # El servidor sigue atendiendo
+    assert _post_crudo(url, '46')[0] == 200
@@ -0,0 +1,17 @@
+import arranque
+
+# --- VISTAS DE LA APP ---
+# Cada página vive en su propio módulo y se importa la primera vez que se navega a
+# ella: plotly, scipy o matplotlib solo se cargan cuando alguna vista los necesita.
+
+PAGINAS = {
+    "🏠 Dashboard Ejecutivo": 'vistas.dashboard',
+    "📈 Predicción de Ventas": 'vistas.ventas',
+    "🚚 Monitor de Riesgos": 'vistas.riesgos',
+    "👥 Segmentación Clientes": 'vistas.clientes',
+    "🧬 Análisis Estructural": 'vistas.estructural',
+}
+
+
+def mostrar(pagina, pack):
+    arranque.importar(PAGINAS[pagina]).mostrar(pack)
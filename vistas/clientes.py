@@ -0,0 +1,81 @@
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+import almacen
+import clientes
+import puntuar
+from vistas.comun import actualizar_clientes, agregar_clusters
+
+# === VISTA 3: K-MEANS (SCATTER 3D O COLOR) ===
+
+
+def mostrar(pack):
+    """Simulador de segmento y mapa de clusters precalculados."""
+    st.title("👥 Clustering de Clientes")
+    st.markdown("Segmentación automática basada en comportamiento.")
+
+    tab1, tab2 = st.tabs(["🧩 Simulador de Perfil", "🗺️ Mapa de Clusters"])
+
+    with tab1:
+        c1, c2 = st.columns(2)
+        with c1:
+            modo = st.radio("Perfil", ["Cliente existente", "Perfil manual"], horizontal=True)
+            perfil = None
+            if modo == "Cliente existente":
+                # Una sola fila del almacén por cliente (clientes.py), leída por su ID
+                n_clientes = actualizar_clientes(almacen.version_datos())
+                id_cliente = st.number_input(f"ID de cliente ({n_clientes:,} registrados)", min_value=0, value=1001, step=1)
+                perfil = clientes.buscar(id_cliente)
+                if perfil is None:
+                    st.warning("No hay transacciones de ese cliente.")
+                else:
+                    edad, gasto = perfil['Edad_Cliente'], perfil['Gasto_Hist_Cliente']
+            else:
+                edad = st.number_input("Edad", 18, 90, 30)
+                gasto = st.number_input("Gasto (S/.)", 0.0, 500.0, 50.0)
+
+            if st.button("Clasificar Cliente", disabled=modo == "Cliente existente" and perfil is None):
+                grupo = puntuar.asignar_segmento(pack, [edad], [gasto])[0]
+
+                st.balloons() # Efecto visual divertido
+                st.metric("Segmento Asignado", f"Grupo {grupo}")
+
+                if grupo == 0: st.info("🎯 **Estrategia:** Descuentos masivos.")
+                elif grupo == 1: st.warning("🎯 **Estrategia:** Fidelización.")
+                else: st.success("💎 **Estrategia:** Atención VIP.")
+
+        if perfil is not None:
+            with c2:
+                m1, m2, m3 = st.columns(3)
+                m1.metric("Recencia", f"{perfil['Recencia_Dias']:.0f} días")
+                m2.metric("Pedidos", f"{perfil['Frecuencia']:,.0f}")
+                m3.metric("Monto Total", f"S/. {perfil['Monto_Total']:,.2f}")
+                m1.metric("Ticket Medio", f"S/. {perfil['Ticket_Medio']:,.2f}")
+                m2.metric("Distancia Media", f"{perfil['Distancia_Media']:.1f} km")
+                m3.metric("Edad / Gasto", f"{edad:.0f} / {gasto:.0f}")
+                mezcla = perfil.filter(like=clientes.PREFIJO_MEZCLA)
+                mezcla.index = mezcla.index.str.removeprefix(clientes.PREFIJO_MEZCLA)
+                st.plotly_chart(px.bar(x=mezcla.index, y=mezcla.to_numpy(), labels={'x': 'Categoría', 'y': 'Proporción'},
+                                       title="Mezcla de categorías", template="plotly_white"),
+                                use_container_width=True)
+
+    with tab2:
+        # Gráfico Interactivo de Clusters: un punto por celda y cluster, con tamaño según el conteo
+        df = agregar_clusters(pack)
+        df = df.assign(Cluster=df['Cluster'].astype(str)) # Para que Plotly lo tome como categoría
+
+        fig_cluster = px.scatter(df, x="Edad_Cliente", y="Gasto_Hist_Cliente", color="Cluster",
+                                 size="Conteo", hover_data=["Conteo"],
+                                 title="Mapa Interactivo de Clientes",
+                                 symbol="Cluster", size_max=10,
+                                 template="plotly_white")
+        if 'centroides_kmeans' in pack:
+            centros = pack['centroides_kmeans']
+            fig_cluster.add_trace(go.Scatter(x=centros['Edad_Cliente'], y=centros['Gasto_Hist_Cliente'],
+                                             mode='markers', name='Centroides',
+                                             marker=dict(symbol='x', size=16, color='black')))
+        st.plotly_chart(fig_cluster, use_container_width=True)
+
+        if 'resumen_clusters' in pack:
+            st.dataframe(pack['resumen_clusters'], hide_index=True, use_container_width=True)
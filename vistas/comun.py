@@ -0,0 +1,91 @@
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import almacen
+import cache_compartido
+import clientes
+import graficos
+import kpis
+import puntuar
+import segmentacion
+
+# --- CARGAS COMPARTIDAS ENTRE VISTAS ---
+# Los resultados derivados (cubo, histogramas, mapa de clusters) viven en cache_compartido.py: una
+# sola copia para todas las sesiones, por contenido del dataset y versión del modelo.
+
+
+# Cubo de KPIs; se actualiza (solo lo nuevo) cuando cambian datos o modelos
+def cargar_cubo(pack):
+    return cache_compartido.resultado('cubo', lambda: kpis.actualizar(pack), pack=pack)
+
+
+# Gráficos agregados en el servidor (conteos por celda), una vez por versión del dataset
+def agregar_histograma(pack, x, por=None):
+    return cache_compartido.resultado('histograma', lambda *a: graficos.histograma(almacen.leer_bloques, *a),
+                                      x, por, pack=pack)
+
+
+def agregar_histograma_2d(pack, x, y, por=None):
+    return cache_compartido.resultado('histograma_2d', lambda *a: graficos.histograma_2d(almacen.leer_bloques, *a),
+                                      x, y, por, pack=pack)
+
+
+# Barrido de precios: rango observado de cada categoría (y del catálogo) puntuado en una sola predicción
+TODO_EL_CATALOGO = 'Todo el catálogo'
+
+
+def _rangos_precio():
+    partes = [b.groupby('Categoria', observed=True)['Precio_Unitario'].agg(['min', 'max'])
+              for b in almacen.leer_bloques(['Categoria', 'Precio_Unitario']) if len(b)]
+    rangos = pd.concat(partes).groupby(level=0).agg({'min': 'min', 'max': 'max'})
+    rangos.loc[TODO_EL_CATALOGO] = [rangos['min'].min(), rangos['max'].max()]
+    rangos.index.name = 'Categoria'
+    return rangos.rename(columns={'min': 'Precio_Min', 'max': 'Precio_Max'})
+
+
+def barrer_precios(pack, puntos):
+    return cache_compartido.resultado('barrido_precios', lambda n: puntuar.barrido_precios(pack, _rangos_precio(), n),
+                                      puntos, pack=pack)
+
+
+# Superficie de riesgo: toda la rejilla distancia x tráfico en una predicción, por versión del modelo
+DISTANCIAS_RIESGO = (0.5, 20.0, 0.01)  # desde, hasta y paso en km
+NIVELES_TRAFICO = ["Bajo", "Medio", "Alto"]
+
+
+def mapa_riesgo(pack):
+    def calcular(desde, hasta, paso):
+        distancias = np.round(np.arange(desde, hasta + paso / 2, paso), 6)
+        conocidos = list(pack['le_trafico'].classes_)
+        niveles = [n for n in NIVELES_TRAFICO if n in conocidos] + [n for n in conocidos if n not in NIVELES_TRAFICO]
+        return puntuar.rejilla_riesgo(pack, distancias, niveles)
+    return cache_compartido.resultado('mapa_riesgo', calcular, *DISTANCIAS_RIESGO, pack=pack, datos=False)
+
+
+# Almacén por cliente al día con el dataset (solo agrega las transacciones nuevas); devuelve cuántos hay
+@st.cache_resource(max_entries=1)
+def actualizar_clientes(version_datos):
+    return len(clientes.actualizar())
+
+
+# Mapa de clusters desde las etiquetas del entrenamiento (solo lectura), agregado por celdas
+def _agregar_clusters(pack):
+    if os.path.isdir(segmentacion.RUTA_ASIGNACIONES):
+        leer = segmentacion.leer_asignaciones
+    else:
+        # Pack antiguo sin asignaciones: se puntúa cada cliente con predict, sin re-entrenar el modelo compartido
+        def leer(columnas):
+            perfiles = clientes.perfiles(clientes.actualizar())
+            X = pack['scaler_kmeans'].transform(perfiles[segmentacion.COLUMNAS_CLUSTER])
+            yield perfiles.assign(Cluster=pack['modelo_kmeans'].predict(X))[list(columnas)]
+    return graficos.histograma_2d(leer, 'Edad_Cliente', 'Gasto_Hist_Cliente', por='Cluster')
+
+
+def agregar_clusters(pack):
+    # Las etiquetas del entrenamiento no cambian al llegar transacciones; solo el respaldo las lee
+    version_asignaciones = almacen.version_datos(segmentacion.RUTA_ASIGNACIONES)
+    return cache_compartido.resultado('clusters', lambda _: _agregar_clusters(pack), version_asignaciones, pack=pack,
+                                      datos=not os.path.isdir(segmentacion.RUTA_ASIGNACIONES))
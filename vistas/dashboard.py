@@ -0,0 +1,93 @@
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+import deriva
+import kpis
+from vistas.comun import cargar_cubo
+
+# === PÁGINA DE INICIO: DASHBOARD EJECUTIVO ===
+
+REFRESCO_SEGUNDOS = 30
+COLORES_DERIVA = {'Estable': 'green', 'Vigilar': 'orange', 'Deriva': 'red'}
+
+
+def mostrar(pack):
+    """Dashboard Ejecutivo: KPIs y gráficos desde el cubo pre-agregado."""
+    st.title("📊 Tablero de Control Estratégico")
+    st.markdown("Visión general del rendimiento operativo y predicciones de IA.")
+
+    # En vivo: solo este bloque se vuelve a ejecutar cada REFRESCO_SEGUNDOS; el cubo ya lo puso al día ingesta.py
+    en_vivo = st.toggle(f"🔴 En vivo (refresca cada {REFRESCO_SEGUNDOS} s)")
+
+    @st.fragment(run_every=REFRESCO_SEGUNDOS if en_vivo else None)
+    def tablero():
+        _tablero(pack, en_vivo)
+
+    tablero()
+
+
+def _tablero(pack, en_vivo):
+    """KPIs y gráficos del periodo (en vivo, el fragmento que se refresca solo)."""
+    cubo = cargar_cubo(pack)
+    fecha_min, fecha_max = kpis.rango_fechas(cubo)
+    rango = st.date_input("📅 Periodo", (fecha_min, fecha_max), min_value=fecha_min, max_value=fecha_max)
+    desde, hasta = rango if len(rango) == 2 else (rango[0], rango[0])
+    if en_vivo:
+        # El periodo sigue a los pedidos que van llegando
+        hasta = fecha_max
+        st.caption(f"Actualizado a las {pd.Timestamp.now():%H:%M:%S} · datos hasta {fecha_max:%Y-%m-%d}")
+    periodo = kpis.filtrar(cubo, desde, hasta)
+    # Periodo anterior de la misma duración, para las variaciones de cada KPI
+    duracion = pd.Timestamp(hasta) - pd.Timestamp(desde) + pd.Timedelta(days=1)
+    anterior = kpis.indicadores(kpis.filtrar(cubo, pd.Timestamp(desde) - duracion, pd.Timestamp(desde) - pd.Timedelta(days=1)))
+    actual = kpis.indicadores(periodo)
+
+    def variacion(clave, puntos=False):
+        if not anterior['pedidos'] or actual[clave] is None or not anterior[clave]:
+            return None
+        if puntos:
+            return f"{(actual[clave] - anterior[clave]) * 100:+.1f} pts"
+        return f"{(actual[clave] / anterior[clave] - 1):+.1%}"
+
+    def porcentaje(valor):
+        return f"{valor:.1%}" if valor is not None else "—"
+
+    # Fila de métricas clave (KPIs)
+    kpi1, kpi2, kpi3, kpi4, kpi5 = st.columns(5)
+    kpi1.metric("Ingresos del Periodo", f"S/. {actual['ingresos']:,.0f}", variacion('ingresos'))
+    kpi2.metric("Pedidos Procesados", f"{actual['pedidos']:,}", variacion('pedidos'))
+    kpi3.metric("Tasa de Puntualidad", porcentaje(actual['puntualidad']), variacion('puntualidad', puntos=True))
+    kpi4.metric("Precisión Modelos", porcentaje(actual['precision']), variacion('precision', puntos=True))
+
+    # Deriva: pedidos ingeridos contra la referencia del entrenamiento (dos JSON pequeños, sin leer el dataset)
+    tabla_deriva = deriva.informe()
+    peor = deriva.resumen(tabla_deriva)
+    ayuda = (f"PSI máximo entre entradas y salidas de los modelos, últimos ~{deriva.MEMORIA_FILAS:,} "
+             f"pedidos ingeridos contra los datos de entrenamiento (≥ {deriva.UMBRALES_PSI[0]} vigilar, "
+             f"≥ {deriva.UMBRALES_PSI[1]} deriva).")
+    if peor is None:
+        kpi5.metric("Deriva de Datos", "—", "Sin datos en vivo", delta_color='gray', delta_arrow='off', help=ayuda)
+    else:
+        kpi5.metric("Deriva de Datos", f"PSI {peor['psi']:.2f}", f"{peor['estado']} · {peor['variable']}",
+                    delta_color=COLORES_DERIVA[peor['estado']], delta_arrow='off', help=ayuda)
+        with st.expander("🧭 Deriva por variable"):
+            st.dataframe(tabla_deriva.round({'Filas': 0, 'PSI': 3, 'KS': 3}), use_container_width=True)
+
+    st.markdown("---")
+
+    # Gráficos interactivos de resumen (desde el cubo pre-agregado)
+    c1, c2 = st.columns(2)
+    with c1:
+        st.subheader("📈 Tendencia de Ventas (Histórico)")
+        ventas_mes = kpis.ventas_mensuales(periodo, por='Categoria')
+        fig_ventas = px.bar(ventas_mes, x='Mes', y='Total_Venta', color='Categoria',
+                            template='plotly_white', color_discrete_sequence=px.colors.sequential.Reds_r)
+        st.plotly_chart(fig_ventas, use_container_width=True)
+
+    with c2:
+        st.subheader("🚚 Distribución de Tráfico")
+        fig_pie = px.pie(kpis.distribucion_trafico(periodo), names='Nivel_Trafico', values='Pedidos',
+                         title='Condiciones de Ruta',
+                         color_discrete_sequence=px.colors.sequential.RdBu, hole=0.4)
+        st.plotly_chart(fig_pie, use_container_width=True)
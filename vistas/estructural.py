@@ -0,0 +1,58 @@
+import matplotlib.pyplot as plt
+import streamlit as st
+from scipy.cluster.hierarchy import dendrogram
+
+import cache_compartido
+import jerarquico
+
+# === VISTA 4: JERÁRQUICO (ESTÁTICO PERO BONITO) ===
+
+
+# El árbol se construye una vez por contenido del dataset, compartido entre sesiones; una
+# señal de ingesta lo descarta como al resto de resultados que dependen de las transacciones
+def cargar_arbol(pack):
+    return cache_compartido.resultado('arbol', jerarquico.construir, pack=pack)
+
+
+def mostrar(pack):
+    """Dendrograma jerárquico de todos los clientes (scipy y matplotlib solo se importan con esta vista)."""
+    st.title("🧬 Dendrograma Jerárquico")
+    st.markdown("Visualización de la estructura de datos.")
+
+    with st.expander("ℹ️ ¿Cómo leer este gráfico?", expanded=True):
+        st.write("Este gráfico muestra cómo se agrupan los clientes paso a paso. Las líneas verticales indican la distancia (diferencia) entre grupos. "
+                 "Cada hoja es un conjunto de clientes parecidos; el número bajo ella indica cuántos clientes contiene.")
+
+    with st.spinner('Construyendo el árbol de clientes...'):
+        arbol = cargar_arbol(pack)
+    m = len(arbol['centros'])
+    st.caption(f"{arbol['clientes']:,} clientes únicos ({arbol['transacciones']:,} transacciones) "
+               f"resumidos en {m:,} micro-clusters.")
+    if m < 2:
+        st.info("Hacen falta al menos dos clientes distintos para construir el árbol.")
+        return
+
+    c1, c2 = st.columns(2)
+    hojas = c1.slider("Hojas visibles", 2, max(3, min(100, m)), min(30, m))
+    n_grupos = c2.slider("Grupos (corte del árbol)", 2, max(3, min(10, m)), min(3, m))
+
+    Z, pesos_nodo = arbol['linkage'], arbol['pesos_nodo']
+    # Umbral entre la fusión que deja n_grupos y la siguiente: colorea cada grupo del corte
+    umbral = Z[-(n_grupos - 1), 2] if n_grupos <= m else 0
+
+    fig, ax = plt.subplots(figsize=(12, 6))
+    dendrogram(Z, ax=ax, truncate_mode='lastp', p=hojas, color_threshold=umbral,
+               leaf_label_func=lambda nodo: f"{int(pesos_nodo[nodo]):,}",
+               leaf_rotation=90, leaf_font_size=8)
+    plt.title("Dendrograma de Clientes", fontsize=15)
+    plt.xlabel("Clientes por hoja")
+    plt.ylabel("Distancia de Ward (variables estandarizadas)")
+    # Quitar bordes feos del gráfico matplotlib
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    st.pyplot(fig)
+    plt.close(fig)
+
+    st.dataframe(jerarquico.grupos(arbol, n_grupos).rename(columns={
+        'Edad_Cliente': 'Edad_Media', 'Gasto_Hist_Cliente': 'Gasto_Medio'}),
+        hide_index=True, use_container_width=True)
@@ -0,0 +1,89 @@
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+import puntuar
+import rutas
+from vistas.comun import NIVELES_TRAFICO, agregar_histograma, mapa_riesgo
+
+# === VISTA 2: REGRESIÓN LOGÍSTICA (GAUGE CHART) ===
+
+
+def mostrar(pack):
+    """Probabilidad de retraso de un envío e historial por distancia."""
+    st.title("🚚 Predicción de Retrasos")
+    st.markdown("Modelo de **Clasificación** para alertas logísticas.")
+
+    c1, c2 = st.columns(2)
+    with c1:
+        st.markdown("### 📡 Datos del Envío")
+        distancia = st.slider("Distancia (Km)", 0.5, 20.0, 5.0)
+        trafico = st.select_slider("Nivel de Tráfico", options=NIVELES_TRAFICO)
+
+        # Lectura instantánea de la rejilla precalculada: mover los controles no llama al modelo
+        rejilla = mapa_riesgo(pack)
+        prob = puntuar.consultar_riesgo(rejilla, distancia, trafico)
+
+        # Gráfico de Velocímetro (Gauge)
+        fig_gauge = go.Figure(go.Indicator(
+            mode = "gauge+number",
+            value = prob * 100,
+            title = {'text': "Probabilidad de Retraso"},
+            gauge = {
+                'axis': {'range': [None, 100]},
+                'bar': {'color': "darkred" if prob > 0.5 else "green"},
+                'steps': [
+                    {'range': [0, 30], 'color': "lightgreen"},
+                    {'range': [30, 70], 'color': "yellow"},
+                    {'range': [70, 100], 'color': "salmon"}],
+            }))
+        st.plotly_chart(fig_gauge, use_container_width=True)
+
+        if prob > 0.5:
+            st.error("🚨 **ALERTA:** Alta probabilidad de retraso.")
+        else:
+            st.success("✅ **OK:** Envío seguro.")
+
+    with c2:
+        st.markdown("### 📊 Historial de Eficiencia")
+        # Conteos ya agrupados por tramo de distancia: el navegador recibe decenas de barras, no filas
+        df = agregar_histograma(pack, "Distancia_KM", por="Llega_Tarde")
+        df = df.assign(Llega_Tarde=df['Llega_Tarde'].astype(str))
+        fig_hist = px.bar(df, x="Distancia_KM", y="Conteo", color="Llega_Tarde",
+                          barmode="group", title="Retrasos por Distancia",
+                          color_discrete_map={"0": "green", "1": "red"},
+                          labels={"Llega_Tarde": "Retraso (1=Sí)", "Conteo": "Envíos"})
+        st.plotly_chart(fig_hist, use_container_width=True)
+
+    # Superficie completa de riesgo de la flota (misma rejilla que el velocímetro)
+    st.markdown("### 🗺️ Mapa de Riesgo por Distancia y Tráfico")
+    fig_mapa = go.Figure(go.Heatmap(x=rejilla.columns, y=rejilla.index, z=rejilla.to_numpy() * 100,
+                                    zmin=0, zmax=100, colorscale="RdYlGn_r",
+                                    colorbar=dict(title="% retraso"),
+                                    hovertemplate="%{x:.2f} km · %{y}: %{z:.1f}%<extra></extra>"))
+    fig_mapa.add_trace(go.Scatter(x=[distancia], y=[trafico], mode="markers", name="Envío",
+                                  marker=dict(color="#1f2c56", size=12, symbol="x")))
+    fig_mapa.update_layout(template="plotly_white", height=300, showlegend=False,
+                           xaxis_title="Distancia (Km)", yaxis_title="Nivel de Tráfico")
+    st.plotly_chart(fig_mapa, use_container_width=True)
+
+    # Plan del día: todas las paradas en una sola predicción, antes de despachar
+    st.markdown("### 🛣️ Riesgo por Ruta")
+    archivo = st.file_uploader("Plan de rutas del día (CSV)", type="csv",
+                               help="Una fila por parada: " + ", ".join(rutas.COLUMNAS) + ".")
+    if archivo is None:
+        st.caption("Cada parada se puntúa con la distancia acumulada desde el almacén y el tráfico de su tramo; "
+                   "la ruta muestra la probabilidad de al menos un retraso.")
+        return
+    try:
+        _, resumen = rutas.puntuar_rutas(pack, pd.read_csv(archivo))
+    except ValueError as e:
+        st.error(f"❌ {e}")
+        return
+    resumen = resumen.sort_values('Prob_Algun_Retraso', ascending=False)
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Rutas", f"{len(resumen):,}")
+    m2.metric("Paradas", f"{resumen['Paradas'].sum():,}")
+    m3.metric("Retrasos Esperados", f"{resumen['Retrasos_Esperados'].sum():,.0f}")
+    st.dataframe(resumen.round(3), use_container_width=True)
@@ -0,0 +1,63 @@
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+import puntuar
+from vistas.comun import TODO_EL_CATALOGO, agregar_histograma_2d, barrer_precios
+
+# === VISTA 1: REGRESIÓN LINEAL (PLOTLY) ===
+
+
+def mostrar(pack):
+    """Simulador de demanda y relación precio/cantidad."""
+    st.title("📈 Pronóstico de Demanda (IA)")
+    st.markdown("Modelo de **Regresión Lineal** para optimización de precios.")
+
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        st.markdown("### ⚙️ Simulador")
+        modo = st.radio("Modo", ["Un precio", "Barrido de precios"], horizontal=True)
+
+        if modo == "Un precio":
+            st.write("Ajusta el precio para ver la proyección.")
+            precio = st.number_input("Precio Unitario (S/.)", 1.0, 100.0, 5.0)
+
+            if st.button("Calcular Proyección"):
+                pred = puntuar.predecir_demanda(pack, [precio])[0]
+
+                st.success(f"📦 Demanda: **{int(pred)} Unidades**")
+                st.info(f"💰 Ingreso: **S/. {precio * int(pred):.2f}**")
+        else:
+            # Toda la rejilla de precios de todas las categorías en una predicción, compartida entre sesiones
+            st.write("Recorre el rango de precios observado y busca el de mayor ingreso.")
+            puntos = st.select_slider("Precios por curva", [50, 100, 200, 500, 1000], value=200)
+            curvas = barrer_precios(pack, puntos)
+            grupos = curvas['Categoria'].unique().tolist()
+            grupo = st.selectbox("Categoría", grupos, index=grupos.index(TODO_EL_CATALOGO))
+            optimo = puntuar.precio_optimo(curvas).loc[grupo]
+            st.success(f"🎯 Precio óptimo: **S/. {optimo['Precio']:.2f}**")
+            st.info(f"📦 Demanda: **{optimo['Demanda']:.1f} Unidades** · 💰 Ingreso: **S/. {optimo['Ingreso']:.2f}**")
+
+            curva = curvas[curvas['Categoria'] == grupo]
+            fig = go.Figure(go.Scatter(x=curva['Precio'], y=curva['Ingreso'], mode="lines", name="Ingreso",
+                                       line=dict(color="#FF4B4B", width=3)))
+            fig.add_trace(go.Scatter(x=[optimo['Precio']], y=[optimo['Ingreso']], mode="markers", name="Óptimo",
+                                     marker=dict(color="#1f2c56", size=12)))
+            fig.update_layout(title="Ingreso esperado por precio", template="plotly_white", height=320,
+                              xaxis_title="Precio (S/.)", yaxis_title="Ingreso (S/.)", showlegend=False)
+            st.plotly_chart(fig, use_container_width=True)
+
+    with col2:
+        st.markdown("### 🔍 Análisis de Elasticidad")
+        # Densidad agregada en el servidor (rejilla de conteos) en lugar de un punto por venta
+        df = agregar_histograma_2d(pack, "Precio_Unitario", "Cantidad")
+        rejilla = df.pivot(index="Cantidad", columns="Precio_Unitario", values="Conteo")
+        fig = go.Figure(go.Heatmap(x=rejilla.columns, y=rejilla.index, z=rejilla.to_numpy(),
+                                   colorscale="Reds", colorbar=dict(title="Ventas")))
+        # Línea de tendencia del modelo lineal guardado (no se re-ajusta en cada recarga)
+        precios = np.array([df["Precio_Unitario"].min(), df["Precio_Unitario"].max()])
+        fig.add_trace(go.Scatter(x=precios, y=puntuar.predecir_demanda(pack, precios), mode="lines",
+                                 name="Modelo lineal", line=dict(color="#1f2c56", width=3)))
+        fig.update_layout(title="Relación Precio vs Cantidad (Interactivo)", template="plotly_white",
+                          xaxis_title="Precio (S/.)", yaxis_title="Unidades Vendidas")
+        st.plotly_chart(fig, use_container_width=True)